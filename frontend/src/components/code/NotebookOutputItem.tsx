@@ -1,6 +1,13 @@
 import DOMPurify from "dompurify";
+import { useEffect, useState } from "react";
 
-import { NotebookOutput } from "@/hooks/types";
+import {
+  BLOB_METADATA_KEY,
+  DisplayDataOutput,
+  ExecuteResultOutput,
+  NotebookOutput,
+  OutputBlobReference,
+} from "@/hooks/types";
 
 interface NotebookOutputItemProps {
   output: NotebookOutput;
@@ -143,6 +150,89 @@ const sanitizeHTML = (html: string | string[]): string => {
   });
 };
 
+type MimeBundleOutput = ExecuteResultOutput | DisplayDataOutput;
+
+// Get the URL of a mime value that the sandbox moved to its blob store
+const getBlobUrl = (
+  output: MimeBundleOutput,
+  mimeType: string,
+): string | undefined => {
+  const references = output.metadata?.[BLOB_METADATA_KEY] as
+    | Record<string, OutputBlobReference>
+    | undefined;
+  return references?.[mimeType]?.url;
+};
+
+const hasMimeData = (output: MimeBundleOutput, mimeType: string): boolean =>
+  Boolean(output.data[mimeType] || getBlobUrl(output, mimeType));
+
+function ImageOutputValue({
+  output,
+  mimeType,
+  alt,
+}: {
+  output: MimeBundleOutput;
+  mimeType: string;
+  alt: string;
+}) {
+  return (
+    <div className="flex justify-center">
+      <img
+        src={
+          getBlobUrl(output, mimeType) ??
+          processImageData(output.data[mimeType] as string | string[], mimeType)
+        }
+        alt={alt}
+        className="max-w-full h-auto rounded border"
+      />
+    </div>
+  );
+}
+
+// Render a mime value as sanitized HTML, loading it first if it was spooled
+function HtmlOutputValue({
+  output,
+  mimeType,
+  className,
+}: {
+  output: MimeBundleOutput;
+  mimeType: string;
+  className: string;
+}) {
+  const blobUrl = getBlobUrl(output, mimeType);
+  const [blobContent, setBlobContent] = useState<string | null>(null);
+
+  useEffect(() => {
+    if (!blobUrl) return;
+
+    let cancelled = false;
+    fetch(blobUrl)
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`Failed to load output: ${response.statusText}`);
+        }
+        return response.text();
+      })
+      .then((content) => {
+        if (!cancelled) setBlobContent(content);
+      })
+      .catch((error) => console.error("Failed to load output:", error));
+    return () => {
+      cancelled = true;
+    };
+  }, [blobUrl]);
+
+  const content = blobUrl
+    ? (blobContent ?? "")
+    : (output.data[mimeType] as string | string[]);
+  return (
+    <div
+      className={className}
+      dangerouslySetInnerHTML={{ __html: sanitizeHTML(content) }}
+    />
+  );
+}
+
 export function NotebookOutputItem({
   output,
   isStreaming = false,
@@ -160,75 +250,51 @@ export function NotebookOutputItem({
   }
 
   if (output.output_type === "execute_result" && output.data) {
+    const imageAlt = isStreaming ? "Live plot output" : "Plot output";
     return (
       <div className="space-y-2">
         {/* Handle images */}
-        {output.data["image/png"] && (
-          <div className="flex justify-center">
-            <img
-              src={processImageData(
-                output.data["image/png"] as string | string[],
-                "image/png",
-              )}
-              alt={isStreaming ? "Live plot output" : "Plot output"}
-              className="max-w-full h-auto rounded border"
-            />
-          </div>
+        {hasMimeData(output, "image/png") && (
+          <ImageOutputValue
+            output={output}
+            mimeType="image/png"
+            alt={imageAlt}
+          />
         )}
-        {output.data["image/jpeg"] && (
-          <div className="flex justify-center">
-            <img
-              src={processImageData(
-                output.data["image/jpeg"] as string | string[],
-                "image/jpeg",
-              )}
-              alt={isStreaming ? "Live plot output" : "Plot output"}
-              className="max-w-full h-auto rounded border"
-            />
-          </div>
+        {hasMimeData(output, "image/jpeg") && (
+          <ImageOutputValue
+            output={output}
+            mimeType="image/jpeg"
+            alt={imageAlt}
+          />
         )}
-        {output.data["image/svg+xml"] && (
+        {hasMimeData(output, "image/svg+xml") && (
           <div className="flex justify-center">
-            <div
-              dangerouslySetInnerHTML={{
-                __html: sanitizeHTML(
-                  Array.isArray(output.data["image/svg+xml"])
-                    ? output.data["image/svg+xml"].join("")
-                    : (output.data["image/svg+xml"] as string),
-                ),
-              }}
+            <HtmlOutputValue
+              output={output}
+              mimeType="image/svg+xml"
               className="max-w-full"
             />
           </div>
         )}
         {/* Handle HTML */}
-        {output.data["text/html"] && (
-          <div
+        {hasMimeData(output, "text/html") && (
+          <HtmlOutputValue
+            output={output}
+            mimeType="text/html"
             className="text-sm notebook-output"
-            dangerouslySetInnerHTML={{
-              __html: sanitizeHTML(
-                Array.isArray(output.data["text/html"])
-                  ? output.data["text/html"].join("")
-                  : (output.data["text/html"] as string),
-              ),
-            }}
           />
         )}
         {/* Handle text/plain when no other format is available */}
-        {output.data["text/plain"] &&
-          !output.data["image/png"] &&
-          !output.data["image/jpeg"] &&
-          !output.data["image/svg+xml"] &&
-          !output.data["text/html"] && (
-            <div
+        {hasMimeData(output, "text/plain") &&
+          !hasMimeData(output, "image/png") &&
+          !hasMimeData(output, "image/jpeg") &&
+          !hasMimeData(output, "image/svg+xml") &&
+          !hasMimeData(output, "text/html") && (
+            <HtmlOutputValue
+              output={output}
+              mimeType="text/plain"
               className="text-sm"
-              dangerouslySetInnerHTML={{
-                __html: sanitizeHTML(
-                  Array.isArray(output.data["text/plain"])
-                    ? output.data["text/plain"].join("")
-                    : (output.data["text/plain"] as string),
-                ),
-              }}
             />
           )}
       </div>
@@ -247,72 +313,47 @@ export function NotebookOutputItem({
     return (
       <div className="space-y-2">
         {/* Handle images */}
-        {output.data["image/png"] && (
-          <div className="flex justify-center">
-            <img
-              src={processImageData(
-                output.data["image/png"] as string | string[],
-                "image/png",
-              )}
-              alt="Display output"
-              className="max-w-full h-auto rounded border"
-            />
-          </div>
+        {hasMimeData(output, "image/png") && (
+          <ImageOutputValue
+            output={output}
+            mimeType="image/png"
+            alt="Display output"
+          />
         )}
-        {output.data["image/jpeg"] && (
-          <div className="flex justify-center">
-            <img
-              src={processImageData(
-                output.data["image/jpeg"] as string | string[],
-                "image/jpeg",
-              )}
-              alt="Display output"
-              className="max-w-full h-auto rounded border"
-            />
-          </div>
+        {hasMimeData(output, "image/jpeg") && (
+          <ImageOutputValue
+            output={output}
+            mimeType="image/jpeg"
+            alt="Display output"
+          />
         )}
-        {output.data["image/svg+xml"] && (
+        {hasMimeData(output, "image/svg+xml") && (
           <div className="flex justify-center">
-            <div
-              dangerouslySetInnerHTML={{
-                __html: sanitizeHTML(
-                  Array.isArray(output.data["image/svg+xml"])
-                    ? output.data["image/svg+xml"].join("")
-                    : (output.data["image/svg+xml"] as string),
-                ),
-              }}
+            <HtmlOutputValue
+              output={output}
+              mimeType="image/svg+xml"
               className="max-w-full"
             />
           </div>
         )}
         {/* Handle HTML */}
-        {output.data["text/html"] && (
-          <div
+        {hasMimeData(output, "text/html") && (
+          <HtmlOutputValue
+            output={output}
+            mimeType="text/html"
             className="text-sm notebook-output"
-            dangerouslySetInnerHTML={{
-              __html: sanitizeHTML(
-                Array.isArray(output.data["text/html"])
-                  ? output.data["text/html"].join("")
-                  : (output.data["text/html"] as string),
-              ),
-            }}
           />
         )}
         {/* Handle text/plain as HTML fallback */}
-        {output.data["text/plain"] &&
-          !output.data["image/png"] &&
-          !output.data["image/jpeg"] &&
-          !output.data["image/svg+xml"] &&
-          !output.data["text/html"] && (
-            <div
+        {hasMimeData(output, "text/plain") &&
+          !hasMimeData(output, "image/png") &&
+          !hasMimeData(output, "image/jpeg") &&
+          !hasMimeData(output, "image/svg+xml") &&
+          !hasMimeData(output, "text/html") && (
+            <HtmlOutputValue
+              output={output}
+              mimeType="text/plain"
               className="text-sm"
-              dangerouslySetInnerHTML={{
-                __html: sanitizeHTML(
-                  Array.isArray(output.data["text/plain"])
-                    ? output.data["text/plain"].join("")
-                    : (output.data["text/plain"] as string),
-                ),
-              }}
             />
           )}
       </div>
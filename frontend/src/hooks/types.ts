@@ -34,6 +34,18 @@ export interface DisplayDataOutput {
   metadata?: Record<string, unknown>;
 }
 
+// Large output values are stored by the sandbox and referenced from the
+// output metadata by mime type
+export const BLOB_METADATA_KEY = "openfoundry_blobs";
+
+export interface OutputBlobReference {
+  digest: string;
+  encoding: "base64" | "json" | "text";
+  size: number;
+  // Resolved when the notebook is loaded
+  url?: string;
+}
+
 export type NotebookOutput =
   | StreamOutput
   | ExecuteResultOutput
@@ -47,11 +59,21 @@ export interface StartedEventData {
 
 export interface OutputEventData {
   output: NotebookOutput;
+  output_index: number;
+}
+
+export interface IndexedOutput {
+  output_index: number;
+  output: NotebookOutput;
 }
 
+// Outputs are streamed as output events; completed events only describe them
 export interface CompletedEventData {
   execution_count: number;
-  outputs: NotebookOutput[];
+  output_count: number;
+  output_hashes: string[];
+  // Outputs that changed after they were streamed, e.g. updated displays
+  updated_outputs: IndexedOutput[];
   status: "completed" | "error";
   error?: string;
   started_at: string;
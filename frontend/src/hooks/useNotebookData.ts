@@ -2,7 +2,13 @@ import { useCallback, useEffect, useRef, useState } from "react";
 
 import { generateShortCellId } from "@/lib/utils";
 
-import { NotebookCell, NotebookData } from "./types";
+import {
+  BLOB_METADATA_KEY,
+  NotebookCell,
+  NotebookData,
+  NotebookOutput,
+  OutputBlobReference,
+} from "./types";
 
 interface UseNotebookDataProps {
   notebookId: string;
@@ -12,6 +18,34 @@ interface UseNotebookDataProps {
   pollingInterval?: number;
 }
 
+// Point the blob references of an output to the endpoint serving them
+const resolveBlobUrls = (
+  output: NotebookOutput,
+  baseUrl: string,
+): NotebookOutput => {
+  if (!("metadata" in output) || !output.metadata?.[BLOB_METADATA_KEY]) {
+    return output;
+  }
+
+  const references = output.metadata[BLOB_METADATA_KEY] as Record<
+    string,
+    OutputBlobReference
+  >;
+  const resolved = Object.fromEntries(
+    Object.entries(references).map(([mimeType, reference]) => [
+      mimeType,
+      {
+        ...reference,
+        url: `${baseUrl}/blobs/${reference.digest}?mime_type=${encodeURIComponent(mimeType)}`,
+      },
+    ]),
+  );
+  return {
+    ...output,
+    metadata: { ...output.metadata, [BLOB_METADATA_KEY]: resolved },
+  };
+};
+
 export const useNotebookData = ({
   notebookId,
   sessionId,
@@ -43,6 +77,9 @@ export const useNotebookData = ({
         data.cells = data.cells.map((cell: NotebookCell) => ({
           ...cell,
           id: cell.id ?? generateShortCellId(),
+          outputs: cell.outputs?.map((output) =>
+            resolveBlobUrls(output, baseUrl),
+          ),
         }));
       }
 
@@ -3,7 +3,9 @@ import { useCallback, useState } from "react";
 import {
   CompletedEventData,
   ErrorEventData,
+  IndexedOutput,
   NotebookOutput,
+  OutputEventData,
   StreamingEventData,
 } from "./types";
 
@@ -46,7 +48,7 @@ interface StreamingOptions {
   onCompleted?: (
     eventData: StreamingEvent,
     completedData: CompletedEventData,
-  ) => void;
+  ) => void | Promise<void>;
   onError?: (errorMessage: string) => void;
   bufferSizeExceededMessage?: string;
 }
@@ -58,6 +60,49 @@ export const useNotebookExecution = ({
   const [executingCells, setExecutingCells] = useState<Set<string>>(new Set());
   const [error, setError] = useState<string | null>(null);
 
+  // Build the final outputs of a cell from the outputs streamed before its
+  // completed event, fetching any output events that were missed
+  const assembleOutputs = useCallback(
+    async (
+      cellId: string,
+      streamedOutputs: (NotebookOutput | undefined)[],
+      completedData: CompletedEventData,
+    ): Promise<NotebookOutput[]> => {
+      const outputCount = completedData.output_count ?? streamedOutputs.length;
+      const outputs = Array.from(
+        { length: outputCount },
+        (_, index) => streamedOutputs[index],
+      );
+      for (const { output_index, output } of completedData.updated_outputs ||
+        []) {
+        outputs[output_index] = output;
+      }
+
+      const missingIndices = outputs.flatMap((output, index) =>
+        output === undefined ? [index] : [],
+      );
+      if (missingIndices.length > 0) {
+        const params = new URLSearchParams(
+          missingIndices.map((index) => ["indices", String(index)]),
+        );
+        const response = await fetch(
+          `${baseUrl}/cells/${encodeURIComponent(cellId)}/outputs?${params}`,
+        );
+        if (response.ok) {
+          const result: { outputs: IndexedOutput[] } = await response.json();
+          for (const { output_index, output } of result.outputs) {
+            outputs[output_index] = output;
+          }
+        }
+      }
+
+      return outputs.filter(
+        (output): output is NotebookOutput => output !== undefined,
+      );
+    },
+    [baseUrl],
+  );
+
   // Helper function to handle streaming responses
   const processStreamingResponse = useCallback(
     async (
@@ -107,7 +152,7 @@ export const useNotebookExecution = ({
               // Handle completed events with callback
               if (eventData.event_type === "completed" && options.onCompleted) {
                 const completedData = eventData.data as CompletedEventData;
-                options.onCompleted(eventData, completedData);
+                await options.onCompleted(eventData, completedData);
               }
 
               // Handle error events
@@ -152,6 +197,7 @@ export const useNotebookExecution = ({
         }
 
         let finalResult: ExecuteCodeResponse | null = null;
+        const streamedOutputs: NotebookOutput[] = [];
 
         await processStreamingResponse(response, {
           onEvent: (eventData) => {
@@ -159,6 +205,11 @@ export const useNotebookExecution = ({
               onEvent(eventData);
             }
 
+            if (eventData.event_type === "output") {
+              const outputData = eventData.data as OutputEventData;
+              streamedOutputs[outputData.output_index] = outputData.output;
+            }
+
             // Handle different event types for logging
             switch (eventData.event_type) {
               case "started":
@@ -172,12 +223,17 @@ export const useNotebookExecution = ({
                 break;
             }
           },
-          onCompleted: (eventData, completedData) => {
+          onCompleted: async (eventData, completedData) => {
+            const outputs = await assembleOutputs(
+              eventData.cell_id,
+              streamedOutputs,
+              completedData,
+            );
             finalResult = {
               cell_id: eventData.cell_id,
               code: request.code,
               execution_count: completedData.execution_count || 0,
-              outputs: completedData.outputs || [],
+              outputs,
               status: completedData.status,
               error: completedData.error,
               started_at: completedData.started_at,
@@ -187,7 +243,7 @@ export const useNotebookExecution = ({
             // Update cell via callback
             if (onCellUpdate) {
               onCellUpdate(eventData.cell_id, {
-                outputs: completedData.outputs || [],
+                outputs,
                 execution_count: completedData.execution_count || null,
               });
             }
@@ -207,7 +263,7 @@ export const useNotebookExecution = ({
         return null;
       }
     },
-    [baseUrl, onCellUpdate, processStreamingResponse],
+    [baseUrl, onCellUpdate, processStreamingResponse, assembleOutputs],
   );
 
   // Stop execution
@@ -289,23 +345,37 @@ export const useNotebookExecution = ({
         throw new Error(`Failed to rerun notebook: ${response.statusText}`);
       }
 
+      // Outputs streamed for each cell, assembled when the cell completes
+      const streamedOutputs = new Map<string, NotebookOutput[]>();
+
       // Handle streaming response
       await processStreamingResponse(response, {
         onEvent: (eventData) => {
-          // Update cells via callback for completed cells
-          if (eventData.event_type === "completed") {
-            const completedData = eventData.data as CompletedEventData;
-            if (onCellUpdate) {
-              onCellUpdate(eventData.cell_id, {
-                outputs: completedData.outputs || [],
-                execution_count: completedData.execution_count || null,
-              });
-            }
+          if (eventData.event_type === "output") {
+            const outputData = eventData.data as OutputEventData;
+            const cellOutputs = streamedOutputs.get(eventData.cell_id) || [];
+            cellOutputs[outputData.output_index] = outputData.output;
+            streamedOutputs.set(eventData.cell_id, cellOutputs);
           }
 
           // Log other events for debugging
           console.log("Rerun event:", eventData.event_type, eventData.cell_id);
         },
+        onCompleted: async (eventData, completedData) => {
+          // Update cells via callback for completed cells
+          const outputs = await assembleOutputs(
+            eventData.cell_id,
+            streamedOutputs.get(eventData.cell_id) || [],
+            completedData,
+          );
+          streamedOutputs.delete(eventData.cell_id);
+          if (onCellUpdate) {
+            onCellUpdate(eventData.cell_id, {
+              outputs,
+              execution_count: completedData.execution_count || null,
+            });
+          }
+        },
         onError: (errorMessage) => {
           setError(errorMessage);
         },
@@ -321,7 +391,7 @@ export const useNotebookExecution = ({
       console.error("Error rerunning notebook:", err);
       return false;
     }
-  }, [baseUrl, onCellUpdate, processStreamingResponse]);
+  }, [baseUrl, onCellUpdate, processStreamingResponse, assembleOutputs]);
 
   return {
     executingCells,
@@ -4,11 +4,64 @@ This module contains common tools for file operations and workspace management
 that are used across different agent implementations.
 """
 
+import asyncio
+import json
+
 from agents import RunContextWrapper, function_tool
+from pydantic import BaseModel
 
 from openfoundry.agents.run_context import AgentRunContext
 from openfoundry.agents.utils.format_utils import dict_to_xml, truncate
 
+# Maximum number of rows and encoded bytes of a result returned to the agent
+EXECUTE_SQL_MAX_ROWS = 100
+EXECUTE_SQL_MAX_BYTES = 256 * 1024
+
+# Queries run by the agent are cancelled in the database after this long
+EXECUTE_SQL_TIMEOUT_SECONDS = 300
+
+# Seconds each poll for a running query waits in the sandbox
+EXECUTE_SQL_POLL_SECONDS = 30
+
+# Queries estimated to scan more than this are refused before they run
+EXECUTE_SQL_MAX_BYTES_SCANNED = 50 * 1024**3
+EXECUTE_SQL_MAX_ROWS_SCANNED = 1_000_000_000
+
+# Maximum number of tables and columns returned by a catalog search
+CATALOG_SEARCH_LIMIT = 30
+
+# Maximum number of rows of each statement returned by a batch
+EXECUTE_SQL_BATCH_MAX_ROWS = 20
+
+
+def _sql_preflight(row_limit: int) -> dict:
+    """Guardrails the sandbox applies to SQL run by the agent.
+
+    The injected LIMIT is one row more than is returned, so that results
+    which were cut off are still reported as truncated.
+    """
+    return {
+        "row_limit": row_limit + 1,
+        "max_bytes_scanned": EXECUTE_SQL_MAX_BYTES_SCANNED,
+        "max_rows_scanned": EXECUTE_SQL_MAX_ROWS_SCANNED,
+        "on_exceed": "refuse",
+    }
+
+
+class SqlBatchItem(BaseModel):
+    """A SQL statement to run as part of a batch."""
+
+    connection_name: str
+    sql_statement: str
+
+
+class FederatedSqlSource(BaseModel):
+    """A SQL statement whose result is joined locally with other sources."""
+
+    name: str
+    connection_name: str
+    sql_statement: str
+
 
 @function_tool
 async def write_file(
@@ -202,6 +255,42 @@ async def list_connections(
         return dict_to_xml(connections)
 
 
+@function_tool
+async def search_catalog(
+    wrapper: RunContextWrapper[AgentRunContext],
+    thought: str,
+    connection_name: str,
+    query: str,
+    kind: str = "all",
+):
+    """Search the tables and columns of a connection by name.
+
+    This is much faster than querying information_schema with `execute_sql`. Use it to
+    find the tables and columns relevant to the user's request before writing SQL.
+    Matches are ranked exact, prefix, substring and then fuzzy (typo-tolerant) matches.
+
+    Args:
+        wrapper: The agent run context wrapper for accessing sandbox client.
+        thought: Your thought process for using this tool. It will be displayed in the chat to the user. Talk in first person and present reasoning as to why you are using this tool.
+        connection_name: The name of the connection to search, as returned by `list_connections`.
+        query: A table or column name, or part of one (e.g. "orders", "customer_id", "orders.created").
+        kind: What to search: "tables", "columns" or "all".
+
+    """
+    async with wrapper.context.get_sandbox_client() as client:
+        response = await client.get(
+            f"/connections/{connection_name}/catalog/search",
+            params={"q": query, "kind": kind, "limit": CATALOG_SEARCH_LIMIT},
+        )
+        if response.is_error:
+            raise Exception(f"Failed to search catalog: {response.text}")
+
+        matches = response.json()
+        if not matches:
+            return f"No tables or columns matching '{query}' found"
+        return dict_to_xml(matches)
+
+
 @function_tool
 async def execute_sql(
     wrapper: RunContextWrapper[AgentRunContext],
@@ -235,17 +324,220 @@ async def execute_sql(
             has explicitly confirmed the action. Statements that modify the database
             (e.g., CREATE, DROP, DELETE, UPDATE) should not be executed without prior user confirmation.
             To prevent excessively large result sets, any SELECT statements must include LIMIT 100.
+            SELECT statements without a LIMIT are limited automatically, and queries estimated
+            to scan too much data are refused with the estimate.
+            Queries running longer than 5 minutes are cancelled.
+            A query identical to one extracted to the sandbox is answered from
+            the local extract, as of its last refresh.
 
     """
     async with wrapper.context.get_sandbox_client() as client:
         response = await client.post(
-            "/execute_sql",
-            json={"sql_statement": sql_statement, "connection_name": connection_name},
+            "/execute_sql/jobs",
+            json={
+                "sql_statement": sql_statement,
+                "connection_name": connection_name,
+                "timeout_seconds": EXECUTE_SQL_TIMEOUT_SECONDS,
+                "use_cache": True,
+                "preflight": _sql_preflight(EXECUTE_SQL_MAX_ROWS),
+                "prefer_extract": True,
+                # Only the first page is fetched, whatever the statement returns
+                "max_rows": EXECUTE_SQL_MAX_ROWS,
+            },
         )
         if response.is_error:
             raise Exception(f"Failed to execute SQL: {response.text}")
+        job = response.json()
+
+        try:
+            # Await the job in short polls so a cancelled agent run cancels the query
+            while job["result"] is None:
+                response = await client.get(
+                    f"/execute_sql/jobs/{job['job_id']}",
+                    params={
+                        "wait": EXECUTE_SQL_POLL_SECONDS,
+                        "max_rows": EXECUTE_SQL_MAX_ROWS,
+                        "max_bytes": EXECUTE_SQL_MAX_BYTES,
+                    },
+                )
+                if response.is_error:
+                    raise Exception(f"Failed to execute SQL: {response.text}")
+                job = response.json()
+        except asyncio.CancelledError:
+            await asyncio.shield(
+                client.post(f"/execute_sql/jobs/{job['job_id']}/cancel")
+            )
+            raise
+
+    job_result = job["result"]
+    result: dict = {
+        "success": job_result["success"],
+        "rows_affected": job_result["rows_affected"],
+        "data": job_result["data"],
+    }
+    if job_result["error"]:
+        result["error"] = job_result["error"]
+    if job_result["truncated"]:
+        result["truncated"] = (
+            f"Only the first {len(result['data'])} rows are shown. "
+            "Add a LIMIT or aggregate the query to see specific rows."
+        )
+    if job["connection_name"] != connection_name:
+        result["source"] = (
+            f"Served from a local extract on '{job['connection_name']}' "
+            "instead of the remote database."
+        )
+    preflight = job["preflight"]
+    if preflight and preflight["estimated_bytes_scanned"] is not None:
+        result["estimated_bytes_scanned"] = preflight["estimated_bytes_scanned"]
+    if preflight and preflight["estimated_rows_scanned"] is not None:
+        result["estimated_rows_scanned"] = preflight["estimated_rows_scanned"]
+
+    return dict_to_xml(result)
+
+
+@function_tool
+async def execute_sql_batch(
+    wrapper: RunContextWrapper[AgentRunContext],
+    thought: str,
+    statements: list[SqlBatchItem],
+):
+    """Execute several independent SQL statements at once, possibly on different connections.
+
+    Prefer this tool over multiple `execute_sql` calls when the statements do not depend
+    on each other's results, e.g. to inspect several tables during data discovery.
+    The same rules as for `execute_sql` apply to each statement.
+
+    Args:
+        wrapper: The agent run context wrapper for accessing sandbox client.
+
+        thought: A first-person explanation of why you're running these statements.
+            This will be shown to the user in chat, so clearly explain your reasoning and intent.
+
+        statements: The statements to execute, each with the name of its target connection.
+            Each statement must be read-only unless the user has explicitly confirmed the action.
+            Only the first 20 rows of each result are returned.
+            Statements running longer than 5 minutes are cancelled.
+
+    """
+    results: list[dict] = [{} for _ in statements]
+    async with wrapper.context.get_sandbox_client() as client:
+        async with client.stream(
+            "POST",
+            "/execute_sql/batch",
+            json={
+                "items": [statement.model_dump() for statement in statements],
+                "max_rows": EXECUTE_SQL_BATCH_MAX_ROWS,
+                "max_bytes": EXECUTE_SQL_MAX_BYTES // max(len(statements), 1),
+                "timeout_seconds": EXECUTE_SQL_TIMEOUT_SECONDS,
+                "use_cache": True,
+                "preflight": _sql_preflight(EXECUTE_SQL_BATCH_MAX_ROWS),
+            },
+            # Statements queue behind each other, so only they are timed out
+            timeout=None,
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                raise Exception(f"Failed to execute SQL batch: {response.text}")
+
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                frame = json.loads(line)
+                if frame["type"] != "result":
+                    continue
+
+                result: dict = {
+                    "connection_name": frame["connection_name"],
+                    "sql_statement": statements[frame["index"]].sql_statement,
+                    "success": frame["success"],
+                }
+                if frame["success"]:
+                    result["rows_affected"] = frame["rows_affected"]
+                    result["data"] = frame["data"]
+                    if frame["truncated"]:
+                        result["truncated"] = (
+                            f"Only the first {len(frame['data'])} rows are shown."
+                        )
+                else:
+                    result["error"] = frame["error"]
+                results[frame["index"]] = result
+
+    return dict_to_xml({"results": results})
+
+
+@function_tool
+async def execute_federated_sql(
+    wrapper: RunContextWrapper[AgentRunContext],
+    thought: str,
+    sources: list[FederatedSqlSource],
+    sql_statement: str,
+):
+    """Join or aggregate the results of SQL statements on different connections.
+
+    Use this tool instead of running each statement and combining the rows yourself
+    when a question spans several connections, e.g. application data in Postgres and
+    events in Snowflake. Each source statement runs on its connection, and
+    `sql_statement` then runs locally in DuckDB over the source results.
+
+    Args:
+        wrapper: The agent run context wrapper for accessing sandbox client.
+
+        thought: A first-person explanation of why you're running this query.
+            This will be shown to the user in chat, so clearly explain your reasoning and intent.
+
+        sources: The source statements, each with a name and its target connection.
+            The name (letters, digits and underscores) is the table name of its result
+            in `sql_statement`. Source statements must be read-only. Filter and select
+            only the needed columns in each source, since every source row is
+            transferred into the sandbox.
+
+        sql_statement: A single DuckDB SQL query over the sources, e.g.
+            SELECT u.plan, COUNT(*) FROM users u JOIN events e ON e.user_id = u.id GROUP BY 1
+            Only the first 100 rows are returned.
+
+    """
+    async with wrapper.context.get_sandbox_client() as client:
+        response = await client.post(
+            "/execute_sql/federated",
+            json={
+                "sources": [source.model_dump() for source in sources],
+                "sql_statement": sql_statement,
+                "max_rows": EXECUTE_SQL_MAX_ROWS,
+                "max_bytes": EXECUTE_SQL_MAX_BYTES,
+                "timeout_seconds": EXECUTE_SQL_TIMEOUT_SECONDS,
+                "use_cache": True,
+                "preflight": {
+                    "max_bytes_scanned": EXECUTE_SQL_MAX_BYTES_SCANNED,
+                    "max_rows_scanned": EXECUTE_SQL_MAX_ROWS_SCANNED,
+                    "on_exceed": "refuse",
+                },
+            },
+            # Source statements are cancelled by the sandbox after their timeout
+            timeout=None,
+        )
+        if response.is_error:
+            raise Exception(f"Failed to execute federated SQL: {response.text}")
+        federated = response.json()
+
+    result: dict = {
+        "success": federated["success"],
+        "rows_affected": federated["rows_affected"],
+        "data": federated["data"],
+        "sources": [
+            {"name": source["name"], "rows": source["rows"]}
+            for source in federated["sources"]
+        ],
+    }
+    if federated["error"]:
+        result["error"] = federated["error"]
+    if federated["truncated"]:
+        result["truncated"] = (
+            f"Only the first {len(result['data'])} rows are shown. "
+            "Add a LIMIT or aggregate the query to see specific rows."
+        )
 
-        return dict_to_xml(response.json())
+    return dict_to_xml(result)
 
 
 @function_tool
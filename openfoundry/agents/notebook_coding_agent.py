@@ -4,6 +4,7 @@ from openfoundry.agents.notebook_tools import (
     delete_cell,
     execute_cell,
     get_notebook,
+    restart_kernel,
     run_all_cells,
     stop_cell,
     tail_cells,
@@ -30,6 +31,7 @@ def get_notebook_coding_agent(
             stop_cell,
             delete_cell,
             tail_cells,
+            restart_kernel,
         ],
         model=model,
         model_settings=model_settings,
@@ -1,7 +1,7 @@
 """Notebook-specific function tools for Jupyter notebook operations in OpenFoundry.
 
 This module contains tools for executing cells, running all cells, stopping execution,
-and deleting cells within a Jupyter notebook environment.
+restarting the kernel and deleting cells within a Jupyter notebook environment.
 """
 
 import uuid
@@ -63,7 +63,8 @@ async def get_notebook(
 
     """
     async with wrapper.context.get_sandbox_client() as client:
-        response = await client.get("/api/notebook/notebook")
+        # Large outputs are inlined, as the agent cannot fetch them separately
+        response = await client.get("/api/notebook/notebook", params={"inline": "true"})
         if response.is_error:
             raise Exception(f"Failed to get notebook: {response.text}")
 
@@ -204,3 +205,27 @@ async def delete_cell(
 
         result = response.json()
         return dict_to_xml(result)
+
+
+@function_tool
+async def restart_kernel(
+    wrapper: RunContextWrapper[AgentRunContext],
+    thought: str,
+):
+    """Restart the notebook kernel, clearing all variables and imports.
+
+    Args:
+        wrapper: The agent run context wrapper for accessing sandbox client.
+        thought: Your thought process for using this tool. It will be displayed in the chat to the user. Talk in first person and present reasoning as to why you are using this tool.
+
+    Returns:
+        Status of the new kernel.
+
+    """
+    async with wrapper.context.get_sandbox_client() as client:
+        response = await client.post("/api/notebook/restart")
+        if response.is_error:
+            raise Exception(f"Failed to restart kernel: {response.text}")
+
+        result = response.json()
+        return dict_to_xml(result)
@@ -5,10 +5,13 @@ from openfoundry.agents.bash_tools import (
     tail_process_logs,
 )
 from openfoundry.agents.common_tools import (
+    execute_federated_sql,
     execute_sql,
+    execute_sql_batch,
     list_connections,
     list_files,
     read_file,
+    search_catalog,
     write_file,
 )
 from openfoundry.agents.utils.template_loader import load_prompt_template
@@ -33,7 +36,10 @@ def get_streamlit_app_coding_agent(
             list_processes,
             tail_process_logs,
             list_connections,
+            search_catalog,
             execute_sql,
+            execute_sql_batch,
+            execute_federated_sql,
         ],
         model=model,
         model_settings=model_settings,
@@ -1,6 +1,11 @@
+from collections import defaultdict
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
 from .bigquery_connection import BigQueryConnection
 from .clickhouse_connection import ClickhouseConnection
-from .connection import Connection, ConnectionBase
+from .connection import Connection, ConnectionBase, ConnectionType
 from .databricks_connection import DatabricksConnection
 from .postgres_connection import PostgresConnection
 from .snowflake_connection import SnowflakeConnection
@@ -13,6 +18,36 @@ ALL_CONNECTION_CLASSES: list[type[ConnectionBase]] = [
     BigQueryConnection,
 ]
 
+
+def get_concrete_connections(
+    db: Session, connections: list[Connection]
+) -> dict[UUID, ConnectionBase]:
+    """Load the concrete rows of connections, with one query per connection type.
+
+    Args:
+        db: The database session.
+        connections: The connections to load the concrete rows of.
+
+    Returns:
+        The concrete connections by id. Connections without a concrete row
+        are left out.
+
+    """
+    ids_by_type: dict[ConnectionType, list[UUID]] = defaultdict(list)
+    for connection in connections:
+        ids_by_type[connection.type].append(connection.id)
+
+    concrete_connections: dict[UUID, ConnectionBase] = {}
+    for connection_class in ALL_CONNECTION_CLASSES:
+        ids = ids_by_type.get(connection_class.type)
+        if ids:
+            for concrete_connection in (
+                db.query(connection_class).filter(connection_class.id.in_(ids)).all()
+            ):
+                concrete_connections[concrete_connection.id] = concrete_connection
+    return concrete_connections
+
+
 __all__ = [
     "Connection",
     "SnowflakeConnection",
@@ -21,4 +56,5 @@ __all__ = [
     "ClickhouseConnection",
     "BigQueryConnection",
     "ALL_CONNECTION_CLASSES",
+    "get_concrete_connections",
 ]
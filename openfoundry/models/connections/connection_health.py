@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from openfoundry.logger import logger
+from openfoundry.models.connections.connection import ConnectionBase, ConnectionType
+
+# Seconds a check may take before the connection is reported unhealthy.
+# Databricks serverless warehouses can take a while to wake up.
+CHECK_TIMEOUT_SECONDS: dict[ConnectionType, float] = {
+    ConnectionType.SNOWFLAKE: 30.0,
+    ConnectionType.DATABRICKS: 60.0,
+    ConnectionType.POSTGRES: 15.0,
+    ConnectionType.CLICKHOUSE: 15.0,
+    ConnectionType.BIGQUERY: 30.0,
+}
+DEFAULT_CHECK_TIMEOUT_SECONDS = 30.0
+
+# Seconds a check result is served from the cache
+HEALTH_TTL_SECONDS = 300.0
+
+# Number of check results kept per connection
+HEALTH_HISTORY_SIZE = 20
+
+# Number of checks running at the same time
+MAX_CONCURRENT_CHECKS = 8
+
+
+class ConnectionCheckError(Exception):
+    """Raised when a connection check fails or does not finish in time."""
+
+
+@dataclass
+class HealthCheckResult:
+    """The outcome of a single connection check."""
+
+    healthy: bool
+    latency_seconds: float
+    checked_at: float
+    error: str | None = None
+
+
+@dataclass
+class ConnectionHealth:
+    """The latest check result of a connection and its recent history."""
+
+    connection_id: UUID
+    history: deque[HealthCheckResult] = field(
+        default_factory=lambda: deque(maxlen=HEALTH_HISTORY_SIZE)
+    )
+
+    @property
+    def latest(self) -> HealthCheckResult | None:
+        return self.history[-1] if self.history else None
+
+    def is_fresh(self, ttl_seconds: float = HEALTH_TTL_SECONDS) -> bool:
+        """Whether the latest result is recent enough to be served from the cache."""
+        latest = self.latest
+        return latest is not None and time.time() - latest.checked_at < ttl_seconds
+
+
+class ConnectionHealthService:
+    """Checks connections in a thread pool and caches the results.
+
+    Driver logins block for up to their connect timeout, so checks run in
+    worker threads with a timeout per connection type. Concurrent requests for
+    the same connection share a single check, and results are cached for
+    ``ttl_seconds`` so listing connections does not wait on live logins.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = HEALTH_TTL_SECONDS,
+        max_workers: int = MAX_CONCURRENT_CHECKS,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="connection-health"
+        )
+        self._lock = threading.Lock()
+        self._health: dict[UUID, ConnectionHealth] = {}
+        self._pending: dict[UUID, Future[HealthCheckResult]] = {}
+
+    def get_health(self, connection_id: UUID) -> ConnectionHealth | None:
+        """Get the cached health of a connection without checking it."""
+        with self._lock:
+            return self._health.get(connection_id)
+
+    def forget(self, connection_id: UUID) -> None:
+        """Drop the cached health of a connection, e.g. once it is deleted."""
+        with self._lock:
+            self._health.pop(connection_id, None)
+
+    async def check(
+        self, connection: ConnectionBase, refresh: bool = False
+    ) -> ConnectionHealth:
+        """Get the health of a connection, checking it if the cached result expired.
+
+        Args:
+            connection: The connection to check.
+            refresh: Check the connection even if a fresh result is cached.
+
+        """
+        health = self.get_health(connection.id)
+        if not refresh and health is not None and health.is_fresh(self._ttl_seconds):
+            return health
+        await asyncio.wrap_future(self._submit(connection))
+        return self._health[connection.id]
+
+    async def check_many(
+        self, connections: list[ConnectionBase], refresh: bool = False
+    ) -> list[ConnectionHealth]:
+        """Get the health of several connections, checking them concurrently."""
+        return await asyncio.gather(
+            *(self.check(connection, refresh=refresh) for connection in connections)
+        )
+
+    def check_now(self, connection: ConnectionBase) -> HealthCheckResult:
+        """Check a connection on the calling thread and record the result.
+
+        Used when credentials are created or changed, so a check of the
+        previous credentials that is still running is not reused.
+
+        Raises:
+            ConnectionCheckError: If the check fails or times out.
+
+        """
+        result = self._run_check(connection)
+        if not result.healthy:
+            raise ConnectionCheckError(result.error)
+        return result
+
+    def _submit(self, connection: ConnectionBase) -> Future[HealthCheckResult]:
+        """Start a check of the connection unless one is already running."""
+        with self._lock:
+            future = self._pending.get(connection.id)
+            if future is None:
+                future = self._executor.submit(self._run_check, connection)
+                self._pending[connection.id] = future
+                future.add_done_callback(
+                    lambda _: self._pop_pending(connection.id, future)
+                )
+            return future
+
+    def _pop_pending(self, connection_id: UUID, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(connection_id) is future:
+                del self._pending[connection_id]
+
+    def _run_check(self, connection: ConnectionBase) -> HealthCheckResult:
+        """Run the driver check on a helper thread, bounded by the type timeout."""
+        timeout = CHECK_TIMEOUT_SECONDS.get(
+            connection.type, DEFAULT_CHECK_TIMEOUT_SECONDS
+        )
+        checked_at = time.time()
+        start_time = time.monotonic()
+        error = None
+
+        # The driver call cannot be interrupted, so it runs on its own thread
+        # and is abandoned if it outlives the timeout
+        check_future: Future[None] = Future()
+
+        def run() -> None:
+            try:
+                connection.check_connection()
+                check_future.set_result(None)
+            except BaseException as e:
+                check_future.set_exception(e)
+
+        threading.Thread(
+            target=run, name=f"connection-check-{connection.id}", daemon=True
+        ).start()
+        try:
+            check_future.result(timeout=timeout)
+        except FutureTimeoutError:
+            error = f"Connection check timed out after {timeout:g}s"
+        except Exception as e:
+            error = str(e)
+
+        result = HealthCheckResult(
+            healthy=error is None,
+            latency_seconds=time.monotonic() - start_time,
+            checked_at=checked_at,
+            error=error,
+        )
+        if error is not None:
+            logger.warning(f"Connection {connection.name} is unhealthy: {error}")
+
+        with self._lock:
+            health = self._health.setdefault(
+                connection.id, ConnectionHealth(connection.id)
+            )
+            health.history.append(result)
+        return result
+
+
+# Global connection health service
+connection_health_service = ConnectionHealthService()
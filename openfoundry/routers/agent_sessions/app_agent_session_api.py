@@ -35,8 +35,7 @@ from openfoundry.models.agent_sessions.docker_utils import (
 )
 from openfoundry.models.apps import App
 from openfoundry.models.apps.app_connection import AppConnection
-from openfoundry.models.connections import ALL_CONNECTION_CLASSES, Connection
-from openfoundry.models.connections.connection import ConnectionBase
+from openfoundry.models.connections import Connection, get_concrete_connections
 
 # Define terminal statuses for agent sessions
 AGENT_SESSION_TERMINAL_STATUSES = [
@@ -206,16 +205,11 @@ def create_app_agent_session(request: Request, app_id: uuid.UUID):
 
     # Process app connections to create secrets
     if app.app_connections:
+        concrete_connections = get_concrete_connections(
+            db, [app_connection.connection for app_connection in app.app_connections]
+        )
         for app_connection in app.app_connections:
-            connection_type = app_connection.connection.type
-            connection_class: type[ConnectionBase] = next(
-                cls for cls in ALL_CONNECTION_CLASSES if cls.type == connection_type
-            )
-            concrete_connection = (
-                db.query(connection_class)
-                .filter(connection_class.id == app_connection.connection_id)
-                .first()
-            )
+            concrete_connection = concrete_connections.get(app_connection.connection_id)
 
             if concrete_connection:
                 env_vars = concrete_connection.get_env_vars()
@@ -676,6 +670,15 @@ async def update_connections(
             detail=f"Connections not found: {missing_ids}",
         )
 
+    # Load the secrets of all connections before changing anything
+    concrete_connections = get_concrete_connections(db, connections)
+    missing_ids = {conn.id for conn in connections} - set(concrete_connections)
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Concrete connections not found: {missing_ids}",
+        )
+
     # Remove all existing app connections
     db.query(AppConnection).filter(AppConnection.app_id == app_id).delete()
 
@@ -688,59 +691,34 @@ async def update_connections(
     db.add_all(new_app_connections)
     db.commit()
 
-    # Upload all connections to the sandbox
-    uploaded_connections = []
+    # Sync all connections to the sandbox in one request. The sandbox only
+    # rebuilds the connections whose credentials changed.
+    secrets = {
+        connection.name: concrete_connections[connection.id].get_env_vars()
+        for connection in connections
+    }
     async with run_context.get_sandbox_client() as client:
-        # Remove all existing connections from the sandbox
         try:
-            response = await client.delete(
-                "/secrets/",
-                params={"prefix": "connections", "name": ""},
+            response = await client.put(
+                "/secrets/sync",
+                json={"prefix": "connections", "secrets": secrets},
             )
         except httpx.RequestError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to remove existing connections: {e}",
-            )
-
-        for connection in connections:
-            # Find the concrete connection class and get secrets
-            connection_class: type[ConnectionBase] = next(
-                (cls for cls in ALL_CONNECTION_CLASSES if cls.type == connection.type)
-            )
-
-            # Query the concrete connection
-            concrete_connection = (
-                db.query(connection_class)
-                .filter(connection_class.id == connection.id)
-                .first()
+                detail=f"Failed to sync connections: {e}",
             )
+        response.raise_for_status()
+        sync_result = response.json()
 
-            if not concrete_connection:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Concrete connection with id {connection.id} not found",
-                )
-
-            # Extract secrets and create payload
-            env_vars = concrete_connection.get_env_vars()
-            secret_payload = ConnectionPayload(
-                name=connection.name,
-                secrets=env_vars,
-            )
-
-            try:
-                response = await client.put(
-                    "/secrets/", json=secret_payload.model_dump()
-                )
-            except httpx.RequestError as e:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to upload connection {connection.name}: {e}",
-                )
-            response.raise_for_status()
-
-            uploaded_connections.append({"id": connection.id, "name": connection.name})
+    if sync_result["failed"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to add connections: {sync_result['failed']}",
+        )
+    uploaded_connections = [
+        {"id": connection.id, "name": connection.name} for connection in connections
+    ]
 
     return {
         "message": f"Successfully updated {len(uploaded_connections)} connections",
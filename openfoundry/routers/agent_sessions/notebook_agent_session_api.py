@@ -6,9 +6,11 @@ import uuid6
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     HTTPException,
     Query,
     Request,
+    Response,
     status,
 )
 from fastapi.responses import StreamingResponse
@@ -28,8 +30,7 @@ from openfoundry.models.agent_sessions.docker_utils import (
     container_exists,
     export_workspace_from_container,
 )
-from openfoundry.models.connections import ALL_CONNECTION_CLASSES, Connection
-from openfoundry.models.connections.connection import ConnectionBase
+from openfoundry.models.connections import Connection, get_concrete_connections
 from openfoundry.models.notebooks import Notebook, NotebookConnection
 
 # Define terminal statuses for agent sessions
@@ -168,15 +169,16 @@ def create_notebook_agent_session(request: Request, notebook_id: uuid.UUID):
 
     # Process notebook connections to create secrets
     if notebook.notebook_connections:
+        concrete_connections = get_concrete_connections(
+            db,
+            [
+                notebook_connection.connection
+                for notebook_connection in notebook.notebook_connections
+            ],
+        )
         for notebook_connection in notebook.notebook_connections:
-            connection_type = notebook_connection.connection.type
-            connection_class: type[ConnectionBase] = next(
-                cls for cls in ALL_CONNECTION_CLASSES if cls.type == connection_type
-            )
-            concrete_connection = (
-                db.query(connection_class)
-                .filter(connection_class.id == notebook_connection.connection_id)
-                .first()
+            concrete_connection = concrete_connections.get(
+                notebook_connection.connection_id
             )
 
             if concrete_connection:
@@ -490,6 +492,22 @@ async def stop_notebook_cell_execution(
         return response.json()
 
 
+@router.post(
+    "/notebooks/{notebook_id}/sessions/{session_id}/restart",
+)
+async def restart_notebook_kernel(
+    notebook_id: uuid.UUID,
+    session_id: uuid.UUID,
+    request: Request,
+    run_context: NotebookAgentRunContext = Depends(get_notebook_agent_run_context),
+):
+    """Restart the notebook kernel with a spare kernel of the sandbox."""
+    async with run_context.get_sandbox_client() as client:
+        response = await client.post("/api/notebook/restart")
+        response.raise_for_status()
+        return response.json()
+
+
 @router.get(
     "/notebooks/{notebook_id}/sessions/{session_id}/status",
 )
@@ -602,6 +620,63 @@ async def delete_notebook_cell(
         return response.json()
 
 
+@router.get(
+    "/notebooks/{notebook_id}/sessions/{session_id}/cells/{cell_id}/outputs",
+)
+async def get_notebook_cell_outputs(
+    notebook_id: uuid.UUID,
+    session_id: uuid.UUID,
+    cell_id: str,
+    request: Request,
+    indices: list[int] | None = Query(None),
+    run_context: NotebookAgentRunContext = Depends(get_notebook_agent_run_context),
+):
+    """Get outputs of a cell by index, e.g. those missed by a client mid-run."""
+    async with run_context.get_sandbox_client() as client:
+        response = await client.get(
+            f"/api/notebook/cells/{cell_id}/outputs",
+            params={"indices": indices} if indices is not None else None,
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+@router.get(
+    "/notebooks/{notebook_id}/sessions/{session_id}/blobs/{digest}",
+)
+async def get_notebook_output_blob(
+    notebook_id: uuid.UUID,
+    session_id: uuid.UUID,
+    digest: str,
+    request: Request,
+    mime_type: str | None = Query(None),
+    if_none_match: str | None = Header(None),
+    run_context: NotebookAgentRunContext = Depends(get_notebook_agent_run_context),
+):
+    """Get a large output value referenced from the notebook."""
+    async with run_context.get_sandbox_client() as client:
+        response = await client.get(
+            f"/api/notebook/blobs/{digest}",
+            params={"mime_type": mime_type} if mime_type is not None else None,
+            headers={"If-None-Match": if_none_match} if if_none_match else None,
+        )
+        if response.status_code != status.HTTP_304_NOT_MODIFIED:
+            response.raise_for_status()
+
+        # Blobs never change, so the cache headers of the sandbox are kept
+        headers = {
+            name: response.headers[name]
+            for name in ("ETag", "Cache-Control")
+            if name in response.headers
+        }
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            media_type=response.headers.get("Content-Type"),
+            headers=headers,
+        )
+
+
 @router.post(
     "/notebooks/{notebook_id}/sessions/{session_id}/save",
 )
@@ -737,6 +812,15 @@ async def update_notebook_connections(
             detail=f"Connections not found: {missing_ids}",
         )
 
+    # Load the secrets of all connections before changing anything
+    concrete_connections = get_concrete_connections(db, connections)
+    missing_ids = {conn.id for conn in connections} - set(concrete_connections)
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Concrete connections not found: {missing_ids}",
+        )
+
     # Remove all existing notebook connections
     from openfoundry.models.notebooks.notebook_connection import NotebookConnection
 
@@ -755,59 +839,34 @@ async def update_notebook_connections(
     db.add_all(new_notebook_connections)
     db.commit()
 
-    # Upload all connections to the sandbox
-    uploaded_connections = []
+    # Sync all connections to the sandbox in one request. The sandbox only
+    # rebuilds the connections whose credentials changed.
+    secrets = {
+        connection.name: concrete_connections[connection.id].get_env_vars()
+        for connection in connections
+    }
     async with run_context.get_sandbox_client() as client:
-        # Remove all existing connections from the sandbox
         try:
-            response = await client.delete(
-                "/secrets/",
-                params={"prefix": "connections", "name": ""},
+            response = await client.put(
+                "/secrets/sync",
+                json={"prefix": "connections", "secrets": secrets},
             )
         except httpx.RequestError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to remove existing connections: {e}",
+                detail=f"Failed to sync connections: {e}",
             )
+        response.raise_for_status()
+        sync_result = response.json()
 
-        for connection in connections:
-            # Find the concrete connection class and get secrets
-            connection_class: type[ConnectionBase] = next(
-                (cls for cls in ALL_CONNECTION_CLASSES if cls.type == connection.type)
-            )
-
-            # Query the concrete connection
-            concrete_connection = (
-                db.query(connection_class)
-                .filter(connection_class.id == connection.id)
-                .first()
-            )
-
-            if not concrete_connection:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Concrete connection with id {connection.id} not found",
-                )
-
-            # Extract secrets and create payload
-            env_vars = concrete_connection.get_env_vars()
-            secret_payload = ConnectionPayload(
-                name=connection.name,
-                secrets=env_vars,
-            )
-
-            try:
-                response = await client.put(
-                    "/secrets/", json=secret_payload.model_dump()
-                )
-            except httpx.RequestError as e:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to upload connection {connection.name}: {e}",
-                )
-            response.raise_for_status()
-
-            uploaded_connections.append({"id": connection.id, "name": connection.name})
+    if sync_result["failed"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to add connections: {sync_result['failed']}",
+        )
+    uploaded_connections = [
+        {"id": connection.id, "name": connection.name} for connection in connections
+    ]
 
     return {
         "message": f"Successfully updated {len(uploaded_connections)} connections",
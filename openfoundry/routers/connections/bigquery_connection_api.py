@@ -7,6 +7,9 @@ from sqlalchemy.orm import Session, joinedload
 
 from openfoundry.models.connections.bigquery_connection import BigQueryConnection
 from openfoundry.models.connections.connection import Connection
+from openfoundry.models.connections.connection_health import (
+    connection_health_service,
+)
 
 router = APIRouter(prefix="/api/connections")
 
@@ -87,7 +90,7 @@ def create_big_query_connection(
     )
 
     try:
-        bigquery_connection.check_connection()
+        connection_health_service.check_now(bigquery_connection)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -145,7 +148,7 @@ def update_big_query_connection(
     bigquery_connection.connection.name = bigquery_connection.name
 
     try:
-        bigquery_connection.check_connection()
+        connection_health_service.check_now(bigquery_connection)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -178,3 +181,4 @@ def delete_big_query_connection(request: Request, connection_id: UUID):
     specific_connection.connection.soft_delete()
     db.delete(specific_connection)
     db.commit()
+    connection_health_service.forget(connection_id)
@@ -7,6 +7,9 @@ from sqlalchemy.orm import Session, joinedload
 
 from openfoundry.models.connections.clickhouse_connection import ClickhouseConnection
 from openfoundry.models.connections.connection import Connection
+from openfoundry.models.connections.connection_health import (
+    connection_health_service,
+)
 
 router = APIRouter(prefix="/api/connections")
 
@@ -94,7 +97,7 @@ def create_clickhouse_connection(
         database=connection_data.database,
     )
     try:
-        clickhouse_connection.check_connection()
+        connection_health_service.check_now(clickhouse_connection)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -152,7 +155,7 @@ def update_clickhouse_connection(
     clickhouse_connection.connection.name = clickhouse_connection.name
 
     try:
-        clickhouse_connection.check_connection()
+        connection_health_service.check_now(clickhouse_connection)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -186,3 +189,4 @@ def delete_clickhouse_connection(request: Request, connection_id: UUID):
     specific_connection.connection.soft_delete()
     db.delete(specific_connection)
     db.commit()
+    connection_health_service.forget(connection_id)
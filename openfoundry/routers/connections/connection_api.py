@@ -1,10 +1,16 @@
+from datetime import UTC, datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from openfoundry.models.connections import get_concrete_connections
 from openfoundry.models.connections.connection import Connection
+from openfoundry.models.connections.connection_health import (
+    ConnectionHealth,
+    connection_health_service,
+)
 
 router = APIRouter()
 
@@ -35,3 +41,118 @@ def list_connections(request: Request):
         )
         for connection in connections
     ]
+
+
+class HealthCheckModel(BaseModel):
+    healthy: bool
+    latency_seconds: float
+    checked_at: datetime
+    error: str | None = None
+
+
+class ConnectionHealthModel(BaseModel):
+    id: UUID
+    name: str
+    type: str
+    status: str
+    latest: HealthCheckModel | None = None
+    history: list[HealthCheckModel] = []
+
+
+def _to_health_model(
+    connection: Connection, health: ConnectionHealth | None
+) -> ConnectionHealthModel:
+    history = [
+        HealthCheckModel(
+            healthy=result.healthy,
+            latency_seconds=result.latency_seconds,
+            checked_at=datetime.fromtimestamp(result.checked_at, UTC),
+            error=result.error,
+        )
+        for result in (health.history if health else [])
+    ]
+    if not history:
+        health_status = "unknown"
+    else:
+        health_status = "healthy" if history[-1].healthy else "unhealthy"
+    return ConnectionHealthModel(
+        id=connection.id,
+        name=connection.name,
+        type=connection.type.value,
+        status=health_status,
+        latest=history[-1] if history else None,
+        history=history,
+    )
+
+
+@router.get("/api/connections/health", response_model=list[ConnectionHealthModel])
+async def list_connection_health(
+    request: Request,
+    check: bool = Query(
+        False, description="Check connections whose cached health expired"
+    ),
+    refresh: bool = Query(False, description="Check every connection"),
+):
+    """List the health of all connections.
+
+    By default only the cached health is returned, so the response does not
+    wait on any login. Connections that were never checked are reported as
+    ``unknown``. With ``check`` or ``refresh``, connections are checked
+    concurrently before responding.
+    """
+    db: Session = request.state.db
+
+    connections = (
+        db.query(Connection)
+        .filter(
+            Connection.deleted_on.is_(None),
+        )
+        .order_by(Connection.name)
+        .all()
+    )
+    if check or refresh:
+        concrete_connections = get_concrete_connections(db, connections)
+        await connection_health_service.check_many(
+            list(concrete_connections.values()), refresh=refresh
+        )
+    return [
+        _to_health_model(
+            connection, connection_health_service.get_health(connection.id)
+        )
+        for connection in connections
+    ]
+
+
+@router.get(
+    "/api/connections/{connection_id}/health", response_model=ConnectionHealthModel
+)
+async def get_connection_health(
+    request: Request,
+    connection_id: UUID,
+    refresh: bool = Query(
+        False, description="Check the connection even if its health is cached"
+    ),
+):
+    """Get the health and latency history of a connection.
+
+    The connection is checked if its cached health expired.
+    """
+    db: Session = request.state.db
+
+    connection = (
+        db.query(Connection)
+        .filter(Connection.id == connection_id, Connection.deleted_on.is_(None))
+        .first()
+    )
+    if not connection:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="connection not found"
+        )
+    concrete_connection = get_concrete_connections(db, [connection]).get(connection_id)
+    if not concrete_connection:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="connection not found"
+        )
+
+    health = await connection_health_service.check(concrete_connection, refresh=refresh)
+    return _to_health_model(connection, health)
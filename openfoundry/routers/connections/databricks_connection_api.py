@@ -7,6 +7,9 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session, joinedload
 
 from openfoundry.models.connections.connection import Connection
+from openfoundry.models.connections.connection_health import (
+    connection_health_service,
+)
 from openfoundry.models.connections.databricks_connection import DatabricksConnection
 
 router = APIRouter(prefix="/api/connections")
@@ -101,7 +104,7 @@ def create_databricks_connection(
         schema=connection_data.schema_,
     )
     try:
-        databricks_connection.check_connection()
+        connection_health_service.check_now(databricks_connection)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -168,7 +171,7 @@ def update_databricks_connection(
     databricks_connection.connection.name = databricks_connection.name
 
     try:
-        databricks_connection.check_connection()
+        connection_health_service.check_now(databricks_connection)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -205,3 +208,4 @@ def delete_databricks_connection(request: Request, connection_id: UUID):
     specific_connection.connection.soft_delete()
     db.delete(specific_connection)
     db.commit()
+    connection_health_service.forget(connection_id)
@@ -6,6 +6,9 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session, joinedload
 
 from openfoundry.models.connections.connection import Connection
+from openfoundry.models.connections.connection_health import (
+    connection_health_service,
+)
 from openfoundry.models.connections.postgres_connection import PostgresConnection
 
 router = APIRouter(prefix="/api/connections")
@@ -104,7 +107,7 @@ def create_postgres_connection(
         schema=connection_data.schema_,
     )
     try:
-        postgres_connection.check_connection()
+        connection_health_service.check_now(postgres_connection)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -171,7 +174,7 @@ def update_postgres_connection(
     postgres_connection.connection.name = postgres_connection.name
 
     try:
-        postgres_connection.check_connection()
+        connection_health_service.check_now(postgres_connection)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -208,3 +211,4 @@ def delete_postgres_connection(request: Request, connection_id: UUID):
     specific_connection.connection.soft_delete()
     db.delete(specific_connection)
     db.commit()
+    connection_health_service.forget(connection_id)
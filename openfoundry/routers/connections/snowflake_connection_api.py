@@ -7,6 +7,9 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session, joinedload
 
 from openfoundry.models.connections.connection import Connection
+from openfoundry.models.connections.connection_health import (
+    connection_health_service,
+)
 from openfoundry.models.connections.snowflake_connection import SnowflakeConnection
 
 router = APIRouter(prefix="/api/connections")
@@ -109,7 +112,7 @@ def create_snowflake_connection(
         private_key=connection_data.private_key,
     )
     try:
-        snowflake_connection.check_connection()
+        connection_health_service.check_now(snowflake_connection)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -176,7 +179,7 @@ def update_snowflake_connection(
     snowflake_connection.connection.name = snowflake_connection.name
 
     try:
-        snowflake_connection.check_connection()
+        connection_health_service.check_now(snowflake_connection)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -213,3 +216,4 @@ def delete_snowflake_connection(request: Request, connection_id: UUID):
     specific_connection.connection.soft_delete()
     db.delete(specific_connection)
     db.commit()
+    connection_health_service.forget(connection_id)
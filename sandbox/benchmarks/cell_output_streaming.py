@@ -0,0 +1,163 @@
+"""
+Benchmark how quickly cell outputs are streamed while a cell executes.
+
+The event-driven ``CellExecutor`` is compared with the previous strategy of
+checking the outputs of the executing cell every 100 ms. For each cell the
+benchmark reports the latency between an output being received from the
+kernel and its output event being emitted, and the CPU time spent by the
+executor's process.
+
+Usage (from the ``sandbox`` directory):
+
+    python -m benchmarks.cell_output_streaming
+    python -m benchmarks.cell_output_streaming --lines 100000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import AsyncGenerator
+
+from nbformat import NotebookNode
+
+from openfoundry_sandbox.cell_executor import CellExecutor
+
+# Seconds between two checks of the polling strategy
+POLL_INTERVAL = 0.1
+
+
+class PollingCellExecutor(CellExecutor):
+    """The previous strategy: check the cell outputs on a fixed interval."""
+
+    async def _stream_cell_outputs(
+        self, execution_task: asyncio.Task, cell: NotebookNode
+    ) -> AsyncGenerator[tuple[int, NotebookNode], None]:
+        last_output_count = 0
+        while not execution_task.done():
+            await asyncio.sleep(POLL_INTERVAL)
+
+            current_outputs = list(cell.outputs)
+            for i in range(last_output_count, len(current_outputs)):
+                yield i, current_outputs[i]
+            last_output_count = len(current_outputs)
+
+
+@dataclass
+class StreamingResult:
+    """Measurements of one strategy on one cell."""
+
+    strategy: str
+    cell: str
+    output_events: int
+    first_output_ms: float
+    mean_latency_ms: float
+    p95_latency_ms: float
+    wall_seconds: float
+    cpu_seconds: float
+
+
+async def _measure(
+    executor: CellExecutor, strategy: str, name: str, code: str
+) -> StreamingResult:
+    """Execute a cell and measure the latency of its output events."""
+    client = executor.client
+    received_at: dict[int, float] = {}
+    process_message = client.process_message
+
+    def timed_process_message(msg, cell, cell_index):
+        output = process_message(msg, cell, cell_index)
+        if output is not None:
+            received_at.setdefault(len(cell.outputs) - 1, time.perf_counter())
+        return output
+
+    client.process_message = timed_process_message
+    latencies = []
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    first_output = None
+    try:
+        async for event in executor.execute_code_streaming(code, f"{name}-{strategy}"):
+            if event.event_type != "output":
+                continue
+            now = time.perf_counter()
+            first_output = first_output or now
+            index = event.data["output_index"]
+            if index in received_at:
+                latencies.append(now - received_at[index])
+    finally:
+        client.process_message = process_message
+
+    latencies.sort()
+    return StreamingResult(
+        strategy=strategy,
+        cell=name,
+        output_events=len(latencies),
+        first_output_ms=((first_output or started) - started) * 1000,
+        mean_latency_ms=statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        p95_latency_ms=latencies[int(len(latencies) * 0.95)] * 1000
+        if latencies
+        else 0.0,
+        wall_seconds=time.perf_counter() - started,
+        cpu_seconds=time.process_time() - cpu_started,
+    )
+
+
+async def run(lines: int, sleep_seconds: float) -> list[StreamingResult]:
+    cells = {
+        f"print {lines:,} lines": (
+            f"for i in range({lines}):\n    print(f'line {{i}}', flush=True)"
+        ),
+        f"sleep {sleep_seconds:g}s": (
+            f"import time\nprint('start', flush=True)\ntime.sleep({sleep_seconds})"
+        ),
+    }
+
+    results = []
+    for strategy, executor_class in [
+        ("polling", PollingCellExecutor),
+        ("event-driven", CellExecutor),
+    ]:
+        executor = executor_class()
+        await executor.start_kernel()
+        executor.complete_initialization()
+        try:
+            # Warm up the kernel before measuring
+            async for _ in executor.execute_code_streaming("print('ready')", "warm-up"):
+                pass
+            for name, code in cells.items():
+                results.append(await _measure(executor, strategy, name, code))
+        finally:
+            await executor.shutdown_kernel()
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.cell_output_streaming",
+        description=__doc__.split("\n")[1],
+    )
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--sleep", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.lines, args.sleep))
+
+    print(
+        f"{'strategy':<13} {'cell':<20} {'events':>7} {'first (ms)':>10} "
+        f"{'mean (ms)':>9} {'p95 (ms)':>8} {'wall (s)':>8} {'CPU (s)':>7}"
+    )
+    for result in results:
+        print(
+            f"{result.strategy:<13} {result.cell:<20} {result.output_events:>7,} "
+            f"{result.first_output_ms:>10.1f} {result.mean_latency_ms:>9.1f} "
+            f"{result.p95_latency_ms:>8.1f} {result.wall_seconds:>8.2f} "
+            f"{result.cpu_seconds:>7.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
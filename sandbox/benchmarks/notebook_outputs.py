@@ -0,0 +1,135 @@
+"""
+Benchmark notebook fetches and sandbox memory as outputs accumulate.
+
+Cells displaying a large plot are added to a notebook one batch at a time.
+After each batch the benchmark measures the size and latency of a
+``/api/notebook/notebook`` response and the resident memory of the process,
+with large outputs kept inline and with them spooled to the blob store.
+
+Usage (from the ``sandbox`` directory):
+
+    python -m benchmarks.notebook_outputs
+    python -m benchmarks.notebook_outputs --cells 200 --output-kb 500
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+
+from openfoundry_sandbox.cell_executor import CellExecutor
+from openfoundry_sandbox.output_blobs import OutputBlobStore
+
+# Number of times a fetch is repeated to measure its latency
+FETCH_REPEATS = 5
+
+
+@dataclass
+class OutputsResult:
+    """Measurements of one strategy at one notebook size."""
+
+    strategy: str
+    cells: int
+    response_bytes: int
+    fetch_ms: float
+    rss_mb: float
+
+
+def _rss_mb() -> float:
+    """Current resident memory of the process."""
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _fetch_notebook(executor: CellExecutor) -> tuple[int, float]:
+    """Serialize the notebook like the endpoint does, returning size and time."""
+    timings = []
+    size = 0
+    for _ in range(FETCH_REPEATS):
+        started = time.perf_counter()
+        size = len(json.dumps(jsonable_encoder(executor.nb)).encode())
+        timings.append(time.perf_counter() - started)
+    return size, min(timings) * 1000
+
+
+async def run(
+    cells: int, batch_size: int, output_kb: int, blobs_dir: Path
+) -> list[OutputsResult]:
+    code = (
+        "import os\nfrom IPython.display import Image, display\n"
+        f"display(Image(data=os.urandom({output_kb * 1024}), format='png'))"
+    )
+
+    results = []
+    for strategy, output_blobs in [
+        ("inline", OutputBlobStore(blobs_dir, threshold_chars=sys.maxsize)),
+        ("spooled", OutputBlobStore(blobs_dir)),
+    ]:
+        executor = CellExecutor()
+        executor.output_blobs = output_blobs
+        await executor.start_kernel()
+        executor.complete_initialization()
+        try:
+            for cell_number in range(cells):
+                async for _ in executor.execute_code_streaming(
+                    code, f"plot-{cell_number}"
+                ):
+                    pass
+                if (cell_number + 1) % batch_size == 0:
+                    gc.collect()
+                    response_bytes, fetch_ms = _fetch_notebook(executor)
+                    results.append(
+                        OutputsResult(
+                            strategy=strategy,
+                            cells=cell_number + 1,
+                            response_bytes=response_bytes,
+                            fetch_ms=fetch_ms,
+                            rss_mb=_rss_mb(),
+                        )
+                    )
+        finally:
+            await executor.shutdown_kernel()
+            del executor
+            gc.collect()
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.notebook_outputs",
+        description=__doc__.split("\n")[1],
+    )
+    parser.add_argument("--cells", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--output-kb", type=int, default=250)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as blobs_dir:
+        results = asyncio.run(
+            run(args.cells, args.batch_size, args.output_kb, Path(blobs_dir))
+        )
+
+    print(
+        f"{'strategy':<8} {'cells':>5} {'response (KB)':>13} "
+        f"{'fetch (ms)':>10} {'RSS (MB)':>8}"
+    )
+    for result in results:
+        print(
+            f"{result.strategy:<8} {result.cells:>5} "
+            f"{result.response_bytes / 1024:>13,.1f} {result.fetch_ms:>10.2f} "
+            f"{result.rss_mb:>8.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,408 @@
+"""
+Benchmark the SQL execution paths of the sandbox connection layer.
+
+Each result path is measured for every result size in a fresh process, so the
+reported peak RSS belongs to that single case. Queries run against a
+synthetic DB-API driver by default, or against a local Postgres database with
+``--postgres``.
+
+Usage (from the ``sandbox`` directory):
+
+    python -m benchmarks.sql_execution
+    python -m benchmarks.sql_execution --sizes 1000,1000000 --paths records,arrow
+    python -m benchmarks.sql_execution --postgres postgresql://postgres@localhost/postgres
+    python -m benchmarks.sql_execution --output new.json --baseline old.json
+
+With ``--baseline`` the run fails if a case got slower or used more memory
+than in the baseline by more than ``--max-regression``.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+import pydantic_core
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.synthetic import SyntheticConnection, postgres_query, synthetic_query
+from openfoundry_sandbox.connections.connection import Connection
+from openfoundry_sandbox.connections.utils import (
+    ResultFormat,
+    serialize_arrow_table,
+    table_to_json_rows,
+)
+
+# Result sizes measured by default, in rows
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+# Number of columns of the benchmark result sets, cycling through mixed types
+DEFAULT_COLUMNS = 8
+
+# Rows fetched per page by the streaming path, as in paginated SQL jobs
+STREAM_BATCH_SIZE = 10_000
+
+# Connection name used when running through the /execute_sql endpoint
+BENCHMARK_CONNECTION_NAME = "benchmark"
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one result path for one result size."""
+
+    path: str
+    rows: int
+    columns: int
+    fetch_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    total_seconds: float = 0.0
+    rows_per_second: float = 0.0
+    payload_bytes: int = 0
+    peak_rss_mb: float = 0.0
+    error: str | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.path}/{self.rows}"
+
+
+# --- Result Paths ---
+
+
+def _run_records(connection: Connection, sql_statement: str) -> tuple[float, bytes]:
+    """The default JSON layout: rows as a list of dicts."""
+    result = connection.execute_sql(sql_statement)
+    if not result.success:
+        raise RuntimeError(result.error)
+    fetched = time.perf_counter()
+    body = json.dumps(
+        jsonable_encoder(
+            {
+                "success": result.success,
+                "rows_affected": result.rows_affected,
+                "data": result.data,
+                "error": result.error,
+            }
+        )
+    ).encode()
+    return fetched, body
+
+
+def _run_columns(connection: Connection, sql_statement: str) -> tuple[float, bytes]:
+    """The columnar JSON layout: Arrow converted to JSON-safe values per column."""
+    result = connection.execute_sql_arrow(sql_statement)
+    if not result.success:
+        raise RuntimeError(result.error)
+    fetched = time.perf_counter()
+    body = pydantic_core.to_json(
+        {
+            "success": True,
+            "rows_affected": result.rows_affected,
+            "columns": result.table.column_names,
+            "column_types": [str(field.type) for field in result.table.schema],
+            "rows": table_to_json_rows(result.table),
+        }
+    )
+    return fetched, body
+
+
+def _binary_path(
+    result_format: ResultFormat,
+) -> Callable[[Connection, str], tuple[float, bytes]]:
+    def run(connection: Connection, sql_statement: str) -> tuple[float, bytes]:
+        result = connection.execute_sql_arrow(sql_statement)
+        if not result.success:
+            raise RuntimeError(result.error)
+        fetched = time.perf_counter()
+        return fetched, serialize_arrow_table(result.table, result_format)
+
+    run.__doc__ = f"Rows fetched as Arrow and returned as {result_format.value} bytes."
+    return run
+
+
+def _run_stream(connection: Connection, sql_statement: str) -> tuple[float, bytes]:
+    """Paginated fetching: rows fetched and serialized one page at a time."""
+    fetch_seconds = 0.0
+    payload_bytes = 0
+    stream = connection.open_stream(sql_statement)
+    try:
+        while True:
+            started = time.perf_counter()
+            rows = stream.fetch_batch(STREAM_BATCH_SIZE)
+            fetch_seconds += time.perf_counter() - started
+            if not rows:
+                break
+            payload_bytes += len(pydantic_core.to_json(jsonable_encoder(rows)))
+    finally:
+        stream.close()
+    # Only the fetching is attributed to the driver, the rest is serialization
+    return fetch_seconds, b"\0" * payload_bytes
+
+
+def _run_drain(connection: Connection, sql_statement: str) -> tuple[float, bytes]:
+    """Baseline: the driver fetching all rows, without any conversion."""
+    with connection._pool.connection() as conn, connection._get_cursor(conn) as cursor:
+        cursor.execute(sql_statement)
+        cursor.fetchall()
+    return time.perf_counter(), b""
+
+
+PATHS: dict[str, Callable[[Connection, str], tuple[float, bytes]]] = {
+    "drain": _run_drain,
+    "records": _run_records,
+    "columns": _run_columns,
+    "arrow": _binary_path(ResultFormat.ARROW),
+    "parquet": _binary_path(ResultFormat.PARQUET),
+    "stream": _run_stream,
+}
+
+# Request bodies of the /execute_sql endpoint, by result path
+ENDPOINT_PATHS: dict[str, dict[str, Any]] = {
+    "endpoint-records": {},
+    "endpoint-columns": {"json_layout": "columns"},
+    "endpoint-arrow": {"result_format": "arrow"},
+    "endpoint-parquet": {"result_format": "parquet"},
+}
+
+
+# --- Benchmark Runner ---
+
+
+def _create_connection(postgres_url: str | None) -> Connection:
+    """Create the connection the benchmark queries run on."""
+    if postgres_url is None:
+        return SyntheticConnection(secrets={})
+
+    from openfoundry_sandbox.connections.postgres_connection import (
+        PostgresConnection,
+    )
+
+    url = urlparse(postgres_url)
+    return PostgresConnection(
+        secrets={
+            "POSTGRES_HOST": url.hostname or "localhost",
+            "POSTGRES_PORT": str(url.port or 5432),
+            "POSTGRES_DATABASE": url.path.lstrip("/") or "postgres",
+            "POSTGRES_USER": url.username or "postgres",
+            "POSTGRES_PASSWORD": url.password or "",
+        }
+    )
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_endpoint(
+    connection: Connection, sql_statement: str, body: dict[str, Any]
+) -> tuple[float, bytes]:
+    """Run a statement through the /execute_sql endpoint of the sandbox server."""
+    from fastapi.testclient import TestClient
+
+    from openfoundry_sandbox.connections.connection_manager import (
+        connection_manager,
+    )
+    from openfoundry_sandbox.sandbox_server import app
+
+    connection_manager._connections[BENCHMARK_CONNECTION_NAME] = connection
+    client = TestClient(app)
+    response = client.post(
+        "/execute_sql",
+        json={
+            "sql_statement": sql_statement,
+            "connection_name": BENCHMARK_CONNECTION_NAME,
+            **body,
+        },
+    )
+    response.raise_for_status()
+    # Fetching and serializing happen within the request
+    return time.perf_counter(), response.content
+
+
+def _run_case(
+    path: str, rows: int, columns: int, postgres_url: str | None
+) -> BenchmarkResult:
+    """Measure one result path for one result size in the current process."""
+    connection = _create_connection(postgres_url)
+    sql_statement = (
+        postgres_query(rows, columns)
+        if postgres_url is not None
+        else synthetic_query(rows, columns)
+    )
+
+    def run(sql: str) -> tuple[float, bytes]:
+        if path in ENDPOINT_PATHS:
+            return _run_endpoint(connection, sql, ENDPOINT_PATHS[path])
+        return PATHS[path](connection, sql)
+
+    # A single-row run first, so imports and connecting are not measured
+    run(postgres_query(1, columns) if postgres_url else synthetic_query(1, columns))
+
+    started = time.perf_counter()
+    fetched, body = run(sql_statement)
+    finished = time.perf_counter()
+    connection.close()
+
+    # The streaming path reports its fetch duration instead of a timestamp
+    fetch_seconds = fetched if path == "stream" else fetched - started
+    total_seconds = finished - started
+    return BenchmarkResult(
+        path=path,
+        rows=rows,
+        columns=columns,
+        fetch_seconds=fetch_seconds,
+        serialize_seconds=total_seconds - fetch_seconds,
+        total_seconds=total_seconds,
+        rows_per_second=rows / total_seconds if total_seconds else 0.0,
+        payload_bytes=len(body),
+        peak_rss_mb=_peak_rss_mb(),
+    )
+
+
+def _case_worker(queue: multiprocessing.Queue, *args: Any) -> None:
+    try:
+        queue.put(asdict(_run_case(*args)))
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_case_isolated(
+    path: str, rows: int, columns: int, postgres_url: str | None
+) -> BenchmarkResult:
+    """Measure one case in a fresh process, so its peak RSS is not shared."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(
+        target=_case_worker, args=(queue, path, rows, columns, postgres_url)
+    )
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        # e.g. killed by the OOM killer
+        return BenchmarkResult(
+            path, rows, columns, error=f"Exited with code {process.exitcode}"
+        )
+    result = queue.get()
+    if "path" not in result:
+        return BenchmarkResult(path, rows, columns, error=result["error"])
+    return BenchmarkResult(**result)
+
+
+def find_regressions(
+    results: list[BenchmarkResult],
+    baseline: list[BenchmarkResult],
+    max_regression: float,
+) -> list[str]:
+    """Compare results to a baseline, describing the cases that got worse."""
+    baseline_by_key = {result.key: result for result in baseline if not result.error}
+    regressions = []
+    for result in results:
+        previous = baseline_by_key.get(result.key)
+        if previous is None:
+            continue
+        if result.error:
+            regressions.append(f"{result.key}: failed ({result.error})")
+            continue
+        if result.rows_per_second < previous.rows_per_second * (1 - max_regression):
+            regressions.append(
+                f"{result.key}: {result.rows_per_second:,.0f} rows/s, "
+                f"was {previous.rows_per_second:,.0f} rows/s"
+            )
+        if result.peak_rss_mb > previous.peak_rss_mb * (1 + max_regression):
+            regressions.append(
+                f"{result.key}: peak RSS {result.peak_rss_mb:,.0f} MB, "
+                f"was {previous.peak_rss_mb:,.0f} MB"
+            )
+    return regressions
+
+
+def _print_result(result: BenchmarkResult) -> None:
+    if result.error:
+        print(f"{result.path:<18} {result.rows:>11,}  failed: {result.error}")
+        return
+    print(
+        f"{result.path:<18} {result.rows:>11,} {result.rows_per_second:>13,.0f} "
+        f"{result.fetch_seconds:>9.3f} {result.serialize_seconds:>11.3f} "
+        f"{result.payload_bytes / 1e6:>11.1f} {result.peak_rss_mb:>9.0f}",
+        flush=True,
+    )
+
+
+def _parse_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.sql_execution", description=__doc__.split("\n")[1]
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in _parse_list(value)],
+        default=DEFAULT_SIZES,
+        help="Comma-separated result sizes in rows",
+    )
+    parser.add_argument("--columns", type=int, default=DEFAULT_COLUMNS)
+    parser.add_argument(
+        "--paths",
+        type=_parse_list,
+        default=list(PATHS),
+        help=f"Comma-separated result paths among {', '.join([*PATHS, *ENDPOINT_PATHS])}",
+    )
+    parser.add_argument(
+        "--postgres",
+        metavar="URL",
+        default=os.environ.get("BENCHMARK_POSTGRES_URL"),
+        help="Query a Postgres database with generate_series instead of the synthetic driver",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare to results written by --output")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Tolerated relative slowdown or memory growth against the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    unknown_paths = set(args.paths) - set(PATHS) - set(ENDPOINT_PATHS)
+    if unknown_paths:
+        parser.error(f"Unknown paths: {', '.join(sorted(unknown_paths))}")
+
+    print(
+        f"{'path':<18} {'rows':>11} {'rows/s':>13} {'fetch (s)':>9} "
+        f"{'serialize (s)':>11} {'payload (MB)':>11} {'peak RSS (MB)':>9}"
+    )
+    results = []
+    for rows in args.sizes:
+        for path in args.paths:
+            result = run_case_isolated(path, rows, args.columns, args.postgres)
+            _print_result(result)
+            results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = [BenchmarkResult(**result) for result in json.load(f)]
+        regressions = find_regressions(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import re
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable
+
+from openfoundry_sandbox.connections.connection import Connection
+
+# Statements understood by the synthetic driver, e.g. "SELECT * FROM synthetic(1000, 8)"
+SYNTHETIC_QUERY_PATTERN = re.compile(
+    r"synthetic\(\s*(?P<rows>\d+)\s*,\s*(?P<columns>\d+)\s*\)", re.IGNORECASE
+)
+
+_BASE_TIMESTAMP = datetime(2024, 1, 1)
+_BASE_DATE = date(2024, 1, 1)
+
+# Column kinds cycled through by synthetic results, as a value generator and
+# the equivalent Postgres expression over a generate_series index ``i``
+COLUMN_KINDS: list[tuple[str, Callable[[int], Any], str]] = [
+    ("int", lambda i: i, "i"),
+    ("float", lambda i: i * 0.5, "i * 0.5::float8"),
+    ("text", lambda i: f"name-{i}", "'name-' || i"),
+    ("decimal", lambda i: Decimal(i) / 100, "(i / 100.0)::numeric(18, 2)"),
+    (
+        "timestamp",
+        lambda i: _BASE_TIMESTAMP + timedelta(seconds=i),
+        "timestamp '2024-01-01' + i * interval '1 second'",
+    ),
+    (
+        "date",
+        lambda i: _BASE_DATE + timedelta(days=i % 3650),
+        "date '2024-01-01' + (i % 3650)::int",
+    ),
+    ("bool", lambda i: i % 2 == 0, "i % 2 = 0"),
+    (
+        "nullable_text",
+        lambda i: None if i % 10 == 0 else f"v{i}",
+        "CASE WHEN i % 10 = 0 THEN NULL ELSE 'v' || i END",
+    ),
+]
+
+
+def synthetic_query(rows: int, columns: int) -> str:
+    """Build the statement returning ``rows`` rows of ``columns`` mixed columns."""
+    return f"SELECT * FROM synthetic({rows}, {columns})"
+
+
+def postgres_query(rows: int, columns: int) -> str:
+    """Build a Postgres statement with the same shape as ``synthetic_query``."""
+    expressions = [
+        f"{COLUMN_KINDS[index % len(COLUMN_KINDS)][2]} AS c{index}"
+        for index in range(columns)
+    ]
+    return (
+        f"SELECT {', '.join(expressions)} "
+        f"FROM generate_series(1, {rows}::bigint) AS s(i)"
+    )
+
+
+class SyntheticCursor:
+    """DB-API cursor producing rows on demand, like a driver reading the wire."""
+
+    arraysize = 1000
+
+    def __init__(self) -> None:
+        self.description: list[tuple] | None = None
+        self.rowcount = -1
+        self._generators: list[Callable[[int], Any]] = []
+        self._next_row = 0
+        self._row_count = 0
+
+    def execute(self, sql_statement: str, parameters: Any = None) -> None:
+        match = SYNTHETIC_QUERY_PATTERN.search(sql_statement)
+        if match is None:
+            # Statements without a result set, e.g. the pool's liveness check
+            self.description = [("?column?", None, None, None, None, None, None)]
+            self._generators = [lambda i: 1]
+            self._next_row, self._row_count = 0, 1
+            return
+
+        columns = int(match.group("columns"))
+        kinds = [COLUMN_KINDS[index % len(COLUMN_KINDS)] for index in range(columns)]
+        self.description = [
+            (f"c{index}_{kind[0]}", None, None, None, None, None, None)
+            for index, kind in enumerate(kinds)
+        ]
+        self._generators = [kind[1] for kind in kinds]
+        self._next_row = 0
+        self._row_count = int(match.group("rows"))
+        self.rowcount = self._row_count
+
+    def fetchmany(self, size: int | None = None) -> list[tuple]:
+        size = self.arraysize if size is None else size
+        end = min(self._next_row + size, self._row_count)
+        generators = self._generators
+        rows = [
+            tuple(generate(i) for generate in generators)
+            for i in range(self._next_row, end)
+        ]
+        self._next_row = end
+        return rows
+
+    def fetchall(self) -> list[tuple]:
+        return self.fetchmany(self._row_count - self._next_row)
+
+    def fetchone(self) -> tuple | None:
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def cancel(self) -> None:
+        self._next_row = self._row_count
+
+    def close(self) -> None:
+        self._generators = []
+
+
+class SyntheticDBAPIConnection:
+    """DB-API connection handing out synthetic cursors."""
+
+    def cursor(self) -> SyntheticCursor:
+        return SyntheticCursor()
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SyntheticConnection(Connection):
+    """Connection whose queries return generated rows of mixed types.
+
+    Rows are built in Python as they are fetched, so the benchmark measures
+    the sandbox's own result handling on top of a cost comparable to a DB-API
+    driver decoding rows.
+    """
+
+    def _create_connection(self) -> SyntheticDBAPIConnection:
+        """Open a synthetic DB-API connection"""
+        return SyntheticDBAPIConnection()
+
+    def _is_alive(self, conn: SyntheticDBAPIConnection) -> bool:
+        """Synthetic connections do not go stale."""
+        return True
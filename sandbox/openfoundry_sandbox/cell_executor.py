@@ -1,25 +1,26 @@
 import asyncio
+import hashlib
+import json
 import logging
 import uuid
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, AsyncGenerator, NamedTuple
+from typing import Any, AsyncGenerator, Callable, NamedTuple
 
 from nbclient import NotebookClient
 from nbclient.exceptions import CellExecutionError
 from nbformat import NotebookNode, read
-from nbformat.v4 import new_code_cell, new_notebook
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook
 from pydantic import BaseModel, Field
 
 from openfoundry_sandbox.config import get_notebook_path, get_workspace_path
+from openfoundry_sandbox.kernel_pool import KERNEL_NAME, KernelPool
 from openfoundry_sandbox.notebook_types import TailCellsResult
+from openfoundry_sandbox.output_blobs import OutputBlobStore
 
 logger = logging.getLogger(__name__)
 
-# Constants
-KERNEL_START_TIMEOUT = 10.0  # seconds to wait for kernel start
-
 
 class KernelStatus(str, Enum):
     """Simplified kernel status states."""
@@ -57,6 +58,91 @@ class ExecutionEvent(BaseModel):
     )
 
 
+def hash_output(output: NotebookNode) -> str:
+    """Hash a cell output, so clients can tell whether their copy is current."""
+    serialized = json.dumps(output, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+
+
+class CellIndex:
+    """Map from cell id to the position of the cell in a notebook.
+
+    Positions are kept for a prefix of the cells that is known to be up to
+    date. Inserting, moving or deleting a cell only shortens that prefix, and
+    the positions after it are recomputed on the next lookup that needs them.
+    Lookups are O(1) while the notebook does not change, and appending a cell
+    keeps the whole index valid.
+    """
+
+    def __init__(self, cells: list[NotebookNode]):
+        self._cells = cells
+        self._positions: dict[str, int] = {}
+        # Positions of the cells before this index are up to date
+        self._valid_until = 0
+
+    def get(self, cell_id: str) -> int | None:
+        """Get the position of a cell, or None if there is no such cell."""
+        position = self._positions.get(cell_id)
+        if position is not None and position < self._valid_until:
+            if self._cells[position].get("id") == cell_id:
+                return position
+            # The cells were changed without going through the index
+            self._valid_until = 0
+
+        self._reindex()
+        return self._positions.get(cell_id)
+
+    def insert(self, position: int, cell: NotebookNode) -> int:
+        """Insert a cell, returning its position clamped to the notebook."""
+        position = max(0, min(position, len(self._cells)))
+        self._cells.insert(position, cell)
+        if position == len(self._cells) - 1 and self._valid_until == position:
+            self._positions[cell.id] = position
+            self._valid_until += 1
+        else:
+            self._invalidate_from(position)
+        return position
+
+    def move(self, cell_id: str, position: int) -> int | None:
+        """Move a cell, returning its new position or None if there is no such cell."""
+        current = self.get(cell_id)
+        if current is None:
+            return None
+        position = max(0, min(position, len(self._cells) - 1))
+        self._cells.insert(position, self._cells.pop(current))
+        self._invalidate_from(min(current, position))
+        return position
+
+    def delete(self, cell_id: str) -> NotebookNode | None:
+        """Delete a cell, returning it or None if there is no such cell."""
+        position = self.get(cell_id)
+        if position is None:
+            return None
+        cell = self._cells.pop(position)
+        del self._positions[cell_id]
+        self._invalidate_from(position)
+        return cell
+
+    def _invalidate_from(self, position: int) -> None:
+        self._valid_until = min(self._valid_until, position)
+
+    def _reindex(self) -> None:
+        """Recompute the positions of the cells after the up-to-date prefix."""
+        if self._valid_until == 0:
+            self._positions.clear()
+        for position in range(self._valid_until, len(self._cells)):
+            cell_id = self._cells[position].get("id")
+            if cell_id is not None:
+                self._positions[cell_id] = position
+        self._valid_until = len(self._cells)
+
+
+class CellMoveError(Exception):
+    """Exception raised when a cell cannot be moved, inserted or deleted."""
+
+    pass
+
+
 class ExecutionRequest(NamedTuple):
     """Container for a queued execution request."""
 
@@ -65,18 +151,43 @@ class ExecutionRequest(NamedTuple):
     result_queue: asyncio.Queue
 
 
+class StreamingNotebookClient(NotebookClient):
+    """Notebook client that signals each processed IOPub message.
+
+    The signal lets ``CellExecutor`` forward outputs as soon as they are
+    added to a cell rather than checking for them periodically.
+    """
+
+    # Called after each IOPub message of the executing cell is processed
+    on_message: Callable[[], None] | None = None
+
+    def process_message(
+        self, msg: dict[str, Any], cell: NotebookNode, cell_index: int
+    ) -> NotebookNode | None:
+        try:
+            return super().process_message(msg, cell, cell_index)
+        finally:
+            if self.on_message is not None:
+                self.on_message()
+
+
 class CellExecutor:
     """Simplified notebook cell execution and kernel management."""
 
     def __init__(self):
-        self.client: NotebookClient | None = None
+        self.client: StreamingNotebookClient | None = None
         self.kernel_id: str | None = None
         self._status: KernelStatus = KernelStatus.STARTING
         self._execution_lock = asyncio.Lock()
+        self.output_blobs = OutputBlobStore()
         self.nb = self._load_or_create_notebook()
+        self._cell_index = CellIndex(self.nb.cells)
         self._executing_cell_id: str | None = None
         self._execution_queue: asyncio.Queue = asyncio.Queue()
         self._queue_processor_task: asyncio.Task | None = None
+        self._kernel_pool = KernelPool(cwd=get_workspace_path())
+        # Shutdowns of replaced kernels, referenced until they finish
+        self._kernel_shutdowns: set[asyncio.Task] = set()
 
     def _load_or_create_notebook(self) -> NotebookNode:
         """Load existing notebook from file or create a new one if not found."""
@@ -90,6 +201,10 @@ class CellExecutor:
                 logger.info(
                     f"Successfully loaded notebook with {len(notebook.cells)} cells"
                 )
+                for cell in notebook.cells:
+                    self._spool_outputs(cell)
+                # Blobs of previous sessions are only kept if still referenced
+                self.output_blobs.prune(notebook)
                 return notebook
             except Exception as e:
                 logger.error(f"Failed to load notebook from {notebook_path}: {e}")
@@ -106,19 +221,13 @@ class CellExecutor:
 
         try:
             logger.info("Starting Jupyter Python kernel...")
-            self.client = NotebookClient(self.nb, kernel_name="python3")
-
-            # Create kernel manager and start kernel
-            self.client.create_kernel_manager()
-            workspace_path = get_workspace_path()
-            await asyncio.wait_for(
-                self.client.async_start_new_kernel(cwd=workspace_path),
-                timeout=KERNEL_START_TIMEOUT,
-            )
-            await asyncio.wait_for(
-                self.client.async_start_new_kernel_client(),
-                timeout=KERNEL_START_TIMEOUT,
+
+            # Take a started and preloaded kernel from the pool
+            kernel = await self._kernel_pool.acquire()
+            self.client = StreamingNotebookClient(
+                self.nb, km=kernel.km, kernel_name=KERNEL_NAME
             )
+            self.client.kc = kernel.kc
 
             self.kernel_id = str(uuid.uuid4())
             self._status = KernelStatus.INITIALIZING
@@ -243,33 +352,83 @@ class CellExecutor:
                 f"Notified {cleared_count} pending execution requests about kernel shutting down"
             )
 
+    async def _stop_queue_processor(self):
+        """Stop processing executions and notify pending requests."""
+        # Cancel the queue processor
+        if self._queue_processor_task and not self._queue_processor_task.done():
+            self._queue_processor_task.cancel()
+            try:
+                await self._queue_processor_task
+            except asyncio.CancelledError:
+                pass
+        self._queue_processor_task = None
+
+        # Clear the execution queue and notify pending requests
+        await self._clear_execution_queue()
+
+    def _reset_kernel_state(self):
+        """Forget the current kernel once it is shut down or replaced."""
+        self.client = None
+        self.kernel_id = None
+        self._executing_cell_id = None
+        self._status = KernelStatus.STARTING
+
+    async def restart_kernel(self) -> bool:
+        """
+        Restart the kernel by swapping in a spare kernel from the pool.
+
+        Pending executions are cancelled and the kernel state is lost, while
+        cell outputs are kept. The replaced kernel is shut down in the
+        background.
+        """
+        logger.info("Restarting Jupyter kernel...")
+
+        await self._stop_queue_processor()
+        previous_client = self.client
+        self._reset_kernel_state()
+
+        try:
+            await self.start_kernel()
+        finally:
+            if previous_client and previous_client.km:
+                shutdown = asyncio.create_task(self._shutdown_client(previous_client))
+                self._kernel_shutdowns.add(shutdown)
+                shutdown.add_done_callback(self._kernel_shutdowns.discard)
+
+        self.complete_initialization()
+        logger.info(f"Kernel restarted with kernel ID {self.kernel_id}")
+        return True
+
+    async def _shutdown_client(self, client: StreamingNotebookClient):
+        """Disconnect a notebook client and stop its kernel."""
+        try:
+            if client.kc:
+                client.kc.stop_channels()
+            await client.km.shutdown_kernel(now=True)
+            logger.info("Kernel shutdown successfully")
+        except Exception as e:
+            logger.error(f"Failed to shutdown kernel: {e}")
+
     async def shutdown_kernel(self) -> bool:
-        """Shutdown the kernel and clean up resources."""
+        """Shutdown the kernel and the spare kernels, and clean up resources."""
         logger.info("Shutting down Jupyter kernel...")
 
         try:
-            # Cancel the queue processor
-            if self._queue_processor_task and not self._queue_processor_task.done():
-                self._queue_processor_task.cancel()
-                try:
-                    await self._queue_processor_task
-                except asyncio.CancelledError:
-                    pass
-
-            # Clear the execution queue and notify pending requests
-            await self._clear_execution_queue()
+            await self._stop_queue_processor()
 
             # Shutdown the kernel
             if self.client and self.client.km:
+                if self.client.kc:
+                    self.client.kc.stop_channels()
                 await self.client.km.shutdown_kernel(now=True)
                 logger.info("Kernel shutdown successfully")
 
+            await self._kernel_pool.shutdown()
+            if self._kernel_shutdowns:
+                await asyncio.gather(*self._kernel_shutdowns)
+
             # Reset state
-            self.client = None
-            self.kernel_id = None
-            self._executing_cell_id = None
-            self._status = KernelStatus.STARTING
-            self._queue_processor_task = None
+            self._reset_kernel_state()
 
             logger.info("Kernel cleanup completed")
             return True
@@ -282,23 +441,92 @@ class CellExecutor:
     def _get_or_create_cell(self, code: str, cell_id: str) -> CellWithIndex:
         """Get or create a cell for execution."""
         # Check if cell exists
-        for i, cell in enumerate(self.nb.cells):
-            if cell.id == cell_id:
-                cell.source = code
-                return CellWithIndex(cell=cell, index=i)
+        index = self._cell_index.get(cell_id)
+        if index is not None:
+            cell = self.nb.cells[index]
+            cell.source = code
+            return CellWithIndex(cell=cell, index=index)
 
         # Create new cell
         cell = new_code_cell(source=code)
         cell.id = cell_id
-        self.nb.cells.append(cell)
-        return CellWithIndex(cell=cell, index=len(self.nb.cells) - 1)
+        index = self._cell_index.insert(len(self.nb.cells), cell)
+        return CellWithIndex(cell=cell, index=index)
 
     def _get_cell_by_id(self, cell_id: str) -> NotebookNode | None:
         """Get a cell by its ID."""
-        for cell in self.nb.cells:
-            if cell.id == cell_id:
-                return cell
-        return None
+        index = self._cell_index.get(cell_id)
+        return self.nb.cells[index] if index is not None else None
+
+    def get_cell_index(self, cell_id: str) -> int | None:
+        """Get the index of a cell in the notebook by its ID."""
+        return self._cell_index.get(cell_id)
+
+    def _check_executing_cell_stays(self, index: int) -> None:
+        """
+        Refuse changes that would shift the executing cell.
+
+        nbclient writes the executing cell back at the index it started at,
+        so cells at or before it cannot be added, moved or removed until it
+        completes.
+        """
+        if self._executing_cell_id is None:
+            return
+        executing_index = self._cell_index.get(self._executing_cell_id)
+        if executing_index is not None and index <= executing_index:
+            raise CellMoveError(
+                f"Cannot change cells before the executing cell {self._executing_cell_id}"
+            )
+
+    def insert_cell(
+        self,
+        index: int,
+        source: str = "",
+        cell_id: str | None = None,
+        cell_type: str = "code",
+    ) -> CellWithIndex:
+        """
+        Insert a new cell without executing it.
+
+        Args:
+            index: Position of the new cell. Positions past the end append it.
+            source: Source of the cell.
+            cell_id: ID of the cell. Generated if not given.
+            cell_type: Either ``code`` or ``markdown``.
+
+        Raises:
+            CellMoveError: If the ID is taken or the executing cell would shift.
+        """
+        if cell_id is not None and self._cell_index.get(cell_id) is not None:
+            raise CellMoveError(f"Cell with ID '{cell_id}' already exists")
+        self._check_executing_cell_stays(min(index, len(self.nb.cells)))
+
+        cell = (
+            new_markdown_cell(source=source)
+            if cell_type == "markdown"
+            else new_code_cell(source=source)
+        )
+        if cell_id is not None:
+            cell.id = cell_id
+        index = self._cell_index.insert(index, cell)
+        logger.info(f"Inserted cell with ID {cell.id} at index {index}")
+        return CellWithIndex(cell=cell, index=index)
+
+    def move_cell(self, cell_id: str, index: int) -> int | None:
+        """
+        Move a cell to a new position.
+
+        Returns:
+            The new index of the cell, or None if it was not found.
+
+        Raises:
+            CellMoveError: If the executing cell would shift.
+        """
+        current_index = self._cell_index.get(cell_id)
+        if current_index is None:
+            return None
+        self._check_executing_cell_stays(min(current_index, index))
+        return self._cell_index.move(cell_id, index)
 
     async def execute_code_streaming(
         self, code: str, cell_id: str
@@ -337,6 +565,7 @@ class CellExecutor:
         async with self._execution_lock:
             self._executing_cell_id = cell_id
             self._status = KernelStatus.EXECUTING
+            cell = None
 
             try:
                 # Prepare cell
@@ -355,6 +584,10 @@ class CellExecutor:
                     data={"code": code},
                 )
 
+                # Hashes of the outputs as they were streamed, by index
+                streamed_hashes: dict[int, str] = {}
+                last_output_count = 0
+
                 try:
                     # Create execution task
                     execution_task = asyncio.create_task(
@@ -362,21 +595,11 @@ class CellExecutor:
                     )
 
                     # Stream outputs during execution
-                    last_output_count = 0
-                    while not execution_task.done():
-                        await asyncio.sleep(0.1)
-
-                        # Stream new outputs
-                        current_outputs = list(cell.outputs)
-                        for i in range(last_output_count, len(current_outputs)):
-                            output = current_outputs[i]
-                            yield ExecutionEvent(
-                                event_type="output",
-                                cell_id=cell_id,
-                                timestamp=datetime.now(timezone.utc).isoformat(),
-                                data={"output": dict(output), "output_index": i},
-                            )
-                        last_output_count = len(current_outputs)
+                    async for i, output in self._stream_cell_outputs(
+                        execution_task, cell
+                    ):
+                        yield self._output_event(cell_id, i, output, streamed_hashes)
+                        last_output_count = i + 1
 
                     # Wait for execution to complete
                     await execution_task
@@ -384,12 +607,8 @@ class CellExecutor:
                     # Stream any final outputs
                     final_outputs = list(cell.outputs)
                     for i in range(last_output_count, len(final_outputs)):
-                        output = final_outputs[i]
-                        yield ExecutionEvent(
-                            event_type="output",
-                            cell_id=cell_id,
-                            timestamp=datetime.now(timezone.utc).isoformat(),
-                            data={"output": dict(output), "output_index": i},
+                        yield self._output_event(
+                            cell_id, i, final_outputs[i], streamed_hashes
                         )
 
                     # Emit completion event
@@ -410,7 +629,7 @@ class CellExecutor:
                             if error_messages
                             else None,
                             "execution_count": cell.execution_count or 0,
-                            "outputs": list(final_outputs),
+                            **self._summarize_outputs(final_outputs, streamed_hashes),
                             "started_at": started_at,
                             "completed_at": completed_at,
                         },
@@ -423,12 +642,9 @@ class CellExecutor:
 
                     # Stream any error outputs that were captured
                     final_outputs = list(cell.outputs)
-                    for i, output in enumerate(final_outputs):
-                        yield ExecutionEvent(
-                            event_type="output",
-                            cell_id=cell_id,
-                            timestamp=datetime.now(timezone.utc).isoformat(),
-                            data={"output": dict(output), "output_index": i},
+                    for i in range(last_output_count, len(final_outputs)):
+                        yield self._output_event(
+                            cell_id, i, final_outputs[i], streamed_hashes
                         )
 
                     # Emit completion event with error status
@@ -449,7 +665,7 @@ class CellExecutor:
                             if error_messages
                             else str(e),
                             "execution_count": cell.execution_count or 0,
-                            "outputs": list(final_outputs),
+                            **self._summarize_outputs(final_outputs, streamed_hashes),
                             "started_at": started_at,
                             "completed_at": completed_at,
                         },
@@ -470,10 +686,119 @@ class CellExecutor:
                         },
                     )
             finally:
+                # Large outputs are moved to the blob store once the events
+                # carrying them were sent
+                if cell is not None:
+                    self._spool_outputs(cell)
+
                 # Reset status when done
                 self._executing_cell_id = None
                 self._status = KernelStatus.READY
 
+    def _spool_outputs(self, cell: NotebookNode) -> None:
+        """Move the large output values of a cell to the blob store."""
+        spooled_chars = sum(
+            self.output_blobs.spool_output(output) for output in cell.get("outputs", [])
+        )
+        if spooled_chars:
+            logger.debug(
+                f"Spooled {spooled_chars:,} characters of outputs of cell {cell.get('id')}"
+            )
+
+    def _output_event(
+        self,
+        cell_id: str,
+        output_index: int,
+        output: NotebookNode,
+        streamed_hashes: dict[int, str],
+    ) -> ExecutionEvent:
+        """Create the event of a new output, recording the hash that was sent."""
+        streamed_hashes[output_index] = hash_output(output)
+        return ExecutionEvent(
+            event_type="output",
+            cell_id=cell_id,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            data={"output": dict(output), "output_index": output_index},
+        )
+
+    def _summarize_outputs(
+        self, outputs: list[NotebookNode], streamed_hashes: dict[int, str]
+    ) -> dict[str, Any]:
+        """
+        Describe the final outputs of a cell for its ``completed`` event.
+
+        Outputs were already sent as ``output`` events, so only their hashes
+        are included. Outputs that changed after they were streamed (e.g.
+        displays updated through a display id) are included in full.
+        """
+        output_hashes = [hash_output(output) for output in outputs]
+        return {
+            "output_count": len(outputs),
+            "output_hashes": output_hashes,
+            "updated_outputs": [
+                {"output_index": i, "output": dict(outputs[i])}
+                for i, output_hash in enumerate(output_hashes)
+                if streamed_hashes.get(i) != output_hash
+            ],
+        }
+
+    def get_cell_outputs(
+        self, cell_id: str, indices: list[int] | None = None
+    ) -> tuple[int, list[tuple[int, NotebookNode]]] | None:
+        """
+        Get outputs of a cell by index, e.g. for a client that missed events.
+
+        Args:
+            cell_id: ID of the cell.
+            indices: Indices of the outputs to get. All outputs if not given.
+
+        Returns:
+            The number of outputs of the cell and the existing outputs among
+            the requested ones with their index, or None if the cell was not
+            found.
+        """
+        cell = self._get_cell_by_id(cell_id)
+        if cell is None:
+            return None
+        outputs = [
+            self.output_blobs.inline_output(output)
+            for output in cell.get("outputs", [])
+        ]
+        if indices is None:
+            return len(outputs), list(enumerate(outputs))
+        return len(outputs), [(i, outputs[i]) for i in indices if 0 <= i < len(outputs)]
+
+    async def _stream_cell_outputs(
+        self, execution_task: asyncio.Task, cell: NotebookNode
+    ) -> AsyncGenerator[tuple[int, NotebookNode], None]:
+        """
+        Yield the outputs of an executing cell with their index as they arrive.
+
+        The client signals every IOPub message it processes, so new outputs
+        are picked up as soon as the kernel sends them instead of on a timer.
+        Outputs still pending when the execution finishes are left to the
+        caller.
+        """
+        assert self.client is not None, "Kernel client is not initialized"
+
+        message_received = asyncio.Event()
+        self.client.on_message = message_received.set
+        execution_task.add_done_callback(lambda _: message_received.set())
+
+        last_output_count = 0
+        try:
+            while not execution_task.done():
+                await message_received.wait()
+                message_received.clear()
+
+                # Only the outputs added since the last message are read
+                new_outputs = cell.outputs[last_output_count:]
+                for i, output in enumerate(new_outputs, start=last_output_count):
+                    yield i, output
+                last_output_count = len(cell.outputs)
+        finally:
+            self.client.on_message = None
+
     async def rerun_notebook(self) -> AsyncGenerator[ExecutionEvent, None]:
         """Re-run all cells in the notebook in order."""
         logger.info(f"Re-running all {len(self.nb.cells)} cells in notebook")
@@ -481,7 +806,7 @@ class CellExecutor:
         code_cells = [cell for cell in self.nb.cells if cell.cell_type == "code"]
 
         for i, cell in enumerate(code_cells):
-            logger.info(f"Re-running cell {i+1}/{len(code_cells)} (ID: {cell.id})")
+            logger.info(f"Re-running cell {i + 1}/{len(code_cells)} (ID: {cell.id})")
 
             async for event in self.execute_code_streaming(cell.source, cell.id):
                 # Add rerun metadata
@@ -523,14 +848,27 @@ class CellExecutor:
         """Get the current kernel ID."""
         return self.kernel_id
 
+    def get_spare_kernel_count(self) -> int:
+        """Get the number of spare kernels ready to replace the kernel."""
+        return self._kernel_pool.ready_count
+
     def get_executing_cell_id(self) -> str | None:
         """Get the ID of the currently executing cell, if any."""
         return self._executing_cell_id
 
     async def get_notebook(self) -> NotebookNode:
-        """Get the complete notebook data."""
+        """
+        Get the complete notebook data.
+
+        Large output values are referenced from the output metadata and served
+        from the blob store.
+        """
         return self.nb
 
+    async def export_notebook(self) -> NotebookNode:
+        """Get a copy of the notebook with all output values inlined."""
+        return self.output_blobs.inline_notebook(self.nb)
+
     async def tail_cells(self, num_cells: int = 5) -> TailCellsResult:
         """Get the last N cells from the notebook with their outputs.
 
@@ -556,7 +894,9 @@ class CellExecutor:
 
             # Optimize outputs if they exist
             if cell.get("outputs"):
-                cell_info["outputs"] = self._optimize_cell_outputs(cell["outputs"])
+                cell_info["outputs"] = self._optimize_cell_outputs(
+                    [self.output_blobs.inline_output(output) for output in cell.outputs]
+                )
 
             formatted_cells.append(cell_info)
 
@@ -653,12 +993,18 @@ class CellExecutor:
         return optimized
 
     def delete_cell(self, cell_id: str) -> bool:
-        """Delete a cell from the notebook by its ID."""
-        for i, cell in enumerate(self.nb.cells):
-            if cell.id == cell_id:
-                del self.nb.cells[i]
-                logger.info(f"Deleted cell with ID: {cell_id}")
-                return True
-
-        logger.warning(f"Cell with ID {cell_id} not found for deletion")
-        return False
+        """
+        Delete a cell from the notebook by its ID.
+
+        Raises:
+            CellMoveError: If the executing cell would shift.
+        """
+        index = self._cell_index.get(cell_id)
+        if index is None:
+            logger.warning(f"Cell with ID {cell_id} not found for deletion")
+            return False
+
+        self._check_executing_cell_stays(index)
+        self._cell_index.delete(cell_id)
+        logger.info(f"Deleted cell with ID: {cell_id}")
+        return True
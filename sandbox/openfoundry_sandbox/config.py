@@ -13,6 +13,24 @@ SECRETS_BASE = Path("/etc/secrets")
 
 CONNECTIONS_DIR = SECRETS_BASE / "connections"
 
+# Sandbox-managed state kept alongside the user's files
+OPENFOUNDRY_DIR = Path(WORKSPACE_DIR) / ".openfoundry"
+
+CATALOG_DIR = OPENFOUNDRY_DIR / "catalog"
+
+EXTRACTS_DIR = OPENFOUNDRY_DIR / "extracts"
+
+OUTPUT_BLOBS_DIR = OPENFOUNDRY_DIR / "output_blobs"
+
+# Number of spare notebook kernels kept started, 0 to start kernels on demand
+KERNEL_POOL_SIZE = int(os.environ.get("KERNEL_POOL_SIZE", "1"))
+
+# Script run in notebook kernels before they are used, e.g. to import the
+# packages notebooks commonly use
+KERNEL_PRELOAD_SCRIPT = Path(
+    os.environ.get("KERNEL_PRELOAD_SCRIPT", Path(__file__).parent / "kernel_preload.py")
+)
+
 
 def get_notebook_path() -> str | None:
     """Get the notebook file path from environment variable."""
@@ -1,13 +1,39 @@
 import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from google.cloud import bigquery
+import pyarrow as pa
+from google.cloud import bigquery, bigquery_storage
 from google.cloud.bigquery import dbapi
 
 from .connection import Connection
+from .preflight import CostEstimate
+from .query_jobs import RunningQuery
+from .utils import SqlExecutionResult
+
+logger = logging.getLogger(__name__)
+
+# Results with fewer rows are downloaded over the REST API without checking
+# their size, since they mostly arrive with the first page of the query
+STORAGE_READ_MIN_ROWS = 10_000
+
+# Estimated result size from which the Storage Read API is used instead of
+# paging through the result over the REST API
+STORAGE_READ_MIN_BYTES = 16 * 1024 * 1024
+
+# Maximum number of read streams downloaded in parallel
+STORAGE_READ_MAX_STREAMS = 8
+
+_ORDER_BY_PATTERN = re.compile(r"\bORDER\s+BY\b", re.IGNORECASE)
 
 
 class BigQueryConnection(Connection):
+    sql_dialect = "bigquery"
+
     def __init__(self, secrets: dict[str, str], **kwargs: Any) -> None:
         """
         Initialize the BigQuery connection. with configuration
@@ -18,12 +44,32 @@ class BigQueryConnection(Connection):
         """
         super().__init__(secrets=secrets, **kwargs)
 
+        self._client: bigquery.Client | None = None
+        self._read_client: bigquery_storage.BigQueryReadClient | None = None
+        self._client_lock = threading.Lock()
         self.service_account_key = secrets.get("BIGQUERY_SERVICE_ACCOUNT_KEY")
         self.project_id = secrets.get("BIGQUERY_PROJECT_ID")
         self.dataset_id = secrets.get("BIGQUERY_DATASET_ID")
 
-    def _init_connection(self) -> None:
-        """Initialize the BigQuery connection."""
+    @property
+    def client(self) -> bigquery.Client:
+        """Get or create the BigQuery client shared by all pooled connections"""
+        with self._client_lock:
+            if self._client is None:
+                self._client = self._create_client()
+            return self._client
+
+    @property
+    def read_client(self) -> bigquery_storage.BigQueryReadClient | None:
+        """Get or create the BigQuery Storage client shared by all pooled connections"""
+        client = self.client
+        with self._client_lock:
+            if self._read_client is None:
+                self._read_client = client._ensure_bqstorage_client()
+            return self._read_client
+
+    def _create_client(self) -> bigquery.Client:
+        """Create a BigQuery client from the service account key."""
         service_account_info = json.loads(self.service_account_key)
 
         # Create a QueryJobConfig with default dataset
@@ -32,15 +78,167 @@ class BigQueryConnection(Connection):
         )
 
         # Create the client with proper project configuration and default query job config
-        client = bigquery.Client.from_service_account_info(
+        return bigquery.Client.from_service_account_info(
             service_account_info,
             project=self.project_id,
             default_query_job_config=default_query_job_config,
         )
 
-        # Create the DB API connection
-        self._conn = dbapi.connect(client=client)
+    def _create_connection(self) -> dbapi.Connection:
+        """Create a DB API connection on top of the shared BigQuery clients."""
+        return dbapi.connect(client=self.client, bqstorage_client=self.read_client)
+
+    def _is_alive(self, conn: dbapi.Connection) -> bool:
+        """BigQuery is accessed over stateless HTTP requests, so skip the ping."""
+        return True
+
+    def _reset_connection(self, conn: dbapi.Connection) -> None:
+        """BigQuery has no client-side transactions to roll back."""
+        pass
+
+    def _execute_statement(
+        self, cursor: Any, sql_statement: str, query: RunningQuery | None
+    ) -> None:
+        """Use the query id as the BigQuery job id so the job can be cancelled."""
+        cursor.execute(sql_statement, job_id=query.query_id if query else None)
+
+    def _execute_arrow(
+        self, sql_statement: str, query: RunningQuery | None
+    ) -> SqlExecutionResult:
+        """
+        Run a query job and download its result as Arrow.
+
+        Large results are read from the job's destination table with parallel
+        Storage Read API streams. Smaller ones are paged over the REST API,
+        which avoids the cost of opening a read session.
+        """
+        with self._track_query(query, None, None):
+            query_job = self.client.query(
+                sql_statement, job_id=query.query_id if query else None
+            )
+            row_iterator = query_job.result()
+
+        if query_job.num_dml_affected_rows is not None:
+            return SqlExecutionResult.success_result(
+                rows_affected=query_job.num_dml_affected_rows
+            )
+
+        destination = self._get_large_destination(query_job, row_iterator)
+        if destination is not None:
+            preserve_order = bool(_ORDER_BY_PATTERN.search(sql_statement))
+            table = self._read_with_storage_api(destination, preserve_order)
+        else:
+            table = row_iterator.to_arrow(create_bqstorage_client=False)
+        return SqlExecutionResult.arrow_result(table)
+
+    def _get_large_destination(
+        self, query_job: bigquery.QueryJob, row_iterator: Any
+    ) -> bigquery.Table | None:
+        """Get the destination table of a result large enough for the Storage Read API."""
+        if (
+            query_job.destination is None
+            or not row_iterator.total_rows
+            or row_iterator.total_rows < STORAGE_READ_MIN_ROWS
+            or self.read_client is None
+        ):
+            return None
+
+        destination = self.client.get_table(query_job.destination)
+        if (destination.num_bytes or 0) < STORAGE_READ_MIN_BYTES:
+            return None
+        return destination
+
+    def _read_with_storage_api(
+        self, table: bigquery.Table, preserve_order: bool
+    ) -> pa.Table:
+        """
+        Download a table with the Storage Read API, reading its streams in parallel.
+
+        Ordered results are read from a single stream, since rows are split
+        across streams in no particular order.
+        """
+        started = time.monotonic()
+        types = bigquery_storage.types
+        requested_session = types.ReadSession(
+            table=table.reference.to_bqstorage(),
+            data_format=types.DataFormat.ARROW,
+            read_options=types.ReadSession.TableReadOptions(
+                arrow_serialization_options=types.ArrowSerializationOptions(
+                    buffer_compression=types.ArrowSerializationOptions.CompressionCodec.LZ4_FRAME
+                )
+            ),
+        )
+        session = self.read_client.create_read_session(
+            parent=f"projects/{self.client.project}",
+            read_session=requested_session,
+            max_stream_count=1 if preserve_order else STORAGE_READ_MAX_STREAMS,
+        )
+
+        def read_stream(stream: types.ReadStream) -> pa.Table:
+            return self.read_client.read_rows(stream.name).to_arrow(session)
+
+        if not session.streams:
+            schema = pa.ipc.read_schema(
+                pa.py_buffer(session.arrow_schema.serialized_schema)
+            )
+            return schema.empty_table()
+
+        with ThreadPoolExecutor(
+            max_workers=len(session.streams), thread_name_prefix="bq-read"
+        ) as executor:
+            result = pa.concat_tables(executor.map(read_stream, session.streams))
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"Read {result.num_rows} rows ({result.nbytes / 1024 / 1024:.1f} MiB) of "
+            f"{table.full_table_id} from {len(session.streams)} stream(s) in "
+            f"{elapsed:.2f}s ({result.nbytes / 1024 / 1024 / max(elapsed, 1e-6):.1f} MiB/s)"
+        )
+        return result
+
+    def _cancel_query(self, query: RunningQuery, conn: Any, cursor: Any) -> None:
+        """Cancel the BigQuery job created for the statement."""
+        self.client.cancel_job(query.query_id)
+
+    def estimate_cost(self, sql_statement: str) -> CostEstimate:
+        """Estimate the bytes processed by a query with a dry run."""
+        query_job = self.client.query(
+            sql_statement,
+            job_config=bigquery.QueryJobConfig(dry_run=True, use_query_cache=False),
+        )
+        return CostEstimate(
+            method="dry_run", bytes_scanned=query_job.total_bytes_processed
+        )
+
+    def _catalog_tables_query(self) -> str:
+        """
+        Read the tables of the default dataset from ``__TABLES__``.
+
+        Unlike ``INFORMATION_SCHEMA.TABLES`` it reports when a table was last
+        modified.
+        """
+        return f"""
+            SELECT
+                dataset_id,
+                table_id,
+                CASE type WHEN 1 THEN 'BASE TABLE' WHEN 2 THEN 'VIEW' ELSE 'EXTERNAL' END,
+                TIMESTAMP_MILLIS(last_modified_time)
+            FROM `{self.project_id}.{self.dataset_id}.__TABLES__`
+        """
+
+    def _catalog_columns_query(self, schemas: list[str] | None) -> str:
+        """Read the columns of the default dataset from its INFORMATION_SCHEMA."""
+        return f"""
+            SELECT table_schema, table_name, column_name, data_type, ordinal_position
+            FROM `{self.project_id}.{self.dataset_id}.INFORMATION_SCHEMA.COLUMNS`
+        """
 
     def cleanup(self) -> None:
         """Clean up the BigQuery connection."""
         self.close()
+        if self._read_client is not None:
+            self._read_client.transport.close()
+            self._read_client = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import difflib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from openfoundry_sandbox.config import CATALOG_DIR
+
+if TYPE_CHECKING:
+    from .connection import Connection
+
+logger = logging.getLogger(__name__)
+
+# Seconds after which a catalog is refreshed before it is served again
+CATALOG_REFRESH_INTERVAL = 10 * 60.0
+
+# Above this many changed schemas the columns of all schemas are fetched at once
+MAX_INCREMENTAL_SCHEMAS = 20
+
+# Minimum similarity for a name to be returned as a fuzzy match
+FUZZY_MATCH_CUTOFF = 0.6
+
+# Weight of matches on qualified names, so plain name matches rank first
+QUALIFIED_MATCH_WEIGHT = 0.95
+
+SearchKind = Literal["all", "tables", "columns"]
+
+
+@dataclass
+class CatalogColumn:
+    """A column of a table in the catalog."""
+
+    name: str
+    data_type: str
+    position: int
+
+
+@dataclass
+class CatalogTable:
+    """A table or view in the catalog."""
+
+    schema: str
+    name: str
+    table_type: str
+    last_altered: str | None = None
+    columns: list[CatalogColumn] = field(default_factory=list)
+
+    @property
+    def full_name(self) -> str:
+        """The schema-qualified table name."""
+        return f"{self.schema}.{self.name}"
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> CatalogTable:
+        """Create a table from its persisted form."""
+        columns = [CatalogColumn(**column) for column in data.get("columns", [])]
+        return CatalogTable(
+            schema=data["schema"],
+            name=data["name"],
+            table_type=data["table_type"],
+            last_altered=data.get("last_altered"),
+            columns=columns,
+        )
+
+
+@dataclass
+class CatalogMatch:
+    """A table or column matching a catalog search."""
+
+    kind: Literal["table", "column"]
+    schema: str
+    table: str
+    score: float
+    column: str | None = None
+    data_type: str | None = None
+    table_type: str | None = None
+
+
+@dataclass
+class RefreshSummary:
+    """What changed during a catalog refresh."""
+
+    tables: int
+    added: int
+    updated: int
+    removed: int
+    duration_seconds: float
+
+
+def _to_iso(value: Any) -> str | None:
+    """Convert a last-altered value reported by a driver to a comparable string."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _score(term: str, name: str) -> float:
+    """Score how well a lower-cased search term matches a name, 0 if it does not."""
+    name = name.lower()
+    if name == term:
+        return 1.0
+    if name.startswith(term):
+        return 0.9
+    if term in name:
+        return 0.75
+    matcher = difflib.SequenceMatcher(None, term, name)
+    if (
+        matcher.real_quick_ratio() < FUZZY_MATCH_CUTOFF
+        or matcher.quick_ratio() < FUZZY_MATCH_CUTOFF
+    ):
+        return 0.0
+    ratio = matcher.ratio()
+    return ratio * 0.7 if ratio >= FUZZY_MATCH_CUTOFF else 0.0
+
+
+class CatalogIndex:
+    """Searchable index of the schemas, tables and columns of one connection."""
+
+    def __init__(
+        self,
+        connection_name: str,
+        tables: dict[tuple[str, str], CatalogTable] | None = None,
+        refreshed_at: float | None = None,
+    ) -> None:
+        self.connection_name = connection_name
+        self.tables = tables or {}
+        self.refreshed_at = refreshed_at
+
+    def refresh(self, connection: Connection, full: bool = False) -> RefreshSummary:
+        """
+        Bring the index up to date with the database.
+
+        Only tables that are new or whose ``last_altered`` changed have their
+        columns fetched again, unless ``full`` is set or the index is empty.
+        Tables without a known ``last_altered`` are always refetched.
+        """
+        started = time.monotonic()
+        current = {
+            (schema, name): (table_type, _to_iso(last_altered))
+            for schema, name, table_type, last_altered in connection.fetch_catalog_tables()
+        }
+
+        if full or not self.tables:
+            changed = set(current)
+        else:
+            changed = {
+                key
+                for key, (_, last_altered) in current.items()
+                if key not in self.tables
+                or last_altered is None
+                or self.tables[key].last_altered != last_altered
+            }
+        removed = set(self.tables) - set(current)
+
+        columns: dict[tuple[str, str], list[CatalogColumn]] = {}
+        if changed:
+            schemas = sorted({schema for schema, _ in changed})
+            if len(changed) == len(current) or len(schemas) > MAX_INCREMENTAL_SCHEMAS:
+                schemas = None
+            column_rows = connection.fetch_catalog_columns(schemas)
+            for schema, table, column, data_type, position in column_rows:
+                if (schema, table) in changed:
+                    columns.setdefault((schema, table), []).append(
+                        CatalogColumn(column, str(data_type), int(position))
+                    )
+
+        tables = {key: table for key, table in self.tables.items() if key in current}
+        added = 0
+        for key in changed:
+            table_type, last_altered = current[key]
+            if key not in tables:
+                added += 1
+            tables[key] = CatalogTable(
+                schema=key[0],
+                name=key[1],
+                table_type=str(table_type),
+                last_altered=last_altered,
+                columns=sorted(columns.get(key, []), key=lambda c: c.position),
+            )
+
+        self.tables = tables
+        self.refreshed_at = time.time()
+        return RefreshSummary(
+            tables=len(tables),
+            added=added,
+            updated=len(changed) - added,
+            removed=len(removed),
+            duration_seconds=time.monotonic() - started,
+        )
+
+    def search(
+        self, query: str, kind: SearchKind = "all", limit: int = 20
+    ) -> list[CatalogMatch]:
+        """
+        Find tables and columns by exact, prefix, substring or fuzzy name match.
+
+        A query of the form ``table.column`` or ``schema.table`` also matches
+        the qualified names.
+        """
+        term = query.strip().lower()
+        if not term:
+            return []
+
+        matches = []
+        for table in list(self.tables.values()):
+            if kind in ("all", "tables"):
+                score = max(
+                    _score(term, table.name),
+                    _score(term, table.full_name) * QUALIFIED_MATCH_WEIGHT,
+                )
+                if score > 0:
+                    matches.append(
+                        CatalogMatch(
+                            kind="table",
+                            schema=table.schema,
+                            table=table.name,
+                            score=score,
+                            table_type=table.table_type,
+                        )
+                    )
+
+            if kind in ("all", "columns"):
+                for column in table.columns:
+                    score = max(
+                        _score(term, column.name),
+                        _score(term, f"{table.name}.{column.name}")
+                        * QUALIFIED_MATCH_WEIGHT,
+                    )
+                    if score > 0:
+                        matches.append(
+                            CatalogMatch(
+                                kind="column",
+                                schema=table.schema,
+                                table=table.name,
+                                score=score,
+                                column=column.name,
+                                data_type=column.data_type,
+                            )
+                        )
+
+        matches.sort(key=lambda m: (-m.score, m.schema, m.table, m.column or ""))
+        return matches[:limit]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the index to its persisted form."""
+        return {
+            "connection_name": self.connection_name,
+            "refreshed_at": self.refreshed_at,
+            "tables": [asdict(table) for table in self.tables.values()],
+        }
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> CatalogIndex:
+        """Load an index from its persisted form."""
+        tables = [CatalogTable.from_dict(table) for table in data["tables"]]
+        return CatalogIndex(
+            data["connection_name"],
+            tables={(table.schema, table.name): table for table in tables},
+            refreshed_at=data.get("refreshed_at"),
+        )
+
+
+class CatalogManager:
+    """Keeps a catalog index per connection, in memory and on disk.
+
+    Indexes are loaded from ``CATALOG_DIR`` when first used, built from the
+    database if there is none, and refreshed incrementally once they are
+    older than ``refresh_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        catalog_dir: Path = CATALOG_DIR,
+        refresh_interval: float = CATALOG_REFRESH_INTERVAL,
+    ) -> None:
+        self._catalog_dir = catalog_dir
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._indexes: dict[str, CatalogIndex] = {}
+        self._refresh_locks: dict[str, threading.Lock] = {}
+
+    def get_index(self, connection_name: str, connection: Connection) -> CatalogIndex:
+        """Get the index of a connection, building or refreshing it if needed."""
+        index = self._load(connection_name)
+        if (
+            index.refreshed_at is None
+            or time.time() - index.refreshed_at > self._refresh_interval
+        ):
+            self.refresh(connection_name, connection)
+        return self._indexes[connection_name]
+
+    def refresh(
+        self, connection_name: str, connection: Connection, full: bool = False
+    ) -> RefreshSummary:
+        """Refresh the index of a connection and persist it."""
+        with self._lock:
+            refresh_lock = self._refresh_locks.setdefault(
+                connection_name, threading.Lock()
+            )
+
+        with refresh_lock:
+            index = self._load(connection_name)
+            summary = index.refresh(connection, full=full)
+            self._save(index)
+
+        logger.info(
+            f"Refreshed catalog of '{connection_name}' in {summary.duration_seconds:.2f}s: "
+            f"{summary.tables} tables, {summary.added} added, "
+            f"{summary.updated} updated, {summary.removed} removed"
+        )
+        return summary
+
+    def mark_stale(self, connection_name: str) -> None:
+        """Refresh the index of a connection the next time it is used."""
+        with self._lock:
+            index = self._indexes.get(connection_name)
+            if index is not None:
+                index.refreshed_at = None
+
+    def _load(self, connection_name: str) -> CatalogIndex:
+        """Get the in-memory index, loading it from disk on first use."""
+        with self._lock:
+            index = self._indexes.get(connection_name)
+            if index is not None:
+                return index
+
+            path = self._get_path(connection_name)
+            index = CatalogIndex(connection_name)
+            if path.exists():
+                try:
+                    index = CatalogIndex.from_dict(json.loads(path.read_text()))
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable catalog file {path}: {e}")
+
+            self._indexes[connection_name] = index
+            return index
+
+    def _save(self, index: CatalogIndex) -> None:
+        """Write an index to disk atomically."""
+        path = self._get_path(index.connection_name)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(index.to_dict()))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(
+                f"Failed to persist catalog of '{index.connection_name}': {e}"
+            )
+
+    def _get_path(self, connection_name: str) -> Path:
+        """Get the file an index is persisted to."""
+        return self._catalog_dir / f"{connection_name}.json"
+
+
+# Global manager of connection catalogs
+catalog_manager = CatalogManager()
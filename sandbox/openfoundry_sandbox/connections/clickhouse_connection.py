@@ -1,11 +1,65 @@
-from typing import Any
+from typing import Any, Callable, Iterator, Sequence
 
-from clickhouse_connect import common, dbapi
+import clickhouse_connect
+import pyarrow as pa
+from clickhouse_connect.driver import Client as ClickhouseClient
+from clickhouse_connect.driver.summary import QuerySummary
 
 from .connection import Connection
+from .preflight import CostEstimate
+from .query_jobs import RunningQuery
+from .result_stream import SqlResultStream
+from .utils import SqlExecutionResult, quote_sql_literal
+
+# System databases left out of the catalog
+CATALOG_EXCLUDED_DATABASES = ("system", "information_schema")
+
+# Compression of query results sent by the server
+RESULT_COMPRESSION = "lz4"
+
+
+class _RowBlockCursor:
+    """Minimal cursor over blocks of rows returned by the native client.
+
+    Gives ``SqlResultStream`` the ``description``, ``fetchmany`` and ``close``
+    it needs while only one block of rows is held in memory at a time.
+    """
+
+    def __init__(
+        self,
+        column_names: Sequence[str],
+        blocks: Iterator[Sequence[Any]],
+        on_close: Callable[[], None] | None = None,
+    ) -> None:
+        self._blocks = blocks
+        self._block: Sequence[Any] = []
+        self._on_close = on_close
+        self.description = [
+            (name, None, None, None, None, None, None) for name in column_names
+        ]
+
+    def fetchmany(self, size: int) -> list[Any]:
+        """Fetch up to ``size`` rows, reading further blocks as needed."""
+        rows: list[Any] = []
+        while len(rows) < size:
+            if not self._block:
+                self._block = next(self._blocks, [])
+                if not self._block:
+                    break
+            taken = self._block[: size - len(rows)]
+            self._block = self._block[len(taken) :]
+            rows.extend(taken)
+        return rows
+
+    def close(self) -> None:
+        """Close the HTTP response the rows are read from."""
+        if self._on_close is not None:
+            self._on_close()
 
 
 class ClickhouseConnection(Connection):
+    sql_dialect = "clickhouse"
+
     def __init__(
         self,
         secrets: dict[str, str],
@@ -27,20 +81,189 @@ class ClickhouseConnection(Connection):
         self.password = secrets["CLICKHOUSE_PASSWORD"]
         self.database = secrets["CLICKHOUSE_DATABASE"]
 
-    def _init_connection(self) -> None:
-        """Initialize the Clickhouse connection using DB-API interface."""
-        # Set ClickHouse connection settings for better compatibility
-        common.set_setting("autogenerate_session_id", False)
+    def _create_connection(self) -> ClickhouseClient:
+        """
+        Open a native clickhouse-connect client.
 
-        self._conn = dbapi.connect(
+        Clients do not use a server session, so statements are not serialized
+        per session and pooled clients run queries in parallel.
+        """
+        return clickhouse_connect.get_client(
             host=self.host,
             port=self.port,
             username=self.username,
             password=self.password,
             database=self.database,
             secure=True,
+            compress=RESULT_COMPRESSION,
+            autogenerate_session_id=False,
+        )
+
+    def _is_alive(self, conn: ClickhouseClient) -> bool:
+        """Ping the server over the HTTP interface."""
+        return conn.ping()
+
+    def _reset_connection(self, conn: ClickhouseClient) -> None:
+        """ClickHouse connections are stateless, so there is nothing to reset."""
+        pass
+
+    def execute_sql(
+        self, sql_statement: str, query: RunningQuery | None = None
+    ) -> SqlExecutionResult:
+        """Execute a SQL command with the native client."""
+        settings = {"query_id": query.query_id} if query is not None else None
+        try:
+            with (
+                self._pool.connection() as conn,
+                self._track_query(query, conn, None),
+            ):
+                result = conn.query(sql_statement, settings=settings)
+        except Exception as e:
+            return SqlExecutionResult.error_result(error_message=str(e))
+
+        if not result.column_names:
+            # This is a DML/DDL statement
+            return SqlExecutionResult.success_result(
+                rows_affected=int(result.summary.get("written_rows", 0))
+            )
+
+        data = list(result.named_results())
+        return SqlExecutionResult.success_result(data=data, rows_affected=len(data))
+
+    def _execute_arrow(
+        self, sql_statement: str, query: RunningQuery | None
+    ) -> SqlExecutionResult:
+        """Execute a query with the ArrowStream output format of the native client.
+
+        Record batches are decoded block by block as the response arrives
+        instead of after the whole response has been buffered. Commands are
+        run without an output format.
+        """
+        settings = {"query_id": query.query_id} if query is not None else None
+        with (
+            self._pool.connection() as conn,
+            self._track_query(query, conn, None),
+        ):
+            if conn.create_query_context(query=sql_statement).is_command:
+                # Commands (DDL, SET, ...) do not support the ArrowStream output format
+                response = conn.command(sql_statement, settings=settings)
+                if isinstance(response, QuerySummary):
+                    return SqlExecutionResult.success_result(
+                        rows_affected=response.written_rows
+                    )
+                # Commands with output return a single value or a list of them
+                values = response if isinstance(response, list) else [response]
+                return SqlExecutionResult.arrow_result(pa.table({"result": values}))
+
+            with conn.query_arrow_stream(sql_statement, settings=settings) as stream:
+                batches = [batch for table in stream for batch in table.to_batches()]
+
+        if not batches:
+            return SqlExecutionResult.arrow_result(pa.table({}))
+        return SqlExecutionResult.arrow_result(pa.Table.from_batches(batches))
+
+    def open_stream(
+        self, sql_statement: str, query: RunningQuery | None = None
+    ) -> SqlResultStream:
+        """
+        Execute a SQL command and stream its rows block by block.
+
+        Only the block being read is held in memory, so large scans are
+        streamed with bounded memory.
+        """
+        settings = {"query_id": query.query_id} if query is not None else None
+        # The pooled client is held by the stream until it is closed, and
+        # returned to the pool it came from
+        pool = self._pool
+        conn = pool.acquire()
+        try:
+            if query is not None:
+                query.attach(conn, None)
+            if conn.create_query_context(query=sql_statement).is_command:
+                # Commands (DDL, SET, ...) do not support the Native output format
+                result = conn.query(sql_statement, settings=settings)
+                cursor = _RowBlockCursor(
+                    result.column_names, iter([result.result_rows])
+                )
+            else:
+                stream = conn.query_row_block_stream(
+                    sql_statement, settings=settings
+                ).__enter__()
+                cursor = _RowBlockCursor(
+                    stream.source.column_names,
+                    stream,
+                    on_close=lambda: stream.__exit__(None, None, None),
+                )
+        except Exception:
+            if query is not None:
+                query.detach()
+            pool.release(conn, failed=True)
+            raise
+
+        def release() -> None:
+            if query is not None:
+                query.detach()
+            pool.release(conn)
+
+        return SqlResultStream(
+            cursor,
+            has_result_set=bool(cursor.description),
+            on_close=release,
+            pool=pool,
+        )
+
+    def _execute_control_statement(
+        self, conn: ClickhouseClient, sql_statement: str
+    ) -> None:
+        """Execute a control statement with the native client."""
+        conn.command(sql_statement)
+
+    def _fetch_rows(self, sql_statement: str) -> list[tuple]:
+        """Run a query with the native client and fetch all of its rows."""
+        with self._pool.connection() as conn:
+            return [tuple(row) for row in conn.query(sql_statement).result_rows]
+
+    def _cancel_query(
+        self, query: RunningQuery, conn: ClickhouseClient, cursor: Any
+    ) -> None:
+        """Kill the running statement by the query id it was tagged with."""
+        self._run_control_statement(
+            f"KILL QUERY WHERE query_id = '{query.query_id}' ASYNC"
+        )
+
+    def estimate_cost(self, sql_statement: str) -> CostEstimate:
+        """Estimate the rows read by a query with ``EXPLAIN ESTIMATE``."""
+        rows = self._fetch_rows(f"EXPLAIN ESTIMATE {sql_statement}")
+        # Rows of (database, table, parts, rows, marks) per table read
+        return CostEstimate(
+            method="explain_estimate", rows_scanned=sum(int(row[3]) for row in rows)
         )
 
+    def _catalog_tables_query(self) -> str:
+        """Read the tables from ``system.tables``."""
+        return f"""
+            SELECT database, name, engine, metadata_modification_time
+            FROM system.tables
+            WHERE {self._excluded_schemas_filter("database")}
+        """
+
+    def _catalog_columns_query(self, schemas: list[str] | None) -> str:
+        """Read the columns from ``system.columns``."""
+        sql = f"""
+            SELECT database, table, name, type, position
+            FROM system.columns
+            WHERE {self._excluded_schemas_filter("database")}
+        """
+        if schemas:
+            schema_list = ", ".join(map(quote_sql_literal, schemas))
+            sql += f" AND database IN ({schema_list})"
+        return sql
+
+    def _excluded_schemas_filter(self, column: str) -> str:
+        """SQL condition that leaves out the system databases."""
+        excluded = ", ".join(map(quote_sql_literal, CATALOG_EXCLUDED_DATABASES))
+        return f"lower({column}) NOT IN ({excluded})"
+
     def cleanup(self) -> None:
         """Clean up any resources used by the connection"""
         self.close()
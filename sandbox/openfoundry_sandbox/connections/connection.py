@@ -4,18 +4,40 @@ from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any
 
-from .utils import SqlExecutionResult
+from .connection_pool import (
+    DEFAULT_POOL_SIZE,
+    ConnectionPool,
+    ConnectionPoolTimeoutError,
+    PoolStats,
+)
+from .preflight import CostEstimate
+from .result_stream import SqlResultStream
+from .utils import SqlExecutionResult, quote_sql_literal, rows_to_arrow
 
 if TYPE_CHECKING:
-    from _typeshed.dbapi import DBAPIConnection
+    import pyarrow as pa
+    from _typeshed.dbapi import DBAPIConnection, DBAPICursor
+
+    from .query_jobs import RunningQuery
+
+# System schemas left out of the catalog
+CATALOG_EXCLUDED_SCHEMAS = ("information_schema", "pg_catalog")
 
 
 class Connection(ABC):
-    """Base class for all database connections."""
+    """Base class for all database connections.
+
+    Each connection keeps a bounded pool of DB-API connections so concurrent
+    queries against the same database run in parallel.
+    """
+
+    # sqlglot dialect used to parse the statements run on the connection
+    sql_dialect: str | None = None
 
     def __init__(
         self,
         secrets: dict[str, str],
+        pool_size: int = DEFAULT_POOL_SIZE,
         **kwargs: Any,
     ) -> None:
         """
@@ -23,46 +45,97 @@ class Connection(ABC):
 
         Args:
             secrets: Dictionary of secret parameters. Child classes should extract needed fields.
+            pool_size: Maximum number of concurrently open DB-API connections.
             **kwargs: Additional configuration specific to the connection type.
         """
-        self._conn: DBAPIConnection | None = None
+        self._pool_size = pool_size
+        self._pool = self._new_pool()
 
-    @property
-    def conn(self) -> DBAPIConnection:
-        """Get or create a database connection"""
-        if self._conn is None:
-            self._init_connection()
-        return self._conn
+    def _new_pool(self) -> ConnectionPool:
+        """Create an empty pool of DB-API connections."""
+        return ConnectionPool(
+            create=self._create_connection,
+            is_alive=self._is_alive,
+            reset=self._reset_connection,
+            max_size=self._pool_size,
+        )
 
     @contextmanager
-    def _get_cursor(self):
+    def _get_cursor(self, conn: DBAPIConnection):
         """Context manager for getting a cursor"""
-        cursor = self.conn.cursor()
+        cursor = conn.cursor()
         try:
             yield cursor
         finally:
             cursor.close()
 
+    @contextmanager
+    def _track_query(self, query: RunningQuery | None, conn: Any, cursor: Any):
+        """Context manager that exposes a running statement to ``cancel_query``"""
+        if query is None:
+            yield
+            return
+
+        query.attach(conn, cursor)
+        try:
+            yield
+        finally:
+            query.detach()
+
     @abstractmethod
-    def _init_connection(self) -> None:
-        """Initialize the database connection"""
+    def _create_connection(self) -> DBAPIConnection:
+        """Open a new DB-API connection to the database"""
         raise NotImplementedError(
-            "_init_connection must be implemented by the connection"
+            "_create_connection must be implemented by the connection"
         )
 
-    def execute_sql(self, sql_statement: str) -> SqlExecutionResult:
+    def _is_alive(self, conn: DBAPIConnection) -> bool:
+        """
+        Check whether an idle pooled connection is still usable.
+
+        The default implementation runs a trivial query. Drivers with a cheaper
+        check should override this.
+        """
+        with self._get_cursor(conn) as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+        self._reset_connection(conn)
+        return True
+
+    def _reset_connection(self, conn: DBAPIConnection) -> None:
+        """Restore a pooled connection to a clean state after a failed statement."""
+        conn.rollback()
+
+    def warm_up(self) -> None:
+        """Open a pooled connection ahead of the first query."""
+        conn = self._pool.acquire()
+        self._pool.release(conn)
+
+    def get_pool_stats(self) -> PoolStats:
+        """Get statistics about the pooled DB-API connections."""
+        return self._pool.stats()
+
+    def execute_sql(
+        self, sql_statement: str, query: RunningQuery | None = None
+    ) -> SqlExecutionResult:
         """
         Execute a SQL command.
 
         Args:
             sql_statement: The SQL statement to execute.
+            query: Optional handle through which the statement can be cancelled
+                from another thread with ``cancel_query``.
 
         Returns:
             The result of the SQL execution.
         """
         try:
-            with self._get_cursor() as cursor:
-                cursor.execute(sql_statement)
+            with (
+                self._pool.connection() as conn,
+                self._get_cursor(conn) as cursor,
+                self._track_query(query, conn, cursor),
+            ):
+                self._execute_statement(cursor, sql_statement, query)
 
                 # Check if this is a SELECT query by looking at the description
                 if cursor.description:
@@ -78,15 +151,344 @@ class Connection(ABC):
                     )
                 else:
                     # This is a DML/DDL statement
-                    self.conn.commit()
+                    conn.commit()
                     return SqlExecutionResult.success_result(
                         rows_affected=cursor.rowcount
                     )
         except Exception as e:
             return SqlExecutionResult.error_result(error_message=str(e))
 
+    def execute_sql_arrow(
+        self, sql_statement: str, query: RunningQuery | None = None
+    ) -> SqlExecutionResult:
+        """
+        Execute a SQL command and collect any result set as an Arrow table.
+
+        Args:
+            sql_statement: The SQL statement to execute.
+            query: Optional handle through which the statement can be cancelled
+                from another thread with ``cancel_query``.
+
+        Returns:
+            The result of the SQL execution. For statements that return rows,
+            ``table`` holds the columnar result and ``data`` is left empty.
+        """
+        try:
+            return self._execute_arrow(sql_statement, query)
+        except Exception as e:
+            return SqlExecutionResult.error_result(error_message=str(e))
+
+    def _execute_arrow(
+        self, sql_statement: str, query: RunningQuery | None
+    ) -> SqlExecutionResult:
+        """Execute a SQL statement through a cursor and fetch it as Arrow."""
+        with (
+            self._pool.connection() as conn,
+            self._get_cursor(conn) as cursor,
+            self._track_query(query, conn, cursor),
+        ):
+            self._execute_statement(cursor, sql_statement, query)
+
+            if not cursor.description:
+                # This is a DML/DDL statement
+                conn.commit()
+                return SqlExecutionResult.success_result(rows_affected=cursor.rowcount)
+
+            return SqlExecutionResult.arrow_result(self._fetch_arrow(cursor))
+
+    def _execute_statement(
+        self, cursor: DBAPICursor, sql_statement: str, query: RunningQuery | None
+    ) -> None:
+        """
+        Execute a statement on a cursor.
+
+        Drivers that need to tag a statement to cancel it later (e.g. with a
+        query or job id) should override this.
+        """
+        cursor.execute(sql_statement)
+
+    def cancel_query(self, query: RunningQuery) -> bool:
+        """
+        Cancel a statement started with ``execute_sql`` or ``execute_sql_arrow``.
+
+        This may be called from any thread. A statement that has not started
+        yet fails without reaching the database.
+
+        Args:
+            query: The handle passed to the execute call.
+
+        Returns:
+            Whether a cancel request was sent to the database.
+        """
+        running, conn, cursor = query.request_cancel()
+        if not running:
+            return False
+
+        self._cancel_query(query, conn, cursor)
+        return True
+
+    def _cancel_query(
+        self, query: RunningQuery, conn: DBAPIConnection, cursor: Any
+    ) -> None:
+        """
+        Cancel a running statement with the driver's native mechanism.
+
+        The default implementation calls ``cursor.cancel()``, which not every
+        DB-API driver provides.
+        """
+        if cursor is None or not hasattr(cursor, "cancel"):
+            raise NotImplementedError(
+                f"{type(self).__name__} does not support cancelling queries"
+            )
+        cursor.cancel()
+
+    def _run_control_statement(self, sql_statement: str) -> None:
+        """
+        Run a short statement (e.g. a cancel request) on a separate connection.
+
+        A free pooled connection is used when there is one. Otherwise a
+        dedicated connection is opened, so that cancelling still works when
+        every pooled connection is busy.
+        """
+        try:
+            conn = self._pool.acquire(timeout=0)
+        except ConnectionPoolTimeoutError:
+            conn = self._create_connection()
+            try:
+                self._execute_control_statement(conn, sql_statement)
+            finally:
+                conn.close()
+            return
+
+        try:
+            self._execute_control_statement(conn, sql_statement)
+        except Exception:
+            self._pool.release(conn, failed=True)
+            raise
+        self._pool.release(conn)
+
+    def _execute_control_statement(
+        self, conn: DBAPIConnection, sql_statement: str
+    ) -> None:
+        """Execute a control statement and leave the connection in a clean state."""
+        with self._get_cursor(conn) as cursor:
+            cursor.execute(sql_statement)
+            if cursor.description:
+                cursor.fetchall()
+        self._reset_connection(conn)
+
+    def _fetch_arrow(self, cursor: DBAPICursor) -> pa.Table:
+        """
+        Fetch the pending result set of an executed cursor as an Arrow table.
+
+        Drivers with a native Arrow fetch path should override this. The
+        default implementation builds the table column by column from the
+        fetched rows.
+        """
+        rows = cursor.fetchall()
+        column_names = [desc[0] for desc in cursor.description]
+        return rows_to_arrow(column_names, rows)
+
+    def execute_sql_page(
+        self, sql_statement: str, max_rows: int, query: RunningQuery | None = None
+    ) -> SqlExecutionResult:
+        """
+        Execute a SQL command and fetch only the first rows of its result.
+
+        Rows are fetched from the cursor in a single page instead of all at
+        once, so a large result set is never held in memory. One row more than
+        ``max_rows`` is fetched so callers can tell the result was cut.
+
+        Args:
+            sql_statement: The SQL statement to execute.
+            max_rows: Number of rows to keep.
+            query: Optional handle through which the statement can be cancelled
+                from another thread with ``cancel_query``.
+
+        Returns:
+            The result of the SQL execution, with at most ``max_rows + 1`` rows.
+        """
+        try:
+            stream = self.open_stream(sql_statement, query=query)
+        except Exception as e:
+            return SqlExecutionResult.error_result(error_message=str(e))
+
+        try:
+            if not stream.has_result_set:
+                return SqlExecutionResult.success_result(
+                    rows_affected=stream.rows_affected
+                )
+            rows = stream.fetch_batch(max_rows + 1)
+            column_names = stream.column_names
+            data = [dict(zip(column_names, row)) for row in rows]
+            return SqlExecutionResult.success_result(data=data, rows_affected=len(data))
+        except Exception as e:
+            return SqlExecutionResult.error_result(error_message=str(e))
+        finally:
+            stream.close()
+
+    def open_stream(
+        self, sql_statement: str, query: RunningQuery | None = None
+    ) -> SqlResultStream:
+        """
+        Execute a SQL command and return a stream to fetch its rows in batches.
+
+        Unlike ``execute_sql`` the result set is not buffered, so the caller
+        must close the returned stream. Errors are raised to the caller.
+
+        Args:
+            sql_statement: The SQL statement to execute.
+            query: Optional handle through which the statement can be cancelled
+                with ``cancel_query`` until the stream is closed.
+
+        Returns:
+            A stream over the rows of the statement.
+        """
+        # The pooled connection is held by the stream until it is closed. It is
+        # returned to the pool it came from, even if the connection was closed
+        # and got a new pool in the meantime.
+        pool = self._pool
+        conn = pool.acquire()
+        try:
+            cursor = self._create_stream_cursor(conn, sql_statement)
+            try:
+                if query is not None:
+                    query.attach(conn, cursor)
+                self._execute_statement(cursor, sql_statement, query)
+            except Exception:
+                if query is not None:
+                    query.detach()
+                cursor.close()
+                raise
+
+            if cursor.description is None and not self._is_server_side(cursor):
+                # This is a DML/DDL statement
+                conn.commit()
+                has_result_set = False
+            else:
+                has_result_set = True
+        except Exception:
+            pool.release(conn, failed=True)
+            raise
+
+        return SqlResultStream(
+            cursor,
+            has_result_set=has_result_set,
+            rows_affected=0 if has_result_set else cursor.rowcount,
+            on_close=lambda: self._release_stream(pool, conn, cursor, query),
+            pool=pool,
+        )
+
+    def _release_stream(
+        self,
+        pool: ConnectionPool,
+        conn: DBAPIConnection,
+        cursor: DBAPICursor,
+        query: RunningQuery | None = None,
+    ) -> None:
+        """Return the connection held by a closed result stream to its pool."""
+        if query is not None:
+            query.detach()
+        try:
+            self._on_stream_closed(conn, cursor)
+        except Exception:
+            pool.release(conn, failed=True)
+        else:
+            pool.release(conn)
+
+    def _create_stream_cursor(
+        self, conn: DBAPIConnection, sql_statement: str
+    ) -> DBAPICursor:
+        """
+        Create the cursor used by ``open_stream``.
+
+        Drivers that can keep the result set on the server (e.g. named cursors
+        on Postgres) should override this together with ``_is_server_side``.
+        """
+        return conn.cursor()
+
+    def _is_server_side(self, cursor: DBAPICursor) -> bool:
+        """Whether the cursor only reports its description after the first fetch."""
+        return False
+
+    def _on_stream_closed(self, conn: DBAPIConnection, cursor: DBAPICursor) -> None:
+        """Hook called after the cursor of a result stream has been closed."""
+        pass
+
+    def estimate_cost(self, sql_statement: str) -> CostEstimate | None:
+        """
+        Estimate the cost of a query without running it.
+
+        Drivers with a cheap estimate (a dry run or EXPLAIN) should override
+        this. Errors are raised to the caller.
+
+        Returns:
+            The estimate, or None if the database offers no cheap estimate.
+        """
+        return None
+
+    def fetch_catalog_tables(self) -> list[tuple]:
+        """
+        List the tables and views visible to the connection.
+
+        Returns:
+            Rows of ``(schema, table, table_type, last_altered)``, where
+            ``last_altered`` is None if the database does not track it.
+        """
+        return self._fetch_rows(self._catalog_tables_query())
+
+    def fetch_catalog_columns(self, schemas: list[str] | None = None) -> list[tuple]:
+        """
+        List the columns of the tables visible to the connection.
+
+        Args:
+            schemas: Only list the columns of tables in these schemas.
+
+        Returns:
+            Rows of ``(schema, table, column, data_type, ordinal_position)``.
+        """
+        return self._fetch_rows(self._catalog_columns_query(schemas))
+
+    def _catalog_tables_query(self) -> str:
+        """
+        SQL listing the tables for ``fetch_catalog_tables``.
+
+        The default implementation reads ``information_schema.tables``.
+        """
+        return f"""
+            SELECT table_schema, table_name, table_type, last_altered
+            FROM information_schema.tables
+            WHERE {self._excluded_schemas_filter("table_schema")}
+        """
+
+    def _catalog_columns_query(self, schemas: list[str] | None) -> str:
+        """
+        SQL listing the columns for ``fetch_catalog_columns``.
+
+        The default implementation reads ``information_schema.columns``.
+        """
+        sql = f"""
+            SELECT table_schema, table_name, column_name, data_type, ordinal_position
+            FROM information_schema.columns
+            WHERE {self._excluded_schemas_filter("table_schema")}
+        """
+        if schemas:
+            schema_list = ", ".join(map(quote_sql_literal, schemas))
+            sql += f" AND table_schema IN ({schema_list})"
+        return sql
+
+    def _excluded_schemas_filter(self, column: str) -> str:
+        """SQL condition that leaves out the system schemas."""
+        excluded = ", ".join(map(quote_sql_literal, CATALOG_EXCLUDED_SCHEMAS))
+        return f"LOWER({column}) NOT IN ({excluded})"
+
+    def _fetch_rows(self, sql_statement: str) -> list[tuple]:
+        """Run a query and fetch all of its rows, raising on errors."""
+        with self._pool.connection() as conn, self._get_cursor(conn) as cursor:
+            cursor.execute(sql_statement)
+            return [tuple(row) for row in cursor.fetchall()]
+
     def close(self) -> None:
-        """Close the database connection"""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Close all pooled database connections"""
+        pool, self._pool = self._pool, self._new_pool()
+        pool.close()
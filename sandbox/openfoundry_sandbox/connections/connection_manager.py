@@ -1,26 +1,22 @@
 from __future__ import annotations
 
+import importlib
 import logging
 import os
+import threading
+import time
 from pathlib import Path
 
 from openfoundry_sandbox.config import CONNECTIONS_DIR
-from openfoundry_sandbox.connections.bigquery_connection import (
-    BigQueryConnection,
-)
-from openfoundry_sandbox.connections.clickhouse_connection import (
-    ClickhouseConnection,
-)
+from openfoundry_sandbox.connections.catalog import catalog_manager
 from openfoundry_sandbox.connections.connection import Connection
-from openfoundry_sandbox.connections.databricks_connection import (
-    DatabricksConnection,
-)
-from openfoundry_sandbox.connections.postgres_connection import (
-    PostgresConnection,
-)
-from openfoundry_sandbox.connections.snowflake_connection import (
-    SnowflakeConnection,
+from openfoundry_sandbox.connections.connection_pool import PoolStats
+from openfoundry_sandbox.connections.extracts import (
+    LOCAL_CONNECTION_NAME,
+    extract_manager,
+    quote_identifier,
 )
+from openfoundry_sandbox.connections.result_cache import result_cache
 
 logger = logging.getLogger(__name__)
 
@@ -31,15 +27,19 @@ class ConnectionManager:
     _instance: "ConnectionManager" | None = None
     _connections: dict[str, Connection] = {}
 
-    # Registry of connection types - easily extensible for new connection types
-    _connection_types: dict[str, type[Connection]] = {
-        "snowflake": SnowflakeConnection,
-        "databricks": DatabricksConnection,
-        "clickhouse": ClickhouseConnection,
-        "bigquery": BigQueryConnection,
-        "postgres": PostgresConnection,
+    # Registry of connection types - easily extensible for new connection types.
+    # Classes are referenced as "module:ClassName" and imported on first use,
+    # since the database drivers are slow to import.
+    _connection_types: dict[str, str] = {
+        "snowflake": "openfoundry_sandbox.connections.snowflake_connection:SnowflakeConnection",
+        "databricks": "openfoundry_sandbox.connections.databricks_connection:DatabricksConnection",
+        "clickhouse": "openfoundry_sandbox.connections.clickhouse_connection:ClickhouseConnection",
+        "bigquery": "openfoundry_sandbox.connections.bigquery_connection:BigQueryConnection",
+        "postgres": "openfoundry_sandbox.connections.postgres_connection:PostgresConnection",
+        "local": "openfoundry_sandbox.connections.local_connection:LocalConnection",
         # Add more connection types here as they are implemented
     }
+    _connection_classes: dict[str, type[Connection]] = {}
 
     def __new__(cls) -> "ConnectionManager":
         """Ensure singleton pattern."""
@@ -63,6 +63,13 @@ class ConnectionManager:
         """List all available connection names."""
         return list(self._connections.keys())
 
+    def get_pool_stats(self) -> dict[str, PoolStats]:
+        """Get the connection pool statistics of every connection by name."""
+        return {
+            name: connection.get_pool_stats()
+            for name, connection in list(self._connections.items())
+        }
+
     def add_connection(self, secrets_dir: Path, connection_name: str) -> None:
         """Add a new connection from a secrets directory.
 
@@ -77,9 +84,65 @@ class ConnectionManager:
         if not connection:
             raise ValueError(f"Failed to create connection '{connection_name}'")
 
+        previous = self._connections.get(connection_name)
         self._connections[connection_name] = connection
+        if previous is not None:
+            # Release the pooled connections opened with the old credentials
+            self._cleanup_connection(connection_name, previous)
+            result_cache.invalidate(connection_name)
+            catalog_manager.mark_stale(connection_name)
         logger.info(f"Successfully added connection: {connection_name}")
 
+    def remove_connection(self, connection_name: str) -> bool:
+        """Remove a connection and release its pooled connections.
+
+        Returns:
+            Whether the connection existed.
+        """
+        connection = self._connections.pop(connection_name, None)
+        if connection is None:
+            return False
+
+        self._cleanup_connection(connection_name, connection)
+        result_cache.invalidate(connection_name)
+        catalog_manager.mark_stale(connection_name)
+        logger.info(f"Removed connection: {connection_name}")
+        return True
+
+    def warm_up_connections(self) -> list[threading.Thread]:
+        """Open a pooled connection for every connection in the background.
+
+        Establishing a session (TLS handshake plus authentication) is the
+        slowest part of the first query, especially with Snowflake key-pair
+        authentication, so it is done ahead of time. Failures are logged and
+        the connection is opened again on first use.
+
+        Returns:
+            The started warmup threads.
+        """
+        threads = []
+        for connection_name, connection in list(self._connections.items()):
+            thread = threading.Thread(
+                target=self._warm_up_connection,
+                args=(connection_name, connection),
+                name=f"warmup-{connection_name}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def _warm_up_connection(self, connection_name: str, connection: Connection) -> None:
+        """Open a pooled connection, logging instead of raising on failure."""
+        start_time = time.monotonic()
+        try:
+            connection.warm_up()
+            logger.info(
+                f"Warmed up connection {connection_name} in {time.monotonic() - start_time:.2f}s"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to warm up connection {connection_name}: {e}")
+
     def initialize_connections(self) -> None:
         """Initialize all connections from the connections directory."""
         logger.info(f"Initializing connections from {CONNECTIONS_DIR}")
@@ -107,6 +170,37 @@ class ConnectionManager:
             except Exception as e:
                 logger.error(f"Error initializing connection {connection_name}: {e}")
 
+        if extract_manager.list_extracts():
+            self.ensure_local_connection()
+
+    def ensure_local_connection(self) -> Connection:
+        """Get the connection to the local extracts, creating it on first use."""
+        connection = self._connections.get(LOCAL_CONNECTION_NAME)
+        if connection is None:
+            connection_class = self._get_connection_class("local")
+            connection = connection_class(secrets={})
+            self._connections[LOCAL_CONNECTION_NAME] = connection
+            logger.info(f"Added local extracts connection: {LOCAL_CONNECTION_NAME}")
+        return connection
+
+    def route_to_extract(
+        self, connection_name: str, sql_statement: str
+    ) -> tuple[str, str]:
+        """
+        Route a query to the local extract of the same query, if there is one.
+
+        Returns:
+            The connection name and SQL statement to execute instead, or the
+            given ones if no extract matches.
+        """
+        extract = extract_manager.find_extract(connection_name, sql_statement)
+        if extract is None:
+            return connection_name, sql_statement
+
+        self.ensure_local_connection()
+        logger.info(f"Routing query on '{connection_name}' to extract '{extract.name}'")
+        return LOCAL_CONNECTION_NAME, f"SELECT * FROM {quote_identifier(extract.name)}"
+
     def _create_connection(
         self, connection_name: str, connection_path: Path
     ) -> Connection | None:
@@ -138,13 +232,27 @@ class ConnectionManager:
                 return None
 
             # Create the connection instance
-            connection_class = self._connection_types[connection_type]
+            connection_class = self._get_connection_class(connection_type)
             return connection_class(secrets=secrets)
 
         except Exception as e:
             logger.error(f"Error creating connection {connection_name}: {e}")
             return None
 
+    def _get_connection_class(self, connection_type: str) -> type[Connection]:
+        """Import the connection class of a connection type on first use."""
+        connection_class = self._connection_classes.get(connection_type)
+        if connection_class is None:
+            module_name, class_name = self._connection_types[connection_type].split(":")
+            start_time = time.monotonic()
+            module = importlib.import_module(module_name)
+            connection_class = getattr(module, class_name)
+            self._connection_classes[connection_type] = connection_class
+            logger.info(
+                f"Loaded {connection_type} driver in {time.monotonic() - start_time:.2f}s"
+            )
+        return connection_class
+
     def _determine_connection_type(self, connection_name: str, secrets: dict) -> str:
         """Determine the connection type based on secret key prefixes."""
         # Determine type based on secret key prefixes
@@ -165,16 +273,21 @@ class ConnectionManager:
         """Clean up all connections."""
         logger.info("Cleaning up all connections")
         for connection_name, connection in self._connections.items():
-            try:
-                if hasattr(connection, "cleanup"):
-                    connection.cleanup()
-                else:
-                    connection.close()
-                logger.debug(f"Cleaned up connection: {connection_name}")
-            except Exception as e:
-                logger.error(f"Error cleaning up connection {connection_name}: {e}")
+            self._cleanup_connection(connection_name, connection)
 
         self._connections.clear()
+        result_cache.invalidate()
+
+    def _cleanup_connection(self, connection_name: str, connection: Connection) -> None:
+        """Clean up a single connection, logging instead of raising on failure."""
+        try:
+            if hasattr(connection, "cleanup"):
+                connection.cleanup()
+            else:
+                connection.close()
+            logger.debug(f"Cleaned up connection: {connection_name}")
+        except Exception as e:
+            logger.error(f"Error cleaning up connection {connection_name}: {e}")
 
 
 # Global singleton instance
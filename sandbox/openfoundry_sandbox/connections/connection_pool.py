@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+if TYPE_CHECKING:
+    from _typeshed.dbapi import DBAPIConnection
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of open DB-API connections per named connection
+DEFAULT_POOL_SIZE = 4
+
+# Seconds to wait for a free connection before giving up
+DEFAULT_ACQUIRE_TIMEOUT = 60.0
+
+# Idle connections older than this are closed instead of reused, since
+# warehouse sessions (Snowflake, Databricks) are dropped server-side after
+# a period of inactivity
+DEFAULT_MAX_IDLE_TIME = 15 * 60.0
+
+# Idle connections older than this are checked for liveness before reuse
+DEFAULT_VALIDATE_AFTER = 60.0
+
+
+class ConnectionPoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection becomes available in time."""
+
+    pass
+
+
+@dataclass
+class PoolStats:
+    """Point-in-time statistics of a connection pool."""
+
+    max_size: int
+    size: int
+    in_use: int
+    idle: int
+    waiting: int
+    created: int
+    reused: int
+    discarded: int
+    failed_validations: int
+    timeouts: int
+
+    def to_dict(self) -> dict[str, int]:
+        """Convert the stats to a dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class _IdleConnection:
+    conn: DBAPIConnection
+    idle_since: float
+
+
+class ConnectionPool:
+    """A bounded, thread-safe pool of DB-API connections.
+
+    Connections are created lazily up to ``max_size``. Borrowers that find the
+    pool exhausted wait until a connection is returned. Connections that were
+    idle for longer than ``validate_after`` are checked with ``is_alive`` before
+    they are handed out, and connections idle for longer than ``max_idle_time``
+    are replaced, so sessions dropped by the server are reconnected
+    transparently.
+    """
+
+    def __init__(
+        self,
+        create: Callable[[], DBAPIConnection],
+        is_alive: Callable[[DBAPIConnection], bool],
+        reset: Callable[[DBAPIConnection], None] | None = None,
+        max_size: int = DEFAULT_POOL_SIZE,
+        acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+        max_idle_time: float = DEFAULT_MAX_IDLE_TIME,
+        validate_after: float = DEFAULT_VALIDATE_AFTER,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            create: Factory that opens a new DB-API connection.
+            is_alive: Liveness check for an idle connection.
+            reset: Restores a connection after a failed operation (e.g. a
+                rollback). Connections are discarded if it is not given or fails.
+            max_size: Maximum number of open connections.
+            acquire_timeout: Seconds to wait for a connection when exhausted.
+            max_idle_time: Seconds after which an idle connection is replaced.
+            validate_after: Seconds after which an idle connection is validated.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self._create = create
+        self._is_alive = is_alive
+        self._reset = reset
+        self._max_size = max_size
+        self._acquire_timeout = acquire_timeout
+        self._max_idle_time = max_idle_time
+        self._validate_after = validate_after
+
+        self._lock = threading.Condition()
+        self._idle: list[_IdleConnection] = []
+        self._in_use: set[int] = set()
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+        self._failed_validations = 0
+        self._timeouts = 0
+
+    def acquire(self, timeout: float | None = None) -> DBAPIConnection:
+        """Borrow a connection, creating or waiting for one as needed.
+
+        Args:
+            timeout: Seconds to wait when the pool is exhausted. Defaults to
+                the pool's ``acquire_timeout``.
+
+        Raises:
+            ConnectionPoolTimeoutError: If no connection is available in time.
+        """
+        if timeout is None:
+            timeout = self._acquire_timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            idle = None
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+                    if self._idle:
+                        # Reuse the most recently returned connection first
+                        idle = self._idle.pop()
+                        break
+                    if self._size < self._max_size:
+                        # Reserve a slot and create the connection outside the lock
+                        self._size += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise ConnectionPoolTimeoutError(
+                            f"Timed out after {timeout}s waiting for a pooled connection"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._lock.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+            if idle is None:
+                return self._open_new()
+
+            if self._is_usable(idle):
+                with self._lock:
+                    self._in_use.add(id(idle.conn))
+                    self._reused += 1
+                return idle.conn
+
+            # The idle connection is stale: drop it and try again
+            self._discard(idle.conn)
+
+    def release(
+        self, conn: DBAPIConnection, discard: bool = False, failed: bool = False
+    ) -> None:
+        """Return a borrowed connection to the pool.
+
+        Args:
+            conn: The connection returned by ``acquire``.
+            discard: Close the connection instead of keeping it for reuse.
+            failed: The last operation on the connection failed, so reset it
+                before reuse and discard it if it cannot be reset.
+        """
+        if failed and not discard:
+            discard = not self._try_reset(conn)
+
+        with self._lock:
+            self._in_use.discard(id(conn))
+            if not discard and not self._closed:
+                self._idle.append(_IdleConnection(conn, time.monotonic()))
+                self._lock.notify()
+                return
+
+        self._discard(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[DBAPIConnection]:
+        """Context manager that borrows a connection and returns it afterwards.
+
+        If the block raises, the connection is reset before it is returned, or
+        discarded when it cannot be reset.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, failed=True)
+            raise
+        else:
+            self.release(conn)
+
+    @property
+    def max_size(self) -> int:
+        """Maximum number of open connections."""
+        return self._max_size
+
+    def stats(self) -> PoolStats:
+        """Get the current pool statistics."""
+        with self._lock:
+            return PoolStats(
+                max_size=self._max_size,
+                size=self._size,
+                in_use=len(self._in_use),
+                idle=len(self._idle),
+                waiting=self._waiting,
+                created=self._created,
+                reused=self._reused,
+                discarded=self._discarded,
+                failed_validations=self._failed_validations,
+                timeouts=self._timeouts,
+            )
+
+    def close(self) -> None:
+        """Close all idle connections and refuse further borrows.
+
+        Connections that are currently borrowed are closed when released.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._lock.notify_all()
+
+        for entry in idle:
+            self._discard(entry.conn)
+
+    def _try_reset(self, conn: DBAPIConnection) -> bool:
+        """Reset a connection after a failure, returning whether it is reusable."""
+        if self._reset is None:
+            return False
+        try:
+            self._reset(conn)
+            return True
+        except Exception as e:
+            logger.debug(f"Failed to reset pooled connection: {e}")
+            return False
+
+    def _open_new(self) -> DBAPIConnection:
+        """Open a connection for a slot reserved by ``acquire``."""
+        try:
+            conn = self._create()
+        except BaseException:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._in_use.add(id(conn))
+            self._created += 1
+        return conn
+
+    def _is_usable(self, idle: _IdleConnection) -> bool:
+        """Decide whether an idle connection can be handed out again."""
+        idle_for = time.monotonic() - idle.idle_since
+        if idle_for > self._max_idle_time:
+            return False
+        if idle_for <= self._validate_after:
+            return True
+
+        try:
+            alive = self._is_alive(idle.conn)
+        except Exception as e:
+            logger.debug(f"Pooled connection failed liveness check: {e}")
+            alive = False
+
+        if not alive:
+            with self._lock:
+                self._failed_validations += 1
+        return alive
+
+    def _discard(self, conn: Any) -> None:
+        """Close a connection and free its slot."""
+        try:
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+        with self._lock:
+            self._size -= 1
+            self._discarded += 1
+            self._lock.notify()
@@ -1,11 +1,15 @@
 from typing import Any
 
 import databricks.sql
+import pyarrow as pa
+from databricks.sql.client import Connection as DatabricksConnector
 
 from .connection import Connection
 
 
 class DatabricksConnection(Connection):
+    sql_dialect = "databricks"
+
     def __init__(
         self,
         secrets: dict[str, str],
@@ -31,9 +35,9 @@ class DatabricksConnection(Connection):
         self.catalog = secrets["DATABRICKS_CATALOG"]
         self.schema = secrets["DATABRICKS_SCHEMA"]
 
-    def _init_connection(self) -> None:
-        """Initialize the Databricks connection using access token authentication"""
-        self._conn = databricks.sql.connect(
+    def _create_connection(self) -> DatabricksConnector:
+        """Open a Databricks connection using access token authentication"""
+        return databricks.sql.connect(
             server_hostname=self.host,
             http_path=self.http_path,
             access_token=self.access_token,
@@ -41,6 +45,18 @@ class DatabricksConnection(Connection):
             schema=self.schema,
         )
 
+    def _is_alive(self, conn: DatabricksConnector) -> bool:
+        """Check that the session is still open before pinging it."""
+        return conn.open and super()._is_alive(conn)
+
+    def _reset_connection(self, conn: DatabricksConnector) -> None:
+        """Databricks runs in autocommit mode and does not support rollback."""
+        pass
+
+    def _fetch_arrow(self, cursor: Any) -> pa.Table:
+        """Fetch the result set through the connector's native Arrow path."""
+        return cursor.fetchall_arrow()
+
     def cleanup(self) -> None:
         """Clean up any resources used by the connection"""
         self.close()
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pyarrow as pa
+
+from openfoundry_sandbox.config import EXTRACTS_DIR
+
+from .utils import ResultFormat, normalize_sql, quote_sql_literal, write_arrow_table
+
+if TYPE_CHECKING:
+    from .connection import Connection
+
+logger = logging.getLogger(__name__)
+
+# Name of the connection through which extracts are queried
+LOCAL_CONNECTION_NAME = "local"
+
+# Extract names double as view names of the local connection
+_EXTRACT_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,62}$")
+
+
+@dataclass
+class Extract:
+    """A local Parquet snapshot of a remote table or query."""
+
+    name: str
+    connection_name: str
+    sql_statement: str
+    watermark_column: str | None = None
+    key_columns: list[str] = field(default_factory=list)
+    watermark: str | None = None
+    row_count: int = 0
+    size_bytes: int = 0
+    created_at: float = field(default_factory=time.time)
+    refreshed_at: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the extract to its persisted form."""
+        return asdict(self)
+
+
+@dataclass
+class ExtractRefreshSummary:
+    """What a refresh of an extract loaded."""
+
+    name: str
+    incremental: bool
+    rows_loaded: int
+    row_count: int
+    duration_seconds: float
+
+
+def quote_identifier(name: str) -> str:
+    """Quote an identifier for DuckDB."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_sql_literal(value: Any) -> str:
+    """Render a watermark value as a SQL literal for the source database."""
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, datetime):
+        return quote_sql_literal(value.isoformat(sep=" "))
+    if isinstance(value, date):
+        return quote_sql_literal(value.isoformat())
+    return quote_sql_literal(str(value))
+
+
+class ExtractManager:
+    """Keeps local Parquet extracts of remote tables and queries.
+
+    Each extract is a directory under ``extracts_dir`` holding its metadata and
+    one or more Parquet part files, so apps and notebooks can read it with any
+    Parquet reader. Extracts with a watermark column are refreshed
+    incrementally by loading only the rows above the highest loaded watermark.
+    Rows that were updated at the source replace their previous version when
+    key columns are given.
+    """
+
+    def __init__(self, extracts_dir: Path = EXTRACTS_DIR) -> None:
+        self._extracts_dir = extracts_dir
+        self._lock = threading.Lock()
+        self._refresh_locks: dict[str, threading.Lock] = {}
+        # Bumped whenever extracts are created or deleted
+        self.version = 0
+
+    def list_extracts(self) -> list[Extract]:
+        """List all extracts."""
+        if not self._extracts_dir.exists():
+            return []
+        extracts = []
+        for path in sorted(self._extracts_dir.iterdir()):
+            extract = self.get_extract(path.name)
+            if extract is not None:
+                extracts.append(extract)
+        return extracts
+
+    def get_extract(self, name: str) -> Extract | None:
+        """Get an extract by name, or None if it does not exist."""
+        if not _EXTRACT_NAME_PATTERN.match(name):
+            return None
+        path = self._get_metadata_path(name)
+        if not path.exists():
+            return None
+        try:
+            return Extract(**json.loads(path.read_text()))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable extract metadata {path}: {e}")
+            return None
+
+    def get_data_files(self, name: str) -> list[Path]:
+        """Get the Parquet part files holding the rows of an extract."""
+        return sorted(self._get_extract_dir(name).glob("*.parquet"))
+
+    def get_data_glob(self, name: str) -> str:
+        """Get the glob matching the Parquet part files of an extract."""
+        return str(self._get_extract_dir(name) / "*.parquet")
+
+    def create_extract(
+        self,
+        name: str,
+        connection_name: str,
+        connection: Connection,
+        sql_statement: str,
+        watermark_column: str | None = None,
+        key_columns: list[str] | None = None,
+    ) -> ExtractRefreshSummary:
+        """
+        Create an extract and load it in full.
+
+        Args:
+            name: Name of the extract, also used as its table name locally.
+            connection_name: Name of the connection the rows are read from.
+            connection: The connection the rows are read from.
+            sql_statement: Query whose result is extracted.
+            watermark_column: Column whose values only increase for new or
+                updated rows, used for incremental refreshes.
+            key_columns: Columns identifying a row, so that updated rows
+                replace their previous version on incremental refreshes.
+
+        Raises:
+            ValueError: If the name is invalid or already taken.
+        """
+        if not _EXTRACT_NAME_PATTERN.match(name):
+            raise ValueError(
+                f"Invalid extract name '{name}': use letters, digits and underscores"
+            )
+
+        with self._lock:
+            if self._get_metadata_path(name).exists():
+                raise ValueError(f"Extract '{name}' already exists")
+            extract = Extract(
+                name=name,
+                connection_name=connection_name,
+                sql_statement=normalize_sql(sql_statement),
+                watermark_column=watermark_column,
+                key_columns=key_columns or [],
+            )
+            self._save(extract)
+
+        try:
+            summary = self.refresh_extract(name, connection, full=True)
+        except Exception:
+            self.delete_extract(name)
+            raise
+
+        with self._lock:
+            self.version += 1
+        return summary
+
+    def refresh_extract(
+        self, name: str, connection: Connection, full: bool = False
+    ) -> ExtractRefreshSummary:
+        """
+        Load new rows into an extract.
+
+        Only rows above the stored watermark are read from the source, unless
+        ``full`` is set or the extract has no watermark column.
+
+        Raises:
+            KeyError: If the extract does not exist.
+            RuntimeError: If the source query fails.
+        """
+        with self._lock:
+            refresh_lock = self._refresh_locks.setdefault(name, threading.Lock())
+
+        with refresh_lock:
+            extract = self.get_extract(name)
+            if extract is None:
+                raise KeyError(name)
+
+            started = time.monotonic()
+            incremental = (
+                not full
+                and extract.watermark_column is not None
+                and extract.watermark is not None
+            )
+            sql_statement = extract.sql_statement
+            if incremental:
+                # With key columns, rows at the watermark are read again and
+                # replace their stored version instead of being duplicated
+                operator = ">=" if extract.key_columns else ">"
+                sql_statement = (
+                    f"SELECT * FROM ({extract.sql_statement}) extract_source "
+                    f"WHERE {extract.watermark_column} {operator} {extract.watermark}"
+                )
+
+            result = connection.execute_sql_arrow(sql_statement)
+            if not result.success:
+                raise RuntimeError(result.error)
+            if result.table is None:
+                raise RuntimeError(f"The query of extract '{name}' returned no rows")
+
+            self._store_rows(extract, result.table, incremental)
+            extract.refreshed_at = time.time()
+            self._save(extract)
+
+        summary = ExtractRefreshSummary(
+            name=name,
+            incremental=incremental,
+            rows_loaded=result.table.num_rows,
+            row_count=extract.row_count,
+            duration_seconds=time.monotonic() - started,
+        )
+        logger.info(
+            f"Refreshed extract '{name}' in {summary.duration_seconds:.2f}s: "
+            f"{summary.rows_loaded} rows loaded, {summary.row_count} rows in total"
+        )
+        return summary
+
+    def delete_extract(self, name: str) -> bool:
+        """Delete an extract and its files, returning whether it existed."""
+        if not _EXTRACT_NAME_PATTERN.match(name):
+            return False
+        extract_dir = self._get_extract_dir(name)
+        with self._lock:
+            if not extract_dir.exists():
+                return False
+            shutil.rmtree(extract_dir)
+            self.version += 1
+        return True
+
+    def find_extract(self, connection_name: str, sql_statement: str) -> Extract | None:
+        """Find an extract of exactly this query on this connection."""
+        sql_statement = normalize_sql(sql_statement)
+        for extract in self.list_extracts():
+            if (
+                extract.connection_name == connection_name
+                and extract.sql_statement == sql_statement
+            ):
+                return extract
+        return None
+
+    def _store_rows(self, extract: Extract, table: pa.Table, incremental: bool) -> None:
+        """Write loaded rows as a new part file and update the extract statistics."""
+        extract_dir = self._get_extract_dir(extract.name)
+        previous_files = self.get_data_files(extract.name)
+        part_path = extract_dir / f"part-{time.time_ns()}.parquet"
+
+        # Imported on first use to keep it out of the sandbox startup
+        import duckdb
+
+        with duckdb.connect() as db:
+            if not incremental:
+                write_arrow_table(table, part_path, ResultFormat.PARQUET)
+                for path in previous_files:
+                    path.unlink()
+            elif table.num_rows and extract.key_columns and previous_files:
+                # Rewrite the extract without the previous versions of the rows
+                db.register("new_rows", table)
+                # An anti-join rather than NOT IN, which would keep no previous
+                # row as soon as an incoming key is NULL. NULL keys match.
+                key_matches = " AND ".join(
+                    f"previous.{key} IS NOT DISTINCT FROM new_rows.{key}"
+                    for key in map(quote_identifier, extract.key_columns)
+                )
+                tmp_path = extract_dir / f".{part_path.name}.tmp"
+                db.execute(
+                    f"""
+                    COPY (
+                        SELECT * FROM read_parquet(?, union_by_name = true) AS previous
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM new_rows WHERE {key_matches}
+                        )
+                        UNION ALL BY NAME
+                        SELECT * FROM new_rows
+                    ) TO '{tmp_path}' (FORMAT parquet)
+                    """,
+                    [[str(path) for path in previous_files]],
+                )
+                os.replace(tmp_path, part_path)
+                for path in previous_files:
+                    path.unlink()
+            elif table.num_rows:
+                write_arrow_table(table, part_path, ResultFormat.PARQUET)
+
+            files = [str(path) for path in self.get_data_files(extract.name)]
+            if extract.watermark_column is not None:
+                row_count, watermark = db.execute(
+                    f"SELECT count(*), max({quote_identifier(extract.watermark_column)}) "
+                    "FROM read_parquet(?, union_by_name = true)",
+                    [files],
+                ).fetchone()
+                if watermark is not None:
+                    extract.watermark = _to_sql_literal(watermark)
+            else:
+                (row_count,) = db.execute(
+                    "SELECT count(*) FROM read_parquet(?, union_by_name = true)",
+                    [files],
+                ).fetchone()
+
+        extract.row_count = row_count
+        extract.size_bytes = sum(os.path.getsize(path) for path in files)
+
+    def _save(self, extract: Extract) -> None:
+        """Write the metadata of an extract atomically."""
+        path = self._get_metadata_path(extract.name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(extract.to_dict()))
+        os.replace(tmp_path, path)
+
+    def _get_extract_dir(self, name: str) -> Path:
+        """Get the directory holding an extract."""
+        return self._extracts_dir / name
+
+    def _get_metadata_path(self, name: str) -> Path:
+        """Get the metadata file of an extract."""
+        return self._get_extract_dir(name) / "extract.json"
+
+
+# Global manager of local extracts
+extract_manager = ExtractManager()
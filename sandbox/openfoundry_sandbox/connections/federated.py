@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import pyarrow as pa
+
+from .preflight import PreflightPolicy, run_preflight
+from .query_jobs import RunningQuery
+from .result_cache import result_cache
+from .utils import SqlExecutionResult
+
+if TYPE_CHECKING:
+    from .connection import Connection
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of sub-queries combined by a federated query
+MAX_FEDERATED_SOURCES = 10
+
+# Source names are referenced as tables in the local query
+SOURCE_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,62}$")
+
+
+@dataclass
+class FederatedSource:
+    """A sub-query whose result is referenced by name in a federated query."""
+
+    name: str
+    connection_name: str
+    sql_statement: str
+
+
+@dataclass
+class FederatedSourceStats:
+    """How fetching the result of a sub-query went."""
+
+    name: str
+    connection_name: str
+    rows: int = 0
+    bytes: int = 0
+    duration_seconds: float = 0.0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the stats to a dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class FederatedQueryResult:
+    """Result of a federated query and the stats of its sub-queries."""
+
+    result: SqlExecutionResult
+    sources: list[FederatedSourceStats] = field(default_factory=list)
+    local_duration_seconds: float = 0.0
+
+
+def _fetch_source(
+    source: FederatedSource,
+    connection: Connection,
+    query: RunningQuery,
+    use_cache: bool,
+    preflight: PreflightPolicy | None,
+) -> tuple[SqlExecutionResult, float]:
+    """Run a sub-query into an Arrow table, returning it and its duration."""
+    start_time = time.monotonic()
+    sql_statement = source.sql_statement
+    if preflight is not None:
+        preflight_result = run_preflight(connection, sql_statement, preflight)
+        if preflight_result.refused:
+            result = SqlExecutionResult.error_result(preflight_result.message)
+            return result, time.monotonic() - start_time
+        sql_statement = preflight_result.sql_statement
+
+    def execute() -> SqlExecutionResult:
+        return connection.execute_sql_arrow(sql_statement, query=query)
+
+    result = result_cache.execute(
+        source.connection_name,
+        sql_statement,
+        execute,
+        kind="arrow",
+        use_cache=use_cache,
+    )
+    return result, time.monotonic() - start_time
+
+
+def _run_local_query(
+    tables: dict[str, pa.Table], sql_statement: str, timeout: float | None
+) -> SqlExecutionResult:
+    """Run the local query over the sub-query results, interrupting it after ``timeout`` seconds."""
+    # Imported on first use to keep it out of the sandbox startup
+    import duckdb
+
+    timed_out = threading.Event()
+    try:
+        with duckdb.connect() as db:
+
+            def interrupt() -> None:
+                timed_out.set()
+                db.interrupt()
+
+            timer = None
+            if timeout is not None:
+                timer = threading.Timer(timeout, interrupt)
+                timer.daemon = True
+                timer.start()
+            try:
+                for name, table in tables.items():
+                    db.register(name, table)
+                db.execute(sql_statement)
+                if db.description is None:
+                    return SqlExecutionResult.success_result()
+                return SqlExecutionResult.arrow_result(pa.table(db.arrow()))
+            finally:
+                # Stopped before the database is closed under it
+                if timer is not None:
+                    timer.cancel()
+    except Exception as e:
+        if timed_out.is_set():
+            return SqlExecutionResult.error_result("Federated query timed out")
+        return SqlExecutionResult.error_result(str(e))
+
+
+def execute_federated(
+    sources: list[tuple[FederatedSource, Connection]],
+    sql_statement: str,
+    timeout: float | None = None,
+    use_cache: bool = False,
+    preflight: PreflightPolicy | None = None,
+) -> FederatedQueryResult:
+    """
+    Join or aggregate the results of sub-queries on different connections.
+
+    The sub-queries run concurrently, each through the columnar fetch path of
+    its connection. Their Arrow results are registered without copying as
+    relations of an in-memory DuckDB database, named after their source, and
+    ``sql_statement`` is executed there. Only the final result is returned.
+
+    Args:
+        sources: The sub-queries with the connections they run on.
+        sql_statement: DuckDB SQL referencing the sources by name.
+        timeout: Seconds after which unfinished sub-queries are cancelled. The
+            local query is interrupted once the same time has passed.
+        use_cache: Serve read-only sub-queries from the result cache.
+        preflight: Guardrails applied to each sub-query before it is executed.
+
+    Returns:
+        The result of the local query, or the error of the first failed
+        sub-query, with the stats of every sub-query.
+    """
+    stats = [
+        FederatedSourceStats(source.name, source.connection_name)
+        for source, _ in sources
+    ]
+    queries = [RunningQuery() for _ in sources]
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    executor = ThreadPoolExecutor(
+        max_workers=len(sources), thread_name_prefix="sql-federated"
+    )
+    try:
+        futures = [
+            executor.submit(
+                _fetch_source, source, connection, query, use_cache, preflight
+            )
+            for (source, connection), query in zip(sources, queries)
+        ]
+        _, not_done = wait(futures, timeout=timeout)
+        for future, (_, connection), query in zip(futures, sources, queries):
+            if future in not_done:
+                try:
+                    connection.cancel_query(query)
+                except Exception as e:
+                    logger.warning(f"Failed to cancel federated sub-query: {e}")
+    finally:
+        # Cancelled sub-queries are left to wind down without holding up the
+        # response
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    tables: dict[str, pa.Table] = {}
+    error = None
+    for future, source_stats in zip(futures, stats):
+        if future in not_done:
+            # Not waited for, as the sub-query may still be winding down
+            source_stats.error = f"Sub-query timed out after {timeout}s"
+        else:
+            try:
+                result, source_stats.duration_seconds = future.result()
+            except Exception as e:
+                result = SqlExecutionResult.error_result(str(e))
+            if not result.success:
+                source_stats.error = result.error
+            elif result.table is None:
+                source_stats.error = "Sub-query returned no result set"
+            else:
+                tables[source_stats.name] = result.table
+                source_stats.rows = result.table.num_rows
+                source_stats.bytes = result.table.nbytes
+        if source_stats.error is not None and error is None:
+            error = f"Source '{source_stats.name}' failed: {source_stats.error}"
+
+    if error is not None:
+        return FederatedQueryResult(SqlExecutionResult.error_result(error), stats)
+
+    start_time = time.monotonic()
+    local_timeout = None if deadline is None else max(deadline - start_time, 0.0)
+    result = _run_local_query(tables, sql_statement, local_timeout)
+    local_duration = time.monotonic() - start_time
+
+    logger.info(
+        f"Federated query over {len(sources)} source(s) fetched "
+        f"{sum(s.rows for s in stats)} rows and ran locally in {local_duration:.2f}s"
+    )
+    return FederatedQueryResult(result, stats, local_duration)
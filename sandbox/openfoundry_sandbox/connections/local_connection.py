@@ -0,0 +1,113 @@
+import threading
+from contextlib import contextmanager
+from typing import Any
+
+import duckdb
+import pyarrow as pa
+
+from .connection import Connection
+from .extracts import ExtractManager, extract_manager, quote_identifier
+from .query_jobs import RunningQuery
+from .utils import quote_sql_literal
+
+
+class LocalConnection(Connection):
+    """Connection to the local extracts, queried with an in-process DuckDB.
+
+    Every extract is exposed as a view over its Parquet files, named after the
+    extract. Pooled connections are cursors of a single in-memory database,
+    so the views are shared and only recreated when extracts are added or
+    removed.
+    """
+
+    sql_dialect = "duckdb"
+
+    def __init__(
+        self,
+        secrets: dict[str, str] | None = None,
+        extracts: ExtractManager = extract_manager,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize LocalConnection.
+
+        Args:
+            secrets: Unused, the local connection needs no credentials.
+            extracts: The extracts exposed by the connection.
+            **kwargs: Additional arguments passed to parent class
+        """
+        super().__init__(secrets=secrets or {}, **kwargs)
+        self._extracts = extracts
+        self._database = duckdb.connect()
+        self._views_lock = threading.Lock()
+        self._views: set[str] = set()
+        self._views_version: int | None = None
+
+    def _create_connection(self) -> duckdb.DuckDBPyConnection:
+        """Open a cursor on the shared in-memory database"""
+        return self._database.cursor()
+
+    @contextmanager
+    def _get_cursor(self, conn: duckdb.DuckDBPyConnection):
+        """Bring the extract views up to date before handing out a cursor"""
+        self._sync_views()
+        with super()._get_cursor(conn) as cursor:
+            yield cursor
+
+    def _create_stream_cursor(
+        self, conn: duckdb.DuckDBPyConnection, sql_statement: str
+    ) -> duckdb.DuckDBPyConnection:
+        """Bring the extract views up to date before a streamed statement"""
+        self._sync_views()
+        return super()._create_stream_cursor(conn, sql_statement)
+
+    def _sync_views(self) -> None:
+        """Create a view per extract and drop the views of deleted extracts."""
+        with self._views_lock:
+            version = self._extracts.version
+            if version == self._views_version:
+                return
+
+            extracts = {extract.name for extract in self._extracts.list_extracts()}
+            for name in self._views - extracts:
+                self._database.execute(f"DROP VIEW IF EXISTS {quote_identifier(name)}")
+            for name in extracts:
+                data_glob = quote_sql_literal(self._extracts.get_data_glob(name))
+                self._database.execute(
+                    f"CREATE OR REPLACE VIEW {quote_identifier(name)} AS "
+                    f"SELECT * FROM read_parquet({data_glob}, union_by_name = true)"
+                )
+            self._views = extracts
+            self._views_version = version
+
+    def _is_alive(self, conn: duckdb.DuckDBPyConnection) -> bool:
+        """Cursors of an in-process database do not go stale."""
+        return True
+
+    def _reset_connection(self, conn: duckdb.DuckDBPyConnection) -> None:
+        """Statements run in auto-commit mode, so there is nothing to roll back."""
+        pass
+
+    def _fetch_arrow(self, cursor: duckdb.DuckDBPyConnection) -> pa.Table:
+        """Fetch the result set with DuckDB's native Arrow export."""
+        return pa.table(cursor.arrow())
+
+    def _cancel_query(
+        self, query: RunningQuery, conn: duckdb.DuckDBPyConnection, cursor: Any
+    ) -> None:
+        """Interrupt the statement running on the cursor."""
+        cursor.interrupt()
+
+    def _catalog_tables_query(self) -> str:
+        """DuckDB does not track when a table was last altered."""
+        self._sync_views()
+        return f"""
+            SELECT table_schema, table_name, table_type, NULL
+            FROM information_schema.tables
+            WHERE {self._excluded_schemas_filter("table_schema")}
+        """
+
+    def cleanup(self) -> None:
+        """Close the pooled cursors and the in-memory database."""
+        self.close()
+        self._database.close()
@@ -1,11 +1,26 @@
-from typing import Any
+import json
+import uuid
+from typing import Any, Iterator
 
 import psycopg2
+from psycopg2.extensions import connection as PostgresConnector
+from psycopg2.extensions import cursor as PostgresCursor
 
 from .connection import Connection
+from .preflight import CostEstimate
+from .query_jobs import RunningQuery
+from .utils import get_leading_keyword
+
+# Statements that can be wrapped in a server-side (DECLARE ... CURSOR FOR) cursor
+SERVER_SIDE_CURSOR_KEYWORDS = {"SELECT", "WITH", "VALUES", "TABLE"}
+
+# Rows transferred per network round trip when iterating a server-side cursor
+SERVER_SIDE_CURSOR_ITERSIZE = 2000
 
 
 class PostgresConnection(Connection):
+    sql_dialect = "postgres"
+
     def __init__(
         self,
         secrets: dict[str, str],
@@ -31,8 +46,8 @@ class PostgresConnection(Connection):
         self.user = secrets["POSTGRES_USER"]
         self.password = secrets["POSTGRES_PASSWORD"]
 
-    def _init_connection(self) -> None:
-        """Initialize the PostgreSQL connection"""
+    def _create_connection(self) -> PostgresConnector:
+        """Open a PostgreSQL connection"""
         conn_params = {
             "host": self.host,
             "port": self.port,
@@ -41,8 +56,79 @@ class PostgresConnection(Connection):
             "password": self.password,
         }
 
-        self._conn = psycopg2.connect(**conn_params)
+        return psycopg2.connect(**conn_params)
+
+    def _is_alive(self, conn: PostgresConnector) -> bool:
+        """Check that the connection has not been closed before pinging it."""
+        return conn.closed == 0 and super()._is_alive(conn)
+
+    def _cancel_query(
+        self, query: RunningQuery, conn: PostgresConnector, cursor: Any
+    ) -> None:
+        """Cancel the statement running on the connection's backend process."""
+        self._run_control_statement(
+            f"SELECT pg_cancel_backend({conn.get_backend_pid()})"
+        )
+
+    def estimate_cost(self, sql_statement: str) -> CostEstimate:
+        """
+        Estimate the rows and bytes read by a query from its EXPLAIN plan.
+
+        The planner's row and width estimates of all scan nodes are summed.
+        """
+        plan = self._fetch_rows(f"EXPLAIN (FORMAT JSON) {sql_statement}")[0][0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        rows_scanned = 0
+        bytes_scanned = 0
+        for node in _iter_plan_nodes(plan[0]["Plan"]):
+            if "Scan" in node["Node Type"]:
+                rows_scanned += node["Plan Rows"]
+                bytes_scanned += node["Plan Rows"] * node["Plan Width"]
+        return CostEstimate(
+            method="explain",
+            bytes_scanned=int(bytes_scanned),
+            rows_scanned=int(rows_scanned),
+        )
+
+    def _catalog_tables_query(self) -> str:
+        """Postgres does not track when a table was last altered."""
+        return f"""
+            SELECT table_schema, table_name, table_type, NULL
+            FROM information_schema.tables
+            WHERE {self._excluded_schemas_filter("table_schema")}
+        """
+
+    def _create_stream_cursor(
+        self, conn: PostgresConnector, sql_statement: str
+    ) -> PostgresCursor:
+        """Use a named server-side cursor for queries so rows stay on the server."""
+        if get_leading_keyword(sql_statement) not in SERVER_SIDE_CURSOR_KEYWORDS:
+            return conn.cursor()
+
+        cursor = conn.cursor(name=f"openfoundry_{uuid.uuid4().hex}")
+        cursor.itersize = SERVER_SIDE_CURSOR_ITERSIZE
+        return cursor
+
+    def _is_server_side(self, cursor: PostgresCursor) -> bool:
+        """Named cursors only have a description once rows have been fetched."""
+        return cursor.name is not None
+
+    def _on_stream_closed(
+        self, conn: PostgresConnector, cursor: PostgresCursor
+    ) -> None:
+        """End the transaction a server-side cursor was declared in."""
+        if self._is_server_side(cursor):
+            conn.commit()
 
     def cleanup(self) -> None:
         """Clean up any resources used by the connection"""
         self.close()
+
+
+def _iter_plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Iterate over a node of an EXPLAIN (FORMAT JSON) plan and its descendants."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from _iter_plan_nodes(child)
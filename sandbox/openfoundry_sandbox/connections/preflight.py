@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from .utils import add_row_limit, is_plain_select
+
+if TYPE_CHECKING:
+    from .connection import Connection
+
+logger = logging.getLogger(__name__)
+
+# Row limit applied to queries that exceed the cost thresholds when the
+# policy downgrades instead of refusing them
+DOWNGRADED_ROW_LIMIT = 10
+
+ExceedAction = Literal["refuse", "limit"]
+
+
+@dataclass
+class CostEstimate:
+    """Cost of a query as estimated by the database without running it."""
+
+    method: str
+    bytes_scanned: int | None = None
+    rows_scanned: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the estimate to a dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class PreflightPolicy:
+    """Guardrails applied to a SQL statement before it is executed.
+
+    Attributes:
+        row_limit: LIMIT added to plain SELECT queries that have none.
+        max_bytes_scanned: Estimated bytes scanned above which the policy applies.
+        max_rows_scanned: Estimated rows scanned above which the policy applies.
+        on_exceed: Refuse a query over a threshold, or run it with a LIMIT of
+            ``DOWNGRADED_ROW_LIMIT`` rows. Lowering the limit only reduces the
+            work of engines that stop scanning early (e.g. Postgres and
+            ClickHouse), so refusing is the safer choice for BigQuery.
+    """
+
+    row_limit: int | None = None
+    max_bytes_scanned: int | None = None
+    max_rows_scanned: int | None = None
+    on_exceed: ExceedAction = "refuse"
+
+
+@dataclass
+class PreflightResult:
+    """Outcome of the preflight stage of a SQL statement."""
+
+    sql_statement: str
+    limit_added: int | None = None
+    estimate: CostEstimate | None = None
+    exceeded: bool = False
+    refused: bool = False
+    message: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result to a dictionary."""
+        return asdict(self)
+
+
+def _format_bytes(size: float) -> str:
+    """Format a byte count with a binary unit."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def run_preflight(
+    connection: Connection, sql_statement: str, policy: PreflightPolicy
+) -> PreflightResult:
+    """
+    Apply a preflight policy to a SQL statement before it is executed.
+
+    A LIMIT is added to plain SELECT queries without one. If the policy has
+    cost thresholds, the cost of the query is then estimated with the cheapest
+    mechanism of the database (a dry run or EXPLAIN). Queries over a threshold
+    are refused or downgraded. Failing to estimate a query does not block it.
+
+    Returns:
+        The statement to execute and what the preflight found.
+    """
+    result = PreflightResult(sql_statement)
+    if policy.row_limit is not None:
+        limited = add_row_limit(sql_statement, policy.row_limit, connection.sql_dialect)
+        if limited is not None:
+            result.sql_statement = limited
+            result.limit_added = policy.row_limit
+
+    if (
+        policy.max_bytes_scanned is None and policy.max_rows_scanned is None
+    ) or not is_plain_select(sql_statement, connection.sql_dialect):
+        return result
+
+    try:
+        result.estimate = connection.estimate_cost(result.sql_statement)
+    except Exception as e:
+        logger.warning(f"Failed to estimate the cost of a query: {e}")
+    if result.estimate is None:
+        return result
+
+    reasons = []
+    bytes_scanned = result.estimate.bytes_scanned
+    if (
+        policy.max_bytes_scanned is not None
+        and bytes_scanned is not None
+        and bytes_scanned > policy.max_bytes_scanned
+    ):
+        reasons.append(
+            f"it would scan an estimated {_format_bytes(bytes_scanned)} "
+            f"(limit {_format_bytes(policy.max_bytes_scanned)})"
+        )
+    rows_scanned = result.estimate.rows_scanned
+    if (
+        policy.max_rows_scanned is not None
+        and rows_scanned is not None
+        and rows_scanned > policy.max_rows_scanned
+    ):
+        reasons.append(
+            f"it would read an estimated {rows_scanned:,} rows "
+            f"(limit {policy.max_rows_scanned:,})"
+        )
+    if not reasons:
+        return result
+
+    result.exceeded = True
+    reason = " and ".join(reasons)
+    if policy.on_exceed == "limit":
+        limited = add_row_limit(
+            sql_statement, DOWNGRADED_ROW_LIMIT, connection.sql_dialect
+        )
+        if limited is not None:
+            result.sql_statement = limited
+            result.limit_added = DOWNGRADED_ROW_LIMIT
+            result.message = f"The query was limited to {DOWNGRADED_ROW_LIMIT} rows because {reason}."
+            return result
+
+    result.refused = True
+    result.message = (
+        f"The query was not executed because {reason}. Filter on partitioning "
+        "or date columns, select fewer columns or aggregate to reduce its cost."
+    )
+    return result
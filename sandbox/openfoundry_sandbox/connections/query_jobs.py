@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+from .preflight import PreflightPolicy, PreflightResult, run_preflight
+from .result_cache import result_cache
+from .utils import SqlExecutionResult
+
+if TYPE_CHECKING:
+    from .connection import Connection
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of query jobs executing at the same time
+MAX_CONCURRENT_QUERY_JOBS = 8
+
+# Seconds a finished query job is kept around for its result to be fetched
+QUERY_JOB_TTL = 15 * 60.0
+
+
+class QueryCancelledError(Exception):
+    """Raised when a statement is cancelled before it reaches the database."""
+
+    pass
+
+
+class RunningQuery:
+    """Tracks the driver objects of an executing statement so it can be cancelled.
+
+    The connection attaches the borrowed DB-API connection and cursor while the
+    statement runs. ``cancel_query`` on the connection may then be called from
+    any other thread to stop it with the driver's native cancel mechanism.
+    """
+
+    def __init__(self, query_id: str | None = None) -> None:
+        self.query_id = query_id or uuid.uuid4().hex
+        self.conn: Any = None
+        self.cursor: Any = None
+        self.running = False
+        self.cancel_requested = False
+        self._lock = threading.Lock()
+
+    def attach(self, conn: Any, cursor: Any) -> None:
+        """Record the connection and cursor the statement is about to run on.
+
+        Raises:
+            QueryCancelledError: If the query was cancelled before it started.
+        """
+        with self._lock:
+            if self.cancel_requested:
+                raise QueryCancelledError(f"Query {self.query_id} was cancelled")
+            self.conn = conn
+            self.cursor = cursor
+            self.running = True
+
+    def detach(self) -> None:
+        """Forget the driver objects once the statement has finished."""
+        with self._lock:
+            self.conn = None
+            self.cursor = None
+            self.running = False
+
+    def request_cancel(self) -> tuple[bool, Any, Any]:
+        """Mark the query as cancelled.
+
+        Returns:
+            Whether the statement is running, and the connection and cursor it
+            is running on.
+        """
+        with self._lock:
+            self.cancel_requested = True
+            return self.running, self.conn, self.cursor
+
+
+class QueryJobState(str, Enum):
+    """Lifecycle state of an asynchronous query job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    TIMED_OUT = "timed_out"
+
+
+class QueryJob:
+    """A SQL statement submitted for asynchronous execution."""
+
+    def __init__(
+        self,
+        connection_name: str,
+        sql_statement: str,
+        timeout: float | None = None,
+        use_cache: bool = False,
+        preflight: PreflightPolicy | None = None,
+        max_rows: int | None = None,
+    ) -> None:
+        self.query = RunningQuery()
+        self.connection_name = connection_name
+        self.sql_statement = sql_statement
+        self.timeout = timeout
+        self.use_cache = use_cache
+        self.preflight = preflight
+        self.max_rows = max_rows
+        self.preflight_result: PreflightResult | None = None
+        self.state = QueryJobState.PENDING
+        self.result: SqlExecutionResult | None = None
+        self.submitted_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.timed_out = False
+        self._done = threading.Event()
+        self._future: Future | None = None
+
+    @property
+    def job_id(self) -> str:
+        """Identifier of the job, shared with the driver-side query where supported."""
+        return self.query.query_id
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job has reached a terminal state."""
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the job finishes or ``timeout`` seconds pass.
+
+        Returns:
+            Whether the job finished.
+        """
+        return self._done.wait(timeout)
+
+    def _finish(self, state: QueryJobState, result: SqlExecutionResult) -> None:
+        """Move the job to a terminal state and wake up waiters."""
+        self.state = state
+        self.result = result
+        self.finished_at = time.time()
+        self._done.set()
+
+
+class QueryJobManager:
+    """Runs SQL statements in the background and tracks them by job id.
+
+    Jobs can be polled, awaited with a deadline and cancelled. Cancelling a
+    running job (or hitting its timeout) calls the native cancel mechanism of
+    the job's connection. Finished jobs are forgotten after ``ttl`` seconds.
+    """
+
+    def __init__(
+        self, max_workers: int = MAX_CONCURRENT_QUERY_JOBS, ttl: float = QUERY_JOB_TTL
+    ) -> None:
+        self._max_workers = max_workers
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._jobs: dict[str, tuple[QueryJob, Connection]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def submit(
+        self,
+        connection: Connection,
+        connection_name: str,
+        sql_statement: str,
+        timeout: float | None = None,
+        use_cache: bool = False,
+        preflight: PreflightPolicy | None = None,
+        max_rows: int | None = None,
+    ) -> QueryJob:
+        """
+        Submit a SQL statement for background execution.
+
+        Args:
+            connection: The connection to execute the statement on.
+            connection_name: Name of the connection, reported back with the job.
+            sql_statement: The SQL statement to execute.
+            timeout: Seconds after which the statement is cancelled.
+            use_cache: Serve read-only statements from the result cache.
+            preflight: Guardrails (row limit, cost thresholds) applied to the
+                statement before it is executed.
+            max_rows: Only fetch the first rows of the result (plus one to
+                tell whether it was cut) instead of the whole result set.
+
+        Returns:
+            The submitted job.
+        """
+        job = QueryJob(
+            connection_name,
+            sql_statement,
+            timeout=timeout,
+            use_cache=use_cache,
+            preflight=preflight,
+            max_rows=max_rows,
+        )
+        with self._lock:
+            self._evict_locked()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="sql-job"
+                )
+            self._jobs[job.job_id] = (job, connection)
+            job._future = self._executor.submit(self._run, job, connection)
+
+        logger.info(f"Submitted query job {job.job_id} on '{connection_name}'")
+        return job
+
+    def get(self, job_id: str) -> QueryJob | None:
+        """Get a job by id, or None if it is unknown or has expired."""
+        with self._lock:
+            self._evict_locked()
+            entry = self._jobs.get(job_id)
+        return entry[0] if entry else None
+
+    def cancel(self, job_id: str) -> QueryJob | None:
+        """
+        Cancel a job.
+
+        Pending jobs are cancelled without touching the database. Running jobs
+        are cancelled through their connection's native cancel mechanism.
+        Cancelling a finished job has no effect.
+
+        Returns:
+            The job, or None if it is unknown or has expired.
+        """
+        with self._lock:
+            entry = self._jobs.get(job_id)
+        if entry is None:
+            return None
+
+        job, connection = entry
+        self._cancel_job(job, connection)
+        return job
+
+    def shutdown(self) -> None:
+        """Cancel all unfinished jobs and stop the worker threads."""
+        with self._lock:
+            entries = list(self._jobs.values())
+            self._jobs.clear()
+            executor, self._executor = self._executor, None
+
+        for job, connection in entries:
+            if not job.is_finished:
+                self._cancel_job(job, connection)
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: QueryJob, connection: Connection) -> None:
+        """Execute a job on a worker thread."""
+        job.state = QueryJobState.RUNNING
+        job.started_at = time.time()
+
+        timer = None
+        if job.timeout is not None:
+            timer = threading.Timer(job.timeout, self._on_timeout, (job, connection))
+            timer.daemon = True
+            timer.start()
+
+        sql_statement = job.sql_statement
+
+        def execute() -> SqlExecutionResult:
+            if job.max_rows is not None:
+                return connection.execute_sql_page(
+                    sql_statement, job.max_rows, query=job.query
+                )
+            return connection.execute_sql(sql_statement, query=job.query)
+
+        try:
+            if job.preflight is not None:
+                job.preflight_result = run_preflight(
+                    connection, sql_statement, job.preflight
+                )
+                sql_statement = job.preflight_result.sql_statement
+
+            if job.preflight_result is not None and job.preflight_result.refused:
+                result = SqlExecutionResult.error_result(job.preflight_result.message)
+            else:
+                # Pages of a result are cached apart from the full result
+                kind = "rows" if job.max_rows is None else f"rows:{job.max_rows}"
+                result = result_cache.execute(
+                    job.connection_name,
+                    sql_statement,
+                    execute,
+                    kind=kind,
+                    use_cache=job.use_cache,
+                )
+        except Exception as e:
+            # Anything raised outside the driver call (preflight, pool) must
+            # still finish the job, or pollers would wait on it forever
+            logger.error(f"Query job {job.job_id} failed: {e}", exc_info=True)
+            result = SqlExecutionResult.error_result(str(e))
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+        if result.success:
+            state = QueryJobState.SUCCEEDED
+        elif job.timed_out:
+            state = QueryJobState.TIMED_OUT
+            result = SqlExecutionResult.error_result(
+                f"Query timed out after {job.timeout}s"
+            )
+        elif job.query.cancel_requested:
+            state = QueryJobState.CANCELLED
+            result = SqlExecutionResult.error_result("Query was cancelled")
+        else:
+            state = QueryJobState.FAILED
+
+        job._finish(state, result)
+        logger.info(f"Query job {job.job_id} finished with state '{state.value}'")
+
+    def _on_timeout(self, job: QueryJob, connection: Connection) -> None:
+        """Cancel a job whose timeout has expired."""
+        logger.warning(f"Query job {job.job_id} timed out after {job.timeout}s")
+        job.timed_out = True
+        self._cancel_job(job, connection)
+
+    def _cancel_job(self, job: QueryJob, connection: Connection) -> None:
+        """Cancel a pending or running job."""
+        if job.is_finished:
+            return
+
+        if job._future is not None and job._future.cancel():
+            # The job never started, so there is nothing to cancel in the database
+            job.query.request_cancel()
+            job._finish(
+                QueryJobState.CANCELLED,
+                SqlExecutionResult.error_result("Query was cancelled"),
+            )
+            return
+
+        try:
+            if connection.cancel_query(job.query):
+                logger.info(f"Sent cancel request for query job {job.job_id}")
+        except Exception as e:
+            logger.error(f"Failed to cancel query job {job.job_id}: {e}", exc_info=True)
+
+    def _evict_locked(self) -> None:
+        """Forget expired finished jobs. Must be called with the lock held."""
+        now = time.time()
+        for job_id in list(self._jobs):
+            job = self._jobs[job_id][0]
+            if job.finished_at is not None and now - job.finished_at > self._ttl:
+                del self._jobs[job_id]
+
+
+# Global manager of asynchronous query jobs
+query_job_manager = QueryJobManager()
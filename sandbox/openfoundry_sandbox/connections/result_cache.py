@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+from pydantic_core import to_json
+
+from .utils import SqlExecutionResult, is_read_only_sql, normalize_sql
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached result is served before the query is run again
+RESULT_CACHE_TTL = 5 * 60.0
+
+# Total estimated size of the cached results before the least recently used
+# entries are evicted
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class ResultCacheStats:
+    """Point-in-time statistics of the result cache."""
+
+    hits: int
+    misses: int
+    bypassed: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    evictions: int
+    invalidations: int
+
+    def to_dict(self) -> dict[str, int]:
+        """Convert the stats to a dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class _CacheEntry:
+    result: SqlExecutionResult
+    size: int
+    expires_at: float
+
+
+def _estimate_size(result: SqlExecutionResult) -> int:
+    """Estimate the memory held by a cached result."""
+    if result.table is not None:
+        return result.table.nbytes
+    return len(to_json(result.data, fallback=str))
+
+
+class ResultCache:
+    """LRU cache of SQL results keyed by connection name and normalized SQL.
+
+    Only successful results of read-only statements are cached. Any other
+    statement invalidates the entries of its connection once it succeeds,
+    whether or not it was run with caching, since it may have changed the
+    data they were read from.
+    """
+
+    def __init__(
+        self, ttl: float = RESULT_CACHE_TTL, max_bytes: int = RESULT_CACHE_MAX_BYTES
+    ) -> None:
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str, str], _CacheEntry] = OrderedDict()
+        self._size = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._bypassed = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def execute(
+        self,
+        connection_name: str,
+        sql_statement: str,
+        execute: Callable[[], SqlExecutionResult],
+        kind: str = "rows",
+        use_cache: bool = True,
+    ) -> SqlExecutionResult:
+        """
+        Serve a statement from the cache, executing and caching it on a miss.
+
+        Args:
+            connection_name: Name of the connection the statement runs on.
+            sql_statement: The SQL statement.
+            execute: Runs the statement when it cannot be served from the cache.
+            kind: Distinguishes results of the same statement in different
+                shapes (e.g. rows or an Arrow table).
+            use_cache: Whether a read-only statement may be served from and
+                stored in the cache. Statements that may change data
+                invalidate the connection's entries either way.
+
+        Returns:
+            The cached or freshly executed result.
+        """
+        if not use_cache or not is_read_only_sql(sql_statement):
+            if use_cache:
+                with self._lock:
+                    self._bypassed += 1
+            result = execute()
+            if result.success:
+                self.invalidate_after(connection_name, sql_statement)
+            return result
+
+        key = (connection_name, kind, normalize_sql(sql_statement))
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        result = execute()
+        if result.success:
+            self._put(key, result)
+        return result
+
+    def invalidate_after(self, connection_name: str, sql_statement: str) -> None:
+        """Drop the cached results of a connection if a statement run on it may have changed data."""
+        if not is_read_only_sql(sql_statement):
+            self.invalidate(connection_name)
+
+    def invalidate(self, connection_name: str | None = None) -> int:
+        """
+        Drop the cached results of a connection, or of all connections.
+
+        Returns:
+            The number of dropped entries.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if connection_name is None or key[0] == connection_name
+            ]
+            for key in keys:
+                self._remove_locked(key)
+            if keys:
+                self._invalidations += 1
+
+        if keys:
+            logger.info(
+                f"Invalidated {len(keys)} cached result(s) for {connection_name or 'all connections'}"
+            )
+        return len(keys)
+
+    def stats(self) -> ResultCacheStats:
+        """Get the current cache statistics."""
+        with self._lock:
+            return ResultCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                bypassed=self._bypassed,
+                entries=len(self._entries),
+                size_bytes=self._size,
+                max_bytes=self._max_bytes,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+            )
+
+    def _get(self, key: tuple[str, str, str]) -> SqlExecutionResult | None:
+        """Look up a fresh entry, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove_locked(key)
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.result
+
+    def _put(self, key: tuple[str, str, str], result: SqlExecutionResult) -> None:
+        """Store a result, evicting least recently used entries to fit the budget."""
+        size = _estimate_size(result)
+        if size > self._max_bytes:
+            logger.debug(f"Not caching result of {size} bytes for '{key[0]}'")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            self._entries[key] = _CacheEntry(
+                result=result, size=size, expires_at=time.monotonic() + self._ttl
+            )
+            self._size += size
+
+            while self._size > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                self._evictions += 1
+
+    def _remove_locked(self, key: tuple[str, str, str]) -> None:
+        """Remove an entry. Must be called with the lock held."""
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+
+
+# Global cache of SQL results shared by all connections
+result_cache = ResultCache()
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from .connection_pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Seconds an idle result stream is kept open waiting for a continuation request
+RESULT_STREAM_TTL = 300.0
+
+# Maximum number of result streams kept open at the same time
+MAX_OPEN_RESULT_STREAMS = 16
+
+# Seconds between background sweeps for expired result streams
+RESULT_STREAM_SWEEP_INTERVAL = 30.0
+
+
+class SqlResultStream:
+    """An executed SQL statement whose rows are fetched incrementally.
+
+    The stream owns the cursor it reads from and must be closed once the
+    caller is done with it, whether or not all rows were consumed.
+    """
+
+    def __init__(
+        self,
+        cursor: Any,
+        has_result_set: bool = True,
+        rows_affected: int = 0,
+        on_close: Callable[[], None] | None = None,
+        pool: ConnectionPool | None = None,
+    ) -> None:
+        """
+        Initialize the stream around an executed cursor.
+
+        Args:
+            cursor: A DB-API cursor on which the statement has been executed.
+            has_result_set: Whether the statement produced rows to fetch.
+            rows_affected: Row count reported for statements without a result set.
+            on_close: Optional callback invoked after the cursor is closed.
+            pool: Pool the stream's connection was borrowed from, if any.
+        """
+        self._cursor = cursor
+        self._on_close = on_close
+        self.pool = pool
+        self._pending: list[tuple] = []
+        self._exhausted = not has_result_set
+        self._closed = False
+        self.has_result_set = has_result_set
+        self.rows_affected = rows_affected
+        self.rows_fetched = 0
+
+    @property
+    def column_names(self) -> list[str]:
+        """Names of the result columns, empty for statements without a result set.
+
+        Server-side cursors only report their description after the first
+        fetch, so read this after calling ``fetch_batch`` at least once.
+        """
+        description = self._cursor.description
+        if not description:
+            return []
+        return [desc[0] for desc in description]
+
+    def fetch_batch(self, size: int) -> list[tuple]:
+        """Fetch up to ``size`` rows from the stream."""
+        if size <= 0 or self._closed:
+            return []
+
+        rows = self._pending[:size]
+        self._pending = self._pending[size:]
+
+        if len(rows) < size and not self._exhausted:
+            fetched = list(self._cursor.fetchmany(size - len(rows)))
+            if len(fetched) < size - len(rows):
+                self._exhausted = True
+            rows.extend(fetched)
+
+        self.rows_fetched += len(rows)
+        return [tuple(row) for row in rows]
+
+    def has_more(self) -> bool:
+        """Check whether more rows are available, buffering one row if needed."""
+        if self._pending:
+            return True
+        if self._exhausted or self._closed:
+            return False
+
+        self._pending = list(self._cursor.fetchmany(1))
+        if not self._pending:
+            self._exhausted = True
+        return bool(self._pending)
+
+    def close(self) -> None:
+        """Close the underlying cursor."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._cursor.close()
+        except Exception as e:
+            logger.warning(f"Error closing result stream cursor: {e}")
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+
+
+class ResultStreamRegistry:
+    """Keeps partially consumed result streams open between paginated requests.
+
+    Streams are addressed by an opaque continuation token. Streams that are not
+    continued within ``ttl`` seconds, or that are evicted because too many
+    streams are open, are closed to release their cursors. A parked stream
+    holds a pooled connection, so fewer streams than the pool size are parked
+    per pool, and a background thread closes expired streams while any are
+    parked.
+    """
+
+    def __init__(
+        self,
+        ttl: float = RESULT_STREAM_TTL,
+        max_streams: int = MAX_OPEN_RESULT_STREAMS,
+        sweep_interval: float = RESULT_STREAM_SWEEP_INTERVAL,
+    ) -> None:
+        self._ttl = ttl
+        self._max_streams = max_streams
+        self._sweep_interval = min(sweep_interval, ttl)
+        self._lock = threading.Lock()
+        self._streams: OrderedDict[str, tuple[SqlResultStream, float]] = OrderedDict()
+        self._sweeper: threading.Thread | None = None
+
+    def register(self, stream: SqlResultStream, token: str | None = None) -> str:
+        """Park a stream and return the continuation token to resume it."""
+        token = token or uuid.uuid4().hex
+        with self._lock:
+            self._streams[token] = (stream, time.monotonic())
+            self._streams.move_to_end(token)
+            evicted = self._evict_locked()
+            if self._streams and self._sweeper is None:
+                self._sweeper = threading.Thread(
+                    target=self._sweep, name="result-stream-sweeper", daemon=True
+                )
+                self._sweeper.start()
+
+        for stale in evicted:
+            stale.close()
+        return token
+
+    def pop(self, token: str) -> SqlResultStream | None:
+        """Take a parked stream out of the registry, or None if unknown/expired."""
+        with self._lock:
+            evicted = self._evict_locked()
+            entry = self._streams.pop(token, None)
+
+        for stale in evicted:
+            stale.close()
+        return entry[0] if entry else None
+
+    def close_all(self) -> None:
+        """Close every parked stream."""
+        with self._lock:
+            streams = [stream for stream, _ in self._streams.values()]
+            self._streams.clear()
+
+        for stream in streams:
+            stream.close()
+
+    def _sweep(self) -> None:
+        """Close expired streams in the background until no stream is parked."""
+        while True:
+            time.sleep(self._sweep_interval)
+            with self._lock:
+                evicted = self._evict_locked()
+                done = not self._streams
+                if done:
+                    self._sweeper = None
+
+            for stale in evicted:
+                stale.close()
+            if done:
+                return
+
+    def _evict_locked(self) -> list[SqlResultStream]:
+        """Remove expired and excess streams. Must be called with the lock held.
+
+        Streams are evicted oldest first, so the most recently parked streams
+        of a full pool or registry are kept.
+        """
+        now = time.monotonic()
+        per_pool = Counter(
+            stream.pool
+            for stream, _ in self._streams.values()
+            if stream.pool is not None
+        )
+        evicted = []
+        for token in list(self._streams):
+            stream, parked_at = self._streams[token]
+            pool = stream.pool
+            if (
+                now - parked_at > self._ttl
+                or len(self._streams) > self._max_streams
+                or (pool is not None and per_pool[pool] >= pool.max_size)
+            ):
+                del self._streams[token]
+                if pool is not None:
+                    per_pool[pool] -= 1
+                evicted.append(stream)
+        if evicted:
+            logger.info(f"Closed {len(evicted)} parked result stream(s)")
+        return evicted
+
+
+# Global registry of result streams awaiting continuation
+result_stream_registry = ResultStreamRegistry()
@@ -1,11 +1,37 @@
+import json
+import logging
+import time
 from typing import Any
 
+import pyarrow as pa
 import snowflake.connector
+from snowflake.connector import SnowflakeConnection as SnowflakeConnector
+from snowflake.connector.constants import QueryStatus
+from snowflake.connector.errors import NotSupportedError
 
 from .connection import Connection
+from .preflight import CostEstimate
+from .query_jobs import RunningQuery
+from .utils import get_leading_keyword
+
+logger = logging.getLogger(__name__)
+
+# Bounds of the exponential backoff between query status polls, in seconds
+MIN_STATUS_POLL_INTERVAL = 0.05
+MAX_STATUS_POLL_INTERVAL = 1.0
+
+# Statuses of a query that waits for warehouse capacity rather than executing
+QUEUED_STATUSES = (
+    QueryStatus.QUEUED,
+    QueryStatus.QUEUED_REPARING_WAREHOUSE,
+    QueryStatus.RESUMING_WAREHOUSE,
+    QueryStatus.BLOCKED,
+)
 
 
 class SnowflakeConnection(Connection):
+    sql_dialect = "snowflake"
+
     def __init__(
         self,
         secrets: dict[str, str],
@@ -33,9 +59,9 @@ class SnowflakeConnection(Connection):
         self.warehouse = secrets["SNOWFLAKE_WAREHOUSE"]
         self.role = secrets["SNOWFLAKE_ROLE"]
 
-    def _init_connection(self) -> None:
-        """Initialize the Snowflake connection using keypair authentication"""
-        self._conn = snowflake.connector.connect(
+    def _create_connection(self) -> SnowflakeConnector:
+        """Open a Snowflake connection using keypair authentication"""
+        return snowflake.connector.connect(
             user=self.user,
             private_key=self.private_key,
             account=self.account,
@@ -45,6 +71,86 @@ class SnowflakeConnection(Connection):
             role=self.role,
         )
 
+    def _is_alive(self, conn: SnowflakeConnector) -> bool:
+        """Check that the session has not been closed before pinging it."""
+        return not conn.is_closed() and super()._is_alive(conn)
+
+    def _execute_statement(
+        self, cursor: Any, sql_statement: str, query: RunningQuery | None
+    ) -> None:
+        """
+        Submit the statement asynchronously and load its result by query id.
+
+        The statement is submitted with ``execute_async`` and polled until it
+        finishes, tracking how long it was queued and how long it executed.
+        Repeated statements are answered by Snowflake's own result cache,
+        which knows when the underlying tables have changed.
+        """
+        if get_leading_keyword(sql_statement) in ("PUT", "GET"):
+            # File transfers are not supported by execute_async
+            cursor.execute(sql_statement)
+            return
+
+        cursor.execute_async(sql_statement)
+        self._wait_for_query(cursor.connection, cursor.sfqid)
+        cursor.get_results_from_sfqid(cursor.sfqid)
+
+    def _wait_for_query(self, conn: SnowflakeConnector, sfqid: str) -> None:
+        """Poll the status of a submitted query until it is no longer running."""
+        started = time.monotonic()
+        queued = 0.0
+        interval = MIN_STATUS_POLL_INTERVAL
+        last_poll = started
+        status = conn.get_query_status(sfqid)
+
+        while conn.is_still_running(status):
+            time.sleep(interval)
+            interval = min(interval * 2, MAX_STATUS_POLL_INTERVAL)
+
+            now = time.monotonic()
+            if status in QUEUED_STATUSES:
+                queued += now - last_poll
+            last_poll = now
+            status = conn.get_query_status(sfqid)
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"Snowflake query {sfqid} finished with status {status.name} after "
+            f"{elapsed:.2f}s: queued {queued:.2f}s, executing {elapsed - queued:.2f}s"
+        )
+
+    def _cancel_query(
+        self, query: RunningQuery, conn: SnowflakeConnector, cursor: Any
+    ) -> None:
+        """
+        Cancel the running statement with SYSTEM$CANCEL_QUERY.
+
+        The query id is only known once Snowflake has accepted the statement,
+        so before that all queries of the (otherwise idle) session are cancelled.
+        """
+        if cursor.sfqid:
+            self._run_control_statement(f"SELECT SYSTEM$CANCEL_QUERY('{cursor.sfqid}')")
+        else:
+            self._run_control_statement(
+                f"SELECT SYSTEM$CANCEL_ALL_QUERIES({conn.session_id})"
+            )
+
+    def _fetch_arrow(self, cursor: Any) -> pa.Table:
+        """Fetch the result set through the connector's native Arrow path."""
+        try:
+            return cursor.fetch_arrow_all(force_return_table=True)
+        except NotSupportedError:
+            # Metadata commands (SHOW, DESCRIBE, ...) return JSON result sets
+            return super()._fetch_arrow(cursor)
+
+    def estimate_cost(self, sql_statement: str) -> CostEstimate:
+        """Estimate the bytes read by a query from the partitions its plan assigns."""
+        plan = json.loads(self._fetch_rows(f"EXPLAIN USING JSON {sql_statement}")[0][0])
+        return CostEstimate(
+            method="explain",
+            bytes_scanned=plan["GlobalStats"]["bytesAssigned"],
+        )
+
     def cleanup(self) -> None:
         """Clean up any resources used by the connection"""
         self.close()
@@ -1,6 +1,74 @@
 from __future__ import annotations
 
+import base64
+import io
+import logging
+import os
+import re
+import uuid
 from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from sqlglot import exp
+
+# sqlglot warns about every statement it can only parse as a generic command,
+# which are then classified with the regular expressions below
+logging.getLogger("sqlglot").setLevel(logging.ERROR)
+
+_SQL_COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+# Quoted strings/identifiers, comments and whitespace runs of a SQL statement
+_SQL_TOKEN_PATTERN = re.compile(
+    r"(?P<quoted>'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`)"
+    r"|(?P<comment>--[^\n]*|/\*.*?\*/)"
+    r"|(?P<space>\s+)",
+    re.DOTALL,
+)
+
+# Statements that only read data, by their leading keyword
+READ_ONLY_KEYWORDS = {
+    "SELECT",
+    "WITH",
+    "SHOW",
+    "DESCRIBE",
+    "DESC",
+    "EXPLAIN",
+    "VALUES",
+    "TABLE",
+}
+
+# Keywords that make an otherwise read-only looking statement write data,
+# e.g. ``WITH ... DELETE`` on Postgres or ``SELECT ... INTO``. Only used for
+# statements that sqlglot cannot parse.
+_WRITE_KEYWORD_PATTERN = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|UPSERT|CREATE|DROP|ALTER|TRUNCATE"
+    r"|GRANT|REVOKE|COPY|CALL|EXEC|EXECUTE|INTO|SET|USE|LOCK|ANALYZE)\b",
+    re.IGNORECASE,
+)
+
+# Clauses that already bound the rows returned by a query
+_ROW_LIMIT_PATTERN = re.compile(r"\b(LIMIT|TOP|FETCH\s+(FIRST|NEXT))\b", re.IGNORECASE)
+
+# Trailing clauses after which a LIMIT cannot simply be appended
+_TRAILING_CLAUSE_PATTERN = re.compile(r"\b(FOR|SETTINGS|FORMAT)\b", re.IGNORECASE)
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+class ResultFormat(str, Enum):
+    """Wire format used to return the rows of a SQL result."""
+
+    JSON = "json"
+    ARROW = "arrow"
+    PARQUET = "parquet"
 
 
 @dataclass
@@ -11,6 +79,7 @@ class SqlExecutionResult:
     data: list[dict]
     rows_affected: int
     error: str | None = None
+    table: pa.Table | None = None
 
     @staticmethod
     def success_result(
@@ -25,6 +94,17 @@ class SqlExecutionResult:
             error=None,
         )
 
+    @staticmethod
+    def arrow_result(table: pa.Table) -> SqlExecutionResult:
+        """Create a successful result holding a columnar Arrow table."""
+        return SqlExecutionResult(
+            success=True,
+            data=[],
+            rows_affected=table.num_rows,
+            error=None,
+            table=table,
+        )
+
     @staticmethod
     def error_result(error_message: str) -> SqlExecutionResult:
         """Create an error result."""
@@ -34,3 +114,333 @@ class SqlExecutionResult:
             rows_affected=0,
             error=error_message,
         )
+
+
+def _to_arrow_array(values: Sequence[Any]) -> pa.Array:
+    """Build an Arrow array from a column of Python values.
+
+    Columns whose values Arrow cannot infer a single type for (e.g. mixed
+    types from a VARIANT column) fall back to their string representation.
+    """
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if v is None else str(v) for v in values])
+
+
+def rows_to_arrow(column_names: list[str], rows: Sequence[Sequence[Any]]) -> pa.Table:
+    """Convert DB-API rows into an Arrow table without building per-row dicts.
+
+    Args:
+        column_names: The column names from the cursor description.
+        rows: The rows returned by the cursor.
+
+    Returns:
+        An Arrow table with one column per entry in ``column_names``.
+    """
+    columns = list(zip(*rows)) if rows else [() for _ in column_names]
+    return pa.Table.from_arrays(
+        [_to_arrow_array(column) for column in columns], names=column_names
+    )
+
+
+def arrow_column_to_json(column: pa.ChunkedArray | pa.Array) -> list[Any]:
+    """Convert an Arrow column to a list of JSON-safe Python values.
+
+    The conversion runs one Arrow compute kernel per column instead of
+    converting value by value: decimals become strings to keep their
+    precision, dates, times and timestamps become ISO 8601 strings, binary
+    values are base64 encoded and NaN/infinite floats become nulls.
+    """
+    data_type = column.type
+    try:
+        if pa.types.is_floating(data_type):
+            column = pc.if_else(
+                pc.is_finite(column), column, pa.scalar(None, data_type)
+            )
+        elif (
+            pa.types.is_decimal(data_type)
+            or pa.types.is_date(data_type)
+            or pa.types.is_time(data_type)
+        ):
+            column = column.cast(pa.string())
+        elif pa.types.is_timestamp(data_type):
+            # Casting is much faster than pc.strftime and only differs from
+            # ISO 8601 in the date/time separator
+            column = pc.replace_substring(
+                column.cast(pa.string()), " ", "T", max_replacements=1
+            )
+        elif (
+            pa.types.is_binary(data_type)
+            or pa.types.is_large_binary(data_type)
+            or pa.types.is_fixed_size_binary(data_type)
+        ):
+            return [
+                None if value is None else base64.b64encode(value).decode("ascii")
+                for value in column.to_pylist()
+            ]
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # e.g. a time zone missing from the tz database; values are then
+        # serialized one by one
+        pass
+
+    return column.to_pylist()
+
+
+def table_to_json_rows(table: pa.Table) -> list[tuple]:
+    """Convert an Arrow table to rows of JSON-safe values, column by column."""
+    columns = [arrow_column_to_json(column) for column in table.columns]
+    if not columns:
+        return []
+    return list(zip(*columns))
+
+
+def serialize_arrow_table(table: pa.Table, result_format: ResultFormat) -> bytes:
+    """Serialize an Arrow table to Arrow IPC stream or Parquet bytes.
+
+    Args:
+        table: The table to serialize.
+        result_format: Either ``ResultFormat.ARROW`` or ``ResultFormat.PARQUET``.
+
+    Returns:
+        The serialized table.
+    """
+    if result_format == ResultFormat.ARROW:
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    if result_format == ResultFormat.PARQUET:
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer)
+        return buffer.getvalue()
+
+    raise ValueError(f"Cannot serialize an Arrow table as '{result_format.value}'")
+
+
+def write_arrow_table(table: pa.Table, path: Path, result_format: ResultFormat) -> int:
+    """Write an Arrow table to a file, atomically replacing any existing file.
+
+    Arrow results are written in the IPC file format, which unlike the stream
+    format can be memory-mapped and read without copying.
+
+    Args:
+        table: The table to write.
+        path: The destination file.
+        result_format: Either ``ResultFormat.ARROW`` or ``ResultFormat.PARQUET``.
+
+    Returns:
+        The size of the written file in bytes.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        if result_format == ResultFormat.ARROW:
+            with (
+                pa.OSFile(str(tmp_path), "wb") as sink,
+                pa.ipc.new_file(sink, table.schema) as writer,
+            ):
+                writer.write_table(table)
+        elif result_format == ResultFormat.PARQUET:
+            pq.write_table(table, tmp_path)
+        else:
+            raise ValueError(f"Cannot write an Arrow table as '{result_format.value}'")
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return path.stat().st_size
+
+
+def get_media_type(result_format: ResultFormat) -> str:
+    """Get the HTTP media type for a binary result format."""
+    if result_format == ResultFormat.PARQUET:
+        return PARQUET_MEDIA_TYPE
+    return ARROW_STREAM_MEDIA_TYPE
+
+
+def get_leading_keyword(sql_statement: str) -> str:
+    """Get the upper-cased first keyword of a SQL statement, ignoring comments."""
+    stripped = _SQL_COMMENT_PATTERN.sub(" ", sql_statement).lstrip(" \t\r\n(")
+    match = re.match(r"[A-Za-z]+", stripped)
+    return match.group(0).upper() if match else ""
+
+
+def quote_sql_literal(value: str) -> str:
+    """Quote a value as a single-quoted SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def normalize_sql(sql_statement: str) -> str:
+    """Normalize a SQL statement for use as a cache key.
+
+    Comments are removed, runs of whitespace outside quoted strings and
+    identifiers are collapsed to a single space and trailing semicolons are
+    dropped. The statement is not otherwise rewritten, so keyword case and
+    literal values are significant.
+    """
+
+    def replace(match: re.Match) -> str:
+        if match.lastgroup == "quoted":
+            return match.group(0)
+        return " "
+
+    normalized = _SQL_TOKEN_PATTERN.sub(replace, sql_statement)
+    normalized = re.sub(r" {2,}", " ", normalized)
+    return normalized.strip().rstrip(";").strip()
+
+
+def _parse_sql(sql_statement: str, dialect: str | None) -> list[exp.Expression] | None:
+    """Parse a SQL batch with sqlglot.
+
+    Returns:
+        The parsed statements, or None if the batch cannot be parsed or
+        contains a statement sqlglot only parses as a generic command.
+    """
+    # Imported on first use to keep it out of the sandbox startup
+    import sqlglot
+    from sqlglot import exp
+    from sqlglot.errors import SqlglotError
+
+    try:
+        statements = [
+            statement
+            for statement in sqlglot.parse(sql_statement, read=dialect)
+            if statement is not None
+        ]
+    except SqlglotError:
+        return None
+    if any(isinstance(statement, exp.Command) for statement in statements):
+        return None
+    return statements
+
+
+def _is_read_only_statement(statement: exp.Expression) -> bool:
+    """Check whether a parsed statement and all its subqueries only read data."""
+    from sqlglot import exp
+
+    if not isinstance(statement, (exp.Query, exp.Values, exp.Show, exp.Describe)):
+        return False
+    write_nodes = statement.find(
+        exp.DML,
+        exp.DDL,
+        exp.Drop,
+        exp.Alter,
+        exp.TruncateTable,
+        exp.Into,
+        exp.Lock,
+        exp.Set,
+        exp.Use,
+        exp.Analyze,
+        exp.Grant,
+        exp.Revoke,
+    )
+    return write_nodes is None
+
+
+def _is_read_only_sql_fallback(sql_statement: str) -> bool:
+    """Check with regular expressions whether a SQL statement only reads data."""
+    if get_leading_keyword(sql_statement) not in READ_ONLY_KEYWORDS:
+        return False
+
+    unquoted = _SQL_TOKEN_PATTERN.sub(
+        lambda match: "''" if match.lastgroup == "quoted" else " ", sql_statement
+    )
+    unquoted = unquoted.strip().rstrip(";")
+    if ";" in unquoted:
+        return False
+    return _WRITE_KEYWORD_PATTERN.search(unquoted) is None
+
+
+def _is_plain_select_fallback(sql_statement: str) -> bool:
+    """Check with regular expressions whether a SQL statement is a plain SELECT."""
+    return get_leading_keyword(sql_statement) in ("SELECT", "WITH") and (
+        _is_read_only_sql_fallback(sql_statement)
+    )
+
+
+def is_read_only_sql(sql_statement: str, dialect: str | None = None) -> bool:
+    """Conservatively check whether a SQL statement only reads data.
+
+    The statement is parsed with sqlglot in the given dialect. Multi-statement
+    batches and statements with a write anywhere in their tree (e.g. a
+    data-modifying CTE or ``SELECT ... INTO``) are never considered read-only.
+    Statements sqlglot cannot parse are checked with regular expressions
+    instead.
+    """
+    statements = _parse_sql(sql_statement, dialect)
+    if statements is None:
+        return _is_read_only_sql_fallback(sql_statement)
+    return len(statements) == 1 and _is_read_only_statement(statements[0])
+
+
+def is_plain_select(sql_statement: str, dialect: str | None = None) -> bool:
+    """Check whether a SQL statement is a single read-only query (SELECT or WITH)."""
+    from sqlglot import exp
+
+    statements = _parse_sql(sql_statement, dialect)
+    if statements is None:
+        return _is_plain_select_fallback(sql_statement)
+    return (
+        len(statements) == 1
+        and isinstance(statements[0], exp.Query)
+        and _is_read_only_statement(statements[0])
+    )
+
+
+def add_row_limit(
+    sql_statement: str, limit: int, dialect: str | None = None
+) -> str | None:
+    """Add a LIMIT to a plain SELECT query that does not bound its rows yet.
+
+    The statement is parsed with sqlglot in the given dialect and the LIMIT is
+    added to its outermost query, so a LIMIT in a subquery or CTE does not
+    prevent the outer query from being limited. Statements sqlglot cannot
+    parse only get a LIMIT appended if no clause would follow it.
+
+    Returns:
+        The limited statement, or None if the statement is not a plain SELECT,
+        already has a row limit or cannot be limited safely.
+    """
+    from sqlglot import exp
+
+    statements = _parse_sql(sql_statement, dialect)
+    if statements is None:
+        return _add_row_limit_fallback(sql_statement, limit)
+    if len(statements) != 1:
+        return None
+
+    statement = statements[0]
+    if not isinstance(statement, exp.Query) or not _is_read_only_statement(statement):
+        return None
+    if statement.args.get("limit") is not None:
+        return None
+    return statement.limit(limit, copy=False).sql(dialect=dialect)
+
+
+def _add_row_limit_fallback(sql_statement: str, limit: int) -> str | None:
+    """Append a LIMIT to a plain SELECT query with regular expressions."""
+    if not _is_plain_select_fallback(sql_statement):
+        return None
+
+    unquoted = _SQL_TOKEN_PATTERN.sub(
+        lambda match: "''" if match.lastgroup == "quoted" else " ", sql_statement
+    )
+    depth = 0
+    top_level = []
+    for char in unquoted:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            top_level.append(char)
+
+    outer_query = "".join(top_level)
+    if _ROW_LIMIT_PATTERN.search(outer_query) or _TRAILING_CLAUSE_PATTERN.search(
+        outer_query
+    ):
+        return None
+    return f"{normalize_sql(sql_statement)} LIMIT {limit}"
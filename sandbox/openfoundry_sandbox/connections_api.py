@@ -1,9 +1,15 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+import logging
+from dataclasses import asdict
 
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel, Field
+
+from openfoundry_sandbox.connections.catalog import SearchKind, catalog_manager
 from openfoundry_sandbox.connections.connection import Connection
 from openfoundry_sandbox.connections.connection_manager import connection_manager
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/connections", tags=["connections"])
 
 
@@ -14,6 +20,61 @@ class ConnectionInfo(BaseModel):
     type: str
 
 
+class ConnectionPoolStats(BaseModel):
+    """Statistics of the DB-API connection pool behind a connection."""
+
+    name: str
+    max_size: int
+    size: int
+    in_use: int
+    idle: int
+    waiting: int
+    created: int
+    reused: int
+    discarded: int
+    failed_validations: int
+    timeouts: int
+
+
+class CatalogColumnInfo(BaseModel):
+    name: str
+    data_type: str
+    position: int
+
+
+class CatalogTableInfo(BaseModel):
+    schema_name: str = Field(alias="schema")
+    name: str
+    table_type: str
+    last_altered: str | None = None
+    columns: list[CatalogColumnInfo]
+
+
+class CatalogResponse(BaseModel):
+    connection_name: str
+    refreshed_at: float | None
+    tables: list[CatalogTableInfo]
+
+
+class CatalogRefreshResponse(BaseModel):
+    connection_name: str
+    tables: int
+    added: int
+    updated: int
+    removed: int
+    duration_seconds: float
+
+
+class CatalogMatchInfo(BaseModel):
+    kind: str
+    schema_name: str = Field(alias="schema")
+    table: str
+    score: float
+    column: str | None = None
+    data_type: str | None = None
+    table_type: str | None = None
+
+
 @router.get("/", response_model=list[ConnectionInfo])
 def list_connections():
     """
@@ -37,6 +98,109 @@ def list_connections():
     return connections_info
 
 
+@router.get("/stats", response_model=list[ConnectionPoolStats])
+def get_connection_pool_stats():
+    """
+    Get the connection pool statistics of each initialized connection.
+    """
+    return [
+        ConnectionPoolStats(name=name, **stats.to_dict())
+        for name, stats in connection_manager.get_pool_stats().items()
+    ]
+
+
+@router.get("/{connection_name}/catalog", response_model=CatalogResponse)
+def get_catalog(
+    connection_name: str,
+    schema: str | None = Query(None, description="Only return tables of this schema"),
+    table: str | None = Query(None, description="Only return this table"),
+):
+    """
+    Get the schemas, tables and columns of a connection.
+
+    The catalog is served from an index persisted under the workspace and is
+    refreshed incrementally once it is older than the refresh interval.
+    """
+    index = _get_catalog_index(connection_name)
+    tables = [
+        CatalogTableInfo(**asdict(t))
+        for t in sorted(index.tables.values(), key=lambda t: (t.schema, t.name))
+        if (schema is None or t.schema.lower() == schema.lower())
+        and (table is None or t.name.lower() == table.lower())
+    ]
+    return CatalogResponse(
+        connection_name=connection_name,
+        refreshed_at=index.refreshed_at,
+        tables=tables,
+    )
+
+
+@router.post(
+    "/{connection_name}/catalog/refresh", response_model=CatalogRefreshResponse
+)
+def refresh_catalog(
+    connection_name: str,
+    full: bool = Query(False, description="Refetch the columns of every table"),
+):
+    """
+    Refresh the catalog of a connection.
+
+    By default only the columns of tables whose last-altered time changed
+    are refetched.
+    """
+    connection = _get_connection_or_404(connection_name)
+    try:
+        summary = catalog_manager.refresh(connection_name, connection, full=full)
+    except Exception as e:
+        logger.error(f"Failed to refresh catalog of '{connection_name}': {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+    return CatalogRefreshResponse(connection_name=connection_name, **asdict(summary))
+
+
+@router.get("/{connection_name}/catalog/search", response_model=list[CatalogMatchInfo])
+def search_catalog(
+    connection_name: str,
+    q: str = Query(..., min_length=1, description="Table or column name to look up"),
+    kind: SearchKind = Query("all", description="Search tables, columns or both"),
+    limit: int = Query(20, gt=0, le=200),
+):
+    """
+    Search the tables and columns of a connection by name.
+
+    Matches are ranked exact, prefix, substring and then fuzzy matches.
+    """
+    index = _get_catalog_index(connection_name)
+    return [
+        CatalogMatchInfo(**asdict(match))
+        for match in index.search(q, kind=kind, limit=limit)
+    ]
+
+
+def _get_connection_or_404(connection_name: str) -> Connection:
+    """Look up a connection, raising a 404 if it does not exist."""
+    connection = connection_manager.get_connection(connection_name)
+    if connection is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Connection '{connection_name}' not found. Available connections: {connection_manager.list_connections()}",
+        )
+    return connection
+
+
+def _get_catalog_index(connection_name: str):
+    """Get the catalog index of a connection, building it on first use."""
+    connection = _get_connection_or_404(connection_name)
+    try:
+        return catalog_manager.get_index(connection_name, connection)
+    except Exception as e:
+        logger.error(f"Failed to load catalog of '{connection_name}': {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
 def get_connection(connection_name: str) -> Connection | None:
     """
     Helper function to get a connection by name for use in other modules.
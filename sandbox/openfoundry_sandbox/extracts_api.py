@@ -0,0 +1,203 @@
+import logging
+from dataclasses import asdict
+
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel, Field, model_validator
+
+from openfoundry_sandbox.connections.connection import Connection
+from openfoundry_sandbox.connections.connection_manager import connection_manager
+from openfoundry_sandbox.connections.extracts import (
+    LOCAL_CONNECTION_NAME,
+    extract_manager,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/extracts", tags=["extracts"])
+
+
+# --- Pydantic Models ---
+
+
+class CreateExtractRequest(BaseModel):
+    name: str = Field(
+        ...,
+        description="Name of the extract, queried as a table on the local connection",
+    )
+    connection_name: str
+    table: str | None = Field(
+        None, description="Qualified name of the table to extract"
+    )
+    sql_statement: str | None = Field(
+        None, description="Query whose result is extracted, instead of a table"
+    )
+    watermark_column: str | None = Field(
+        None,
+        description="Column that increases for new or updated rows (e.g. an id or an updated_at timestamp). Enables incremental refreshes.",
+    )
+    key_columns: list[str] = Field(
+        default_factory=list,
+        description="Columns identifying a row, so rows updated at the source replace their previous version on incremental refreshes",
+    )
+
+    @model_validator(mode="after")
+    def check_source(self) -> "CreateExtractRequest":
+        if (self.table is None) == (self.sql_statement is None):
+            raise ValueError("Exactly one of 'table' and 'sql_statement' is required")
+        if self.key_columns and self.watermark_column is None:
+            raise ValueError("'key_columns' requires a 'watermark_column'")
+        return self
+
+
+class ExtractInfo(BaseModel):
+    name: str
+    connection_name: str
+    sql_statement: str
+    watermark_column: str | None
+    key_columns: list[str]
+    watermark: str | None
+    row_count: int
+    size_bytes: int
+    created_at: float
+    refreshed_at: float | None
+    local_connection_name: str = LOCAL_CONNECTION_NAME
+    data_glob: str = Field(
+        ..., description="Glob of the Parquet files holding the rows of the extract"
+    )
+
+
+class ExtractRefreshResponse(BaseModel):
+    name: str
+    incremental: bool
+    rows_loaded: int
+    row_count: int
+    duration_seconds: float
+
+
+class DeleteExtractResponse(BaseModel):
+    name: str
+    deleted: bool
+
+
+# --- Helper Functions ---
+
+
+def _get_connection_or_404(connection_name: str) -> Connection:
+    """Look up a source connection, raising a 404 if it does not exist."""
+    connection = connection_manager.get_connection(connection_name)
+    if connection is None or connection_name == LOCAL_CONNECTION_NAME:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Connection '{connection_name}' not found. Available connections: {connection_manager.list_connections()}",
+        )
+    return connection
+
+
+def _get_extract_info(name: str) -> ExtractInfo:
+    """Look up an extract, raising a 404 if it does not exist."""
+    extract = extract_manager.get_extract(name)
+    if extract is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Extract '{name}' not found",
+        )
+    return ExtractInfo(
+        **asdict(extract), data_glob=extract_manager.get_data_glob(extract.name)
+    )
+
+
+# --- API Endpoints ---
+
+
+@router.post("/", response_model=ExtractRefreshResponse)
+def create_extract(request: CreateExtractRequest):
+    """
+    Snapshot a remote table or query into a local Parquet extract.
+
+    The extract is loaded in full and can then be queried on the ``local``
+    connection as a table named after it, or read directly from its Parquet
+    files. Queries sent with ``prefer_extract`` that match the extracted query
+    are served from the extract.
+    """
+    logger.info(
+        f"Received create extract request: name='{request.name}', connection_name='{request.connection_name}'"
+    )
+    connection = _get_connection_or_404(request.connection_name)
+    sql_statement = request.sql_statement or f"SELECT * FROM {request.table}"
+
+    try:
+        summary = extract_manager.create_extract(
+            request.name,
+            request.connection_name,
+            connection,
+            sql_statement,
+            watermark_column=request.watermark_column,
+            key_columns=request.key_columns,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to create extract '{request.name}': {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+    connection_manager.ensure_local_connection()
+    return ExtractRefreshResponse(**asdict(summary))
+
+
+@router.get("/", response_model=list[ExtractInfo])
+def list_extracts():
+    """
+    List the local extracts.
+    """
+    return [
+        _get_extract_info(extract.name) for extract in extract_manager.list_extracts()
+    ]
+
+
+@router.get("/{name}", response_model=ExtractInfo)
+def get_extract(name: str):
+    """
+    Get an extract with its watermark and size.
+    """
+    return _get_extract_info(name)
+
+
+@router.post("/{name}/refresh", response_model=ExtractRefreshResponse)
+def refresh_extract(
+    name: str,
+    full: bool = Query(False, description="Reload every row instead of new ones"),
+):
+    """
+    Refresh an extract from its source connection.
+
+    Extracts with a watermark column only load rows above the highest
+    watermark loaded so far. Other extracts are reloaded in full.
+    """
+    extract = _get_extract_info(name)
+    connection = _get_connection_or_404(extract.connection_name)
+    try:
+        summary = extract_manager.refresh_extract(name, connection, full=full)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Extract '{name}' not found"
+        )
+    except Exception as e:
+        logger.error(f"Failed to refresh extract '{name}': {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+    return ExtractRefreshResponse(**asdict(summary))
+
+
+@router.delete("/{name}", response_model=DeleteExtractResponse)
+def delete_extract(name: str):
+    """
+    Delete an extract and its Parquet files.
+    """
+    if not extract_manager.delete_extract(name):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Extract '{name}' not found"
+        )
+    return DeleteExtractResponse(name=name, deleted=True)
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import NamedTuple
+
+from jupyter_client.asynchronous import AsyncKernelClient
+from jupyter_client.manager import AsyncKernelManager
+
+from openfoundry_sandbox.config import KERNEL_POOL_SIZE, KERNEL_PRELOAD_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+KERNEL_NAME = "python3"
+
+KERNEL_START_TIMEOUT = 10.0  # seconds to wait for kernel start
+
+PRELOAD_TIMEOUT = 120.0  # seconds to wait for the preload script
+
+# Keep the IPython history in memory like nbclient does, so kernels do not
+# contend for the history database
+KERNEL_ARGUMENTS = ["--HistoryManager.hist_file=:memory:"]
+
+
+class WarmKernel(NamedTuple):
+    """A started kernel with a connected client."""
+
+    km: AsyncKernelManager
+    kc: AsyncKernelClient
+
+    async def shutdown(self) -> None:
+        """Disconnect the client and stop the kernel."""
+        self.kc.stop_channels()
+        await self.km.shutdown_kernel(now=True)
+
+
+class KernelPool:
+    """
+    Keeps spare notebook kernels started and preloaded.
+
+    Starting a kernel and importing pandas, numpy and the connection drivers
+    takes seconds. Spare kernels are prepared in the background, so a new or
+    restarted notebook kernel is taken from the pool immediately and the pool
+    is refilled behind it. A kernel started on demand because no spare is
+    available is handed out without waiting for its preload script, which
+    the kernel runs before the first cell.
+    """
+
+    def __init__(
+        self,
+        size: int = KERNEL_POOL_SIZE,
+        preload_script: Path | None = KERNEL_PRELOAD_SCRIPT,
+        cwd: str | None = None,
+    ) -> None:
+        self._size = size
+        self._preload_script = preload_script
+        self._cwd = cwd
+        self._spares: list[asyncio.Task[WarmKernel]] = []
+
+    @property
+    def ready_count(self) -> int:
+        """Number of spare kernels ready to be used."""
+        return sum(
+            1
+            for task in self._spares
+            if task.done() and not task.cancelled() and task.exception() is None
+        )
+
+    def fill(self) -> None:
+        """Start spare kernels in the background until the pool is full."""
+        # Spares that failed to start are replaced
+        self._spares = [
+            task
+            for task in self._spares
+            if not task.done() or (not task.cancelled() and task.exception() is None)
+        ]
+        while len(self._spares) < self._size:
+            self._spares.append(asyncio.create_task(self._start_kernel(preload=True)))
+
+    async def acquire(self) -> WarmKernel:
+        """
+        Take a kernel from the pool, starting one if no spare is available.
+
+        Spares that are ready are preferred over those still starting.
+        """
+        self._spares.sort(key=lambda task: not task.done())
+        try:
+            while self._spares:
+                task = self._spares.pop(0)
+                try:
+                    return await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    # The spare keeps starting for the next caller
+                    self._spares.append(task)
+                    raise
+                except Exception as e:
+                    logger.warning(f"Discarding spare kernel that failed to start: {e}")
+            return await self._start_kernel(preload=False)
+        finally:
+            self.fill()
+
+    async def shutdown(self) -> None:
+        """Stop all spare kernels."""
+        spares, self._spares = self._spares, []
+        for task in spares:
+            if not task.done():
+                task.cancel()
+        for result in await asyncio.gather(*spares, return_exceptions=True):
+            if isinstance(result, WarmKernel):
+                await result.shutdown()
+        if spares:
+            logger.info(f"Stopped {len(spares)} spare kernels")
+
+    async def _start_kernel(self, preload: bool) -> WarmKernel:
+        """
+        Start a kernel, connect a client to it and send it the preload script.
+
+        With ``preload`` the kernel is only returned once the script has run,
+        otherwise as soon as the script has been sent.
+        """
+        km = AsyncKernelManager(kernel_name=KERNEL_NAME)
+        kc = None
+        try:
+            await asyncio.wait_for(
+                km.start_kernel(extra_arguments=KERNEL_ARGUMENTS, cwd=self._cwd),
+                timeout=KERNEL_START_TIMEOUT,
+            )
+            kc = km.client()
+            kc.start_channels()
+            await kc.wait_for_ready(timeout=KERNEL_START_TIMEOUT)
+            kc.allow_stdin = False
+            if preload:
+                await self._preload(km, kc)
+            else:
+                self._start_preload(kc)
+        except BaseException:
+            # Kernels that are not handed out would otherwise keep running
+            if kc is not None:
+                kc.stop_channels()
+            if km.has_kernel:
+                await km.shutdown_kernel(now=True)
+            raise
+        return WarmKernel(km=km, kc=kc)
+
+    def _read_preload_script(self) -> str | None:
+        """Read the preload script, or None if there is none to run."""
+        if self._preload_script is None:
+            return None
+        try:
+            return self._preload_script.read_text()
+        except OSError as e:
+            logger.warning(f"Not preloading kernel: {e}")
+            return None
+
+    def _start_preload(self, kc: AsyncKernelClient) -> None:
+        """
+        Send the preload script without waiting for it to finish.
+
+        The kernel runs requests in order, so cells sent afterwards run once
+        the imports are done. The script runs silently and its reply is
+        ignored by the notebook client, which only waits for its own requests.
+        """
+        code = self._read_preload_script()
+        if code is None:
+            return
+        kc.execute(code, silent=True, store_history=False, stop_on_error=False)
+        logger.info("Started preloading kernel in the background")
+
+    async def _preload(self, km: AsyncKernelManager, kc: AsyncKernelClient) -> None:
+        """Run the preload script, keeping the kernel if the script fails or times out."""
+        code = self._read_preload_script()
+        if code is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        # Not stored in the history, so the first cell is still cell 1. A
+        # failing or interrupted script must not abort the cells queued after it
+        try:
+            reply = await kc.execute_interactive(
+                code,
+                store_history=False,
+                stop_on_error=False,
+                timeout=PRELOAD_TIMEOUT,
+                output_hook=lambda msg: None,
+            )
+        except TimeoutError:
+            # Interrupted so the first cell does not wait for the script
+            logger.warning(
+                f"Kernel preload script did not finish within {PRELOAD_TIMEOUT}s"
+            )
+            await km.interrupt_kernel()
+            return
+        content = reply["content"]
+        if content["status"] != "ok":
+            logger.warning(
+                f"Kernel preload script failed: {content.get('ename')}: {content.get('evalue')}"
+            )
+        else:
+            logger.info(f"Preloaded kernel in {loop.time() - started_at:.2f}s")
@@ -0,0 +1,30 @@
+"""
+Preload script of notebook kernels.
+
+Run in every kernel of the pool before it is handed to a notebook, so the
+packages notebooks commonly use and the drivers behind the connection helpers
+are already imported when the first cell runs. Only the module cache is
+warmed: the notebook namespace is left untouched.
+"""
+
+import importlib
+
+for _module_name in [
+    "numpy",
+    "pandas",
+    "matplotlib.pyplot",
+    "seaborn",
+    "pyarrow",
+    "duckdb",
+    "snowflake.connector",
+    "databricks.sql",
+    "clickhouse_connect",
+    "psycopg2",
+    "google.cloud.bigquery",
+]:
+    try:
+        importlib.import_module(_module_name)
+    except ImportError:
+        pass
+
+del _module_name, importlib
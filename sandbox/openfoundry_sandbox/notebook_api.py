@@ -1,20 +1,27 @@
 import logging
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 from nbformat import write
 
 from openfoundry_sandbox.cell_executor import (
     CellExecutor,
+    CellMoveError,
     ExecutionEvent,
     KernelStatus,
+    hash_output,
 )
 from openfoundry_sandbox.config import get_notebook_path
 from openfoundry_sandbox.notebook_types import (
+    CellOutput,
+    CellOutputsResponse,
+    CellPositionResponse,
     DeleteCellResponse,
     ExecuteCodeRequest,
+    InsertCellRequest,
     KernelStatusResponse,
+    MoveCellRequest,
     StopExecutionRequest,
     StopExecutionResponse,
     TailCellsResult,
@@ -75,12 +82,41 @@ async def get_kernel_status():
         in [KernelStatus.STARTING, KernelStatus.INITIALIZING],
         is_initializing=current_status == KernelStatus.INITIALIZING,
         kernel_id=cell_executor.get_kernel_id(),
+        spare_kernels=cell_executor.get_spare_kernel_count(),
     )
 
 
+@router.post("/restart", response_model=KernelStatusResponse)
+async def restart_kernel():
+    """
+    Restart the kernel, clearing all variables and imports.
+
+    A spare kernel that was started and preloaded in the background replaces
+    the current one, so the restart does not wait for a kernel to start.
+    Executions still queued are cancelled.
+    """
+    logger.info("Restarting kernel")
+    try:
+        await cell_executor.restart_kernel()
+    except Exception as e:
+        logger.error(f"Failed to restart kernel: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to restart kernel: {e}",
+        )
+    return await get_kernel_status()
+
+
 @router.get("/notebook")
-async def get_notebook():
-    """Get the complete notebook data including all cells and their results."""
+async def get_notebook(inline: bool = False):
+    """Get the complete notebook data including all cells and their results.
+
+    Args:
+        inline: Read large output values back from the blob store instead of
+            returning references to them
+    """
+    if inline:
+        return await cell_executor.export_notebook()
     return await cell_executor.get_notebook()
 
 
@@ -136,8 +172,8 @@ async def save_notebook():
             detail="Notebook path not found in environment configuration",
         )
     logger.info(f"Saving notebook to {notebook_path}")
-    # Get the current notebook from cell executor
-    notebook = await cell_executor.get_notebook()
+    # Get the current notebook from cell executor, with large outputs inlined
+    notebook = await cell_executor.export_notebook()
 
     # Ensure parent directory exists
     parent_dir = Path(notebook_path).parent
@@ -186,7 +222,10 @@ async def delete_cell(cell_id: str):
     """Delete a cell from the notebook by its ID."""
     logger.info(f"Deleting cell with ID: {cell_id}")
 
-    success = cell_executor.delete_cell(cell_id)
+    try:
+        success = cell_executor.delete_cell(cell_id)
+    except CellMoveError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
     if success:
         message = f"Cell with ID '{cell_id}' deleted successfully"
@@ -198,6 +237,127 @@ async def delete_cell(cell_id: str):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
 
 
+@router.post("/cells", response_model=CellPositionResponse)
+async def insert_cell(request: InsertCellRequest):
+    """Insert a cell at a position in the notebook without executing it."""
+    logger.info(f"Inserting {request.cell_type} cell at index {request.index}")
+
+    try:
+        cell_with_index = cell_executor.insert_cell(
+            request.index,
+            source=request.source,
+            cell_id=request.cell_id,
+            cell_type=request.cell_type,
+        )
+    except CellMoveError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    cell_id = cell_with_index.cell.id
+    return CellPositionResponse(
+        success=True,
+        message=f"Cell with ID '{cell_id}' inserted at index {cell_with_index.index}",
+        cell_id=cell_id,
+        cell_index=cell_with_index.index,
+    )
+
+
+@router.post("/cells/{cell_id}/move", response_model=CellPositionResponse)
+async def move_cell(cell_id: str, request: MoveCellRequest):
+    """Move a cell to a new position in the notebook."""
+    logger.info(f"Moving cell with ID {cell_id} to index {request.index}")
+
+    try:
+        index = cell_executor.move_cell(cell_id, request.index)
+    except CellMoveError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    if index is None:
+        message = f"Cell with ID '{cell_id}' not found"
+        logger.warning(message)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+
+    return CellPositionResponse(
+        success=True,
+        message=f"Cell with ID '{cell_id}' moved to index {index}",
+        cell_id=cell_id,
+        cell_index=index,
+    )
+
+
+@router.get("/cells/{cell_id}/outputs", response_model=CellOutputsResponse)
+async def get_cell_outputs(
+    cell_id: str,
+    indices: list[int] | None = Query(
+        None, description="Indices of the outputs to get (all outputs if omitted)"
+    ),
+):
+    """
+    Get outputs of a cell by index.
+
+    ``completed`` events only list the hashes of the outputs that were already
+    streamed, so clients that missed ``output`` events (e.g. after
+    reconnecting mid-run) fetch the missing outputs here.
+    """
+    result = cell_executor.get_cell_outputs(cell_id, indices)
+    if result is None:
+        message = f"Cell with ID '{cell_id}' not found"
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+
+    output_count, outputs = result
+    return CellOutputsResponse(
+        cell_id=cell_id,
+        output_count=output_count,
+        outputs=[
+            CellOutput(output_index=i, output_hash=hash_output(output), output=output)
+            for i, output in outputs
+        ],
+    )
+
+
+@router.get("/blobs/{digest}")
+async def get_output_blob(
+    digest: str,
+    mime_type: str = Query(
+        "application/octet-stream", description="Mime type of the output value"
+    ),
+    if_none_match: str | None = Header(None),
+):
+    """
+    Get a large output value referenced from the notebook.
+
+    Blobs are named by the hash of their content and never change, so they are
+    served with their digest as ETag and may be cached indefinitely.
+    """
+    path = cell_executor.output_blobs.get_path(digest)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Blob '{digest}' not found",
+        )
+
+    headers = {
+        "ETag": f'"{digest}"',
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+    if if_none_match and f'"{digest}"' in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Text values (e.g. HTML tables) are never served as a renderable page
+    if mime_type == "application/json" or mime_type.endswith("+json"):
+        media_type = "application/json"
+    elif (
+        mime_type.startswith("text/")
+        or mime_type.endswith("+xml")
+        or "javascript" in mime_type
+    ):
+        media_type = "text/plain; charset=utf-8"
+    elif mime_type.startswith("image/"):
+        media_type = mime_type
+    else:
+        media_type = "application/octet-stream"
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
 # --- Lifecycle Management ---
 
 
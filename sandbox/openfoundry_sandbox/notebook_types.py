@@ -1,6 +1,6 @@
 """Notebook-related types and models for CellExecutor and API."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Literal
 
 from pydantic import BaseModel, Field
 
@@ -39,6 +39,9 @@ class KernelStatusResponse(BaseModel):
         ..., description="Whether the kernel is running initial auto-execution"
     )
     kernel_id: str | None = Field(None, description="Unique kernel identifier")
+    spare_kernels: int = Field(
+        0, description="Number of started kernels ready to replace the kernel"
+    )
 
 
 class ExecuteCodeRequest(BaseModel):
@@ -62,6 +65,54 @@ class DeleteCellResponse(BaseModel):
     cell_id: str = Field(..., description="ID of the cell that was deleted")
 
 
+class InsertCellRequest(BaseModel):
+    """Request model for inserting a cell without executing it."""
+
+    index: int = Field(
+        ..., ge=0, description="Position of the new cell; past the end appends it"
+    )
+    source: str = Field("", description="Source code/content of the cell")
+    cell_id: str | None = Field(
+        None, description="Unique identifier for the cell (generated if not provided)"
+    )
+    cell_type: Literal["code", "markdown"] = Field("code", description="Type of cell")
+
+
+class MoveCellRequest(BaseModel):
+    """Request model for moving a cell."""
+
+    index: int = Field(
+        ..., ge=0, description="New position of the cell; past the end moves it last"
+    )
+
+
+class CellPositionResponse(BaseModel):
+    """Response model for cell insertion and moves."""
+
+    success: bool = Field(..., description="Whether the operation was successful")
+    message: str = Field(..., description="Operation result message")
+    cell_id: str = Field(..., description="ID of the cell")
+    cell_index: int = Field(..., description="Index of the cell in the notebook")
+
+
+class CellOutput(BaseModel):
+    """A cell output with its index in the cell."""
+
+    output_index: int = Field(..., description="Index of the output in the cell")
+    output_hash: str = Field(
+        ..., description="Hash of the output, as listed in the completed event"
+    )
+    output: Dict[str, Any] = Field(..., description="The nbformat output")
+
+
+class CellOutputsResponse(BaseModel):
+    """Response model for fetching outputs of a cell by index."""
+
+    cell_id: str = Field(..., description="ID of the cell")
+    output_count: int = Field(..., description="Number of outputs of the cell")
+    outputs: List[CellOutput] = Field(..., description="The requested outputs")
+
+
 class StopExecutionRequest(BaseModel):
     """Request model for stopping cell execution."""
 
@@ -0,0 +1,254 @@
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from nbformat import NotebookNode
+
+from openfoundry_sandbox.config import OUTPUT_BLOBS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Mime values longer than this many characters are moved to the blob store
+SPOOL_THRESHOLD_CHARS = 64 * 1024
+
+# Output metadata key referencing the spooled mime values of an output
+BLOB_METADATA_KEY = "openfoundry_blobs"
+
+# Only rich outputs carry mime bundles and metadata
+SPOOLED_OUTPUT_TYPES = ("display_data", "execute_result")
+
+_DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobNotFoundError(Exception):
+    """Raised when a referenced blob is not in the store."""
+
+
+def _encode_value(mime_type: str, value: Any) -> tuple[bytes, str] | None:
+    """
+    Encode a mime value for the store, with the encoding to restore it.
+
+    Binary values (e.g. PNG plots) are stored decoded, so they can be served
+    as is. Returns None for values that cannot be restored exactly.
+    """
+    if mime_type == "application/json" or mime_type.endswith("+json"):
+        return json.dumps(value).encode(), "json"
+    if not isinstance(value, str):
+        return None
+    if not (
+        mime_type.startswith("text/")
+        or mime_type.endswith("+xml")
+        or "javascript" in mime_type
+    ):
+        try:
+            content = base64.b64decode(value, validate=True)
+        except (binascii.Error, ValueError):
+            content = None
+        if content is not None and base64.b64encode(content).decode() == value:
+            return content, "base64"
+    return value.encode(), "text"
+
+
+def _decode_value(content: bytes, encoding: str) -> Any:
+    """Restore a mime value encoded by ``_encode_value``."""
+    if encoding == "json":
+        return json.loads(content)
+    if encoding == "base64":
+        return base64.b64encode(content).decode()
+    return content.decode()
+
+
+def get_blob_references(output: NotebookNode) -> dict[str, dict[str, Any]]:
+    """Get the spooled mime values of an output, by mime type."""
+    return output.get("metadata", {}).get(BLOB_METADATA_KEY, {})
+
+
+class OutputBlobStore:
+    """
+    Content-addressed store for large notebook output values.
+
+    Plots, HTML tables and other large mime values are written to disk and
+    replaced in the notebook by a reference in the output metadata, so the
+    in-memory notebook stays small however many outputs it holds. Blobs are
+    named by the SHA-256 of their content: identical outputs are stored once
+    and a blob never changes, which lets clients cache them indefinitely.
+    """
+
+    def __init__(
+        self,
+        blobs_dir: Path = OUTPUT_BLOBS_DIR,
+        threshold_chars: int = SPOOL_THRESHOLD_CHARS,
+    ) -> None:
+        self._blobs_dir = blobs_dir
+        self._threshold_chars = threshold_chars
+
+    def get_path(self, digest: str) -> Path | None:
+        """Get the file of a blob, or None if it is not in the store."""
+        if not _DIGEST_PATTERN.match(digest):
+            return None
+        path = self._blob_path(digest)
+        return path if path.is_file() else None
+
+    def put(self, content: bytes) -> str:
+        """Store content and return its digest."""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Written under a temporary name so readers never see partial blobs
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                os.replace(temp_path, path)
+            except BaseException:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+        return digest
+
+    def read(self, digest: str) -> bytes:
+        """
+        Read the content of a blob.
+
+        Raises:
+            BlobNotFoundError: If the blob is not in the store.
+        """
+        path = self.get_path(digest)
+        if path is None:
+            raise BlobNotFoundError(f"Blob '{digest}' not found")
+        return path.read_bytes()
+
+    def spool_output(self, output: NotebookNode) -> int:
+        """
+        Move the large mime values of an output to the store.
+
+        The data and metadata of the output are replaced rather than modified,
+        so copies of the output taken before (e.g. for events) keep the values.
+        Values that cannot be written stay inline.
+
+        Returns:
+            The number of characters moved out of the output.
+        """
+        if output.get("output_type") not in SPOOLED_OUTPUT_TYPES:
+            return 0
+
+        data = output.get("data", {})
+        references = {}
+        spooled_chars = 0
+        for mime_type, value in data.items():
+            if mime_type in get_blob_references(output):
+                continue
+            size = len(value) if isinstance(value, str) else len(json.dumps(value))
+            if size <= self._threshold_chars:
+                continue
+            encoded = _encode_value(mime_type, value)
+            if encoded is None:
+                continue
+            content, encoding = encoded
+            try:
+                digest = self.put(content)
+            except OSError as e:
+                logger.warning(f"Keeping {mime_type} output inline: {e}")
+                continue
+            references[mime_type] = {
+                "digest": digest,
+                "encoding": encoding,
+                "size": len(content),
+            }
+            spooled_chars += size
+
+        if references:
+            metadata = dict(output.get("metadata", {}))
+            metadata[BLOB_METADATA_KEY] = {
+                **get_blob_references(output),
+                **references,
+            }
+            output["data"] = NotebookNode(
+                {
+                    mime_type: "" if mime_type in references else value
+                    for mime_type, value in data.items()
+                }
+            )
+            output["metadata"] = NotebookNode(metadata)
+        return spooled_chars
+
+    def inline_output(self, output: NotebookNode) -> NotebookNode:
+        """
+        Get an output with its spooled mime values read back from the store.
+
+        The output is returned unchanged if none of its values are spooled.
+        Values whose blob is missing keep their reference.
+        """
+        references = get_blob_references(output)
+        if not references:
+            return output
+
+        data = dict(output.get("data", {}))
+        remaining = {}
+        for mime_type, reference in references.items():
+            try:
+                content = self.read(reference["digest"])
+            except (BlobNotFoundError, OSError) as e:
+                logger.warning(f"Cannot inline {mime_type} output: {e}")
+                remaining[mime_type] = reference
+                continue
+            data[mime_type] = _decode_value(content, reference["encoding"])
+
+        metadata = dict(output.get("metadata", {}))
+        if remaining:
+            metadata[BLOB_METADATA_KEY] = remaining
+        else:
+            del metadata[BLOB_METADATA_KEY]
+        return NotebookNode(
+            {**output, "data": NotebookNode(data), "metadata": NotebookNode(metadata)}
+        )
+
+    def inline_notebook(self, notebook: NotebookNode) -> NotebookNode:
+        """Get a copy of a notebook with all spooled output values inlined."""
+        cells = []
+        for cell in notebook.cells:
+            if any(get_blob_references(output) for output in cell.get("outputs", [])):
+                cell = NotebookNode(
+                    {
+                        **cell,
+                        "outputs": [
+                            self.inline_output(output) for output in cell.outputs
+                        ],
+                    }
+                )
+            cells.append(cell)
+        return NotebookNode({**notebook, "cells": cells})
+
+    def prune(self, notebook: NotebookNode) -> int:
+        """
+        Delete the blobs no output of a notebook refers to.
+
+        Returns:
+            The number of deleted blobs.
+        """
+        if not self._blobs_dir.exists():
+            return 0
+
+        referenced = {
+            reference["digest"]
+            for cell in notebook.cells
+            for output in cell.get("outputs", [])
+            for reference in get_blob_references(output).values()
+        }
+        deleted = 0
+        for path in self._blobs_dir.glob("*/*"):
+            if path.name not in referenced:
+                path.unlink(missing_ok=True)
+                deleted += 1
+        return deleted
+
+    def _blob_path(self, digest: str) -> Path:
+        # Blobs are spread over subdirectories to keep directories small
+        return self._blobs_dir / digest[:2] / digest
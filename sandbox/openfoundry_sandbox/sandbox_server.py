@@ -6,10 +6,10 @@ import subprocess
 import time
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Literal
+from typing import Any, Callable, Literal
 
 from fastapi import FastAPI, HTTPException, Query, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from openhands_aci.editor import OHEditor
 from openhands_aci.editor.results import CLIResult
 from pdfminer.high_level import extract_text
@@ -18,8 +18,21 @@ from playwright.sync_api import sync_playwright
 from pydantic import BaseModel, Field
 
 from openfoundry_sandbox.config import WORKSPACE_DIR
+from openfoundry_sandbox.connections.connection import Connection
 from openfoundry_sandbox.connections.connection_manager import connection_manager
+from openfoundry_sandbox.connections.query_jobs import query_job_manager
+from openfoundry_sandbox.connections.result_cache import result_cache
+from openfoundry_sandbox.connections.result_stream import result_stream_registry
+from openfoundry_sandbox.connections.utils import (
+    ResultFormat,
+    SqlExecutionResult,
+    get_media_type,
+    serialize_arrow_table,
+    table_to_json_rows,
+    write_arrow_table,
+)
 from openfoundry_sandbox.connections_api import router as connections_api_router
+from openfoundry_sandbox.extracts_api import router as extracts_api_router
 from openfoundry_sandbox.files_api import router as files_api_router
 from openfoundry_sandbox.find_api import router as find_api_router
 from openfoundry_sandbox.notebook_api import cleanup_notebook, initialize_notebook
@@ -28,6 +41,7 @@ from openfoundry_sandbox.pcb_api import RunRequest, run_process_core
 from openfoundry_sandbox.pcb_api import router as pcb_api_router
 from openfoundry_sandbox.secrets_api import SecretPayload, store_secret
 from openfoundry_sandbox.secrets_api import router as secrets_api_router
+from openfoundry_sandbox.sql_api import router as sql_api_router
 
 # Configure logging
 logging.basicConfig(
@@ -90,6 +104,41 @@ class StrReplaceEditorResponse(BaseModel):
 class ExecuteSqlRequest(BaseModel):
     sql_statement: str
     connection_name: str
+    result_format: ResultFormat = Field(
+        ResultFormat.JSON,
+        description="Format of the returned rows. 'arrow' and 'parquet' return the result set as binary Arrow IPC stream or Parquet bytes.",
+    )
+    use_cache: bool = Field(
+        False,
+        description="Serve read-only statements from the sandbox result cache when possible",
+    )
+    json_layout: Literal["records", "columns"] = Field(
+        "records",
+        description="Layout of JSON results. 'records' returns one object per row in 'data'. 'columns' returns the column names once in 'columns' and the rows as arrays in 'rows', converted column by column through Arrow.",
+    )
+    output_path: str | None = Field(
+        None,
+        description="Write the result set to this file (relative to or inside the workspace) instead of returning its rows. Written as an Arrow IPC file for 'arrow' and as Parquet otherwise.",
+    )
+    prefer_extract: bool = Field(
+        False,
+        description="Serve the query from the local extract of the same query on the same connection when there is one",
+    )
+
+
+class ResultColumn(BaseModel):
+    name: str
+    type: str
+
+
+class MaterializedResult(BaseModel):
+    """A result set written to a file in the workspace."""
+
+    path: str
+    format: ResultFormat
+    row_count: int
+    size_bytes: int
+    columns: list[ResultColumn]
 
 
 class ExecuteSqlResponse(BaseModel):
@@ -97,6 +146,18 @@ class ExecuteSqlResponse(BaseModel):
     rows_affected: int
     data: list[dict]
     error: str | None = None
+    columns: list[str] | None = Field(
+        None, description="Column names, with the 'columns' JSON layout"
+    )
+    column_types: list[str] | None = Field(
+        None, description="Arrow column types, with the 'columns' JSON layout"
+    )
+    rows: list[tuple[Any, ...]] | None = Field(
+        None, description="Row values, with the 'columns' JSON layout"
+    )
+    output: MaterializedResult | None = Field(
+        None, description="The file the result set was written to, if requested"
+    )
 
 
 editor = OHEditor(workspace_root=WORKSPACE_DIR)
@@ -162,6 +223,8 @@ async def lifespan(app: FastAPI):
 
     # Cleanup connections on shutdown
     try:
+        query_job_manager.shutdown()
+        result_stream_registry.close_all()
         connection_manager.cleanup_connections()
         logger.info("Cleaned up all connections during shutdown")
     except Exception as e:
@@ -176,6 +239,8 @@ app.include_router(files_api_router)
 app.include_router(secrets_api_router)
 app.include_router(connections_api_router)
 app.include_router(notebook_api_router)
+app.include_router(sql_api_router)
+app.include_router(extracts_api_router)
 
 
 @app.get("/health")
@@ -479,11 +544,40 @@ def visualize_app():
 def execute_sql(request: ExecuteSqlRequest):
     """
     Execute a SQL statement on a specified connection.
+
+    With the default ``json`` result format the rows are returned as a list of
+    dicts. With ``arrow`` or ``parquet`` the rows are fetched through the
+    driver's columnar path and returned as a binary body, with the row count
+    in the ``X-Rows-Affected`` header. Statements that return no rows and
+    errors are always reported as an ``ExecuteSqlResponse``.
+
+    With ``use_cache`` read-only statements are served from the result cache
+    keyed by connection and normalized SQL.
+
+    With the ``columns`` JSON layout the rows are fetched as Arrow and
+    converted to JSON-safe values column by column, and returned as arrays
+    next to a single list of column names.
+
+    With ``output_path`` the result set is written to a file in the workspace
+    and only its path, schema and row count are returned. Arrow IPC files can
+    be memory-mapped from the notebook kernel with
+    ``pa.ipc.open_file(pa.memory_map(path)).read_all()``, Parquet files read
+    with ``pq.read_table(path, memory_map=True)``.
+
+    With ``prefer_extract`` a query with a local extract is run against the
+    extract on the ``local`` connection instead of the remote database.
     """
     logger.info(
         f"Received execute_sql request: sql_statement='{request.sql_statement}', connection_name='{request.connection_name}'"
     )
 
+    if request.prefer_extract:
+        request.connection_name, request.sql_statement = (
+            connection_manager.route_to_extract(
+                request.connection_name, request.sql_statement
+            )
+        )
+
     try:
         # Get the connection from the connection manager
         connection = connection_manager.get_connection(request.connection_name)
@@ -496,8 +590,34 @@ def execute_sql(request: ExecuteSqlRequest):
                 error=f"Connection '{request.connection_name}' not found. Available connections: {connection_manager.list_connections()}",
             )
 
-        # Execute the SQL statement
-        result = connection.execute_sql(request.sql_statement)
+        if request.output_path is not None:
+            return _materialize(request, connection)
+
+        if request.result_format != ResultFormat.JSON:
+            result = _execute(
+                request,
+                lambda: connection.execute_sql_arrow(request.sql_statement),
+                kind="arrow",
+            )
+            if result.table is not None:
+                return Response(
+                    content=serialize_arrow_table(result.table, request.result_format),
+                    media_type=get_media_type(request.result_format),
+                    headers={"X-Rows-Affected": str(result.rows_affected)},
+                )
+        elif request.json_layout == "columns":
+            result = _execute(
+                request,
+                lambda: connection.execute_sql_arrow(request.sql_statement),
+                kind="arrow",
+            )
+            if result.table is not None:
+                return _columnar_response(result)
+        else:
+            # Execute the SQL statement
+            result = _execute(
+                request, lambda: connection.execute_sql(request.sql_statement)
+            )
 
         # Return the result
         return ExecuteSqlResponse(
@@ -517,6 +637,96 @@ def execute_sql(request: ExecuteSqlRequest):
 # --- Helper Functions ---
 
 
+def _execute(
+    request: ExecuteSqlRequest,
+    execute: Callable[[], SqlExecutionResult],
+    kind: str = "rows",
+) -> SqlExecutionResult:
+    """Run a statement, serving it from the result cache if the request opted in."""
+    return result_cache.execute(
+        request.connection_name,
+        request.sql_statement,
+        execute,
+        kind=kind,
+        use_cache=request.use_cache,
+    )
+
+
+def _columnar_response(result: SqlExecutionResult) -> Response:
+    """Return a result set in the column-oriented JSON layout.
+
+    The rows already hold JSON-safe values, so the response is serialized
+    directly instead of being validated value by value.
+    """
+    response = ExecuteSqlResponse.model_construct(
+        success=True,
+        rows_affected=result.rows_affected,
+        data=[],
+        error=None,
+        columns=result.table.column_names,
+        column_types=[str(field.type) for field in result.table.schema],
+        rows=table_to_json_rows(result.table),
+        output=None,
+    )
+    return Response(content=response.model_dump_json(), media_type="application/json")
+
+
+def _materialize(
+    request: ExecuteSqlRequest, connection: Connection
+) -> ExecuteSqlResponse:
+    """Execute a statement and write its result set to ``request.output_path``."""
+    try:
+        path = _resolve_workspace_path(request.output_path)
+    except ValueError as e:
+        return ExecuteSqlResponse(success=False, rows_affected=0, data=[], error=str(e))
+
+    result = _execute(
+        request,
+        lambda: connection.execute_sql_arrow(request.sql_statement),
+        kind="arrow",
+    )
+    if result.table is None:
+        return ExecuteSqlResponse(
+            success=result.success,
+            rows_affected=result.rows_affected,
+            data=[],
+            error=result.error,
+        )
+
+    file_format = (
+        ResultFormat.ARROW
+        if request.result_format == ResultFormat.ARROW
+        else ResultFormat.PARQUET
+    )
+    size_bytes = write_arrow_table(result.table, path, file_format)
+    logger.info(f"Wrote {result.table.num_rows} rows to {path} ({size_bytes} bytes)")
+
+    return ExecuteSqlResponse(
+        success=True,
+        rows_affected=result.rows_affected,
+        data=[],
+        output=MaterializedResult(
+            path=str(path),
+            format=file_format,
+            row_count=result.table.num_rows,
+            size_bytes=size_bytes,
+            columns=[
+                ResultColumn(name=field.name, type=str(field.type))
+                for field in result.table.schema
+            ],
+        ),
+    )
+
+
+def _resolve_workspace_path(path: str) -> Path:
+    """Resolve a path relative to the workspace, rejecting paths outside of it."""
+    workspace = Path(WORKSPACE_DIR).resolve()
+    resolved = (workspace / path).resolve()
+    if resolved == workspace or not resolved.is_relative_to(workspace):
+        raise ValueError(f"Output path must be a file inside {WORKSPACE_DIR}: {path}")
+    return resolved
+
+
 async def _perform_initialization(request: InitializeRequest):
     """Perform initialization including file templates, secrets, connections, and streamlit startup."""
 
@@ -526,8 +736,15 @@ async def _perform_initialization(request: InitializeRequest):
             store_secret(secret)
 
     # Initialize connections from /etc/secrets/connections/
+    start_time = time.monotonic()
     connection_manager.initialize_connections()
-    logger.info(f"Initialized connections: {connection_manager.list_connections()}")
+    logger.info(
+        f"Initialized connections in {time.monotonic() - start_time:.2f}s: {connection_manager.list_connections()}"
+    )
+
+    # Establish the database sessions in the background so the first query
+    # does not pay for authentication
+    connection_manager.warm_up_connections()
 
     # Initialize notebook kernel if this is a notebook session
     if request.is_notebook_session:
@@ -1,7 +1,9 @@
+import logging
 import os
 import shutil
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Body, HTTPException, Query, status
 from pydantic import BaseModel, Field
@@ -9,8 +11,13 @@ from pydantic import BaseModel, Field
 from openfoundry_sandbox.config import CONNECTIONS_DIR, SECRETS_BASE
 from openfoundry_sandbox.connections.connection_manager import connection_manager
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/secrets", tags=["secrets"])
 
+# Serializes syncs, which replace the whole directory of a prefix
+_sync_lock = threading.Lock()
+
 
 class SecretPayload(BaseModel):
     prefix: Optional[str] = Field(
@@ -20,6 +27,24 @@ class SecretPayload(BaseModel):
     secrets: Dict[str, str] = Field(..., description="Key-value pairs for the secret")
 
 
+class SyncSecretsRequest(BaseModel):
+    prefix: str = Field(..., description="Prefix whose secrets are replaced")
+    secrets: Dict[str, Dict[str, str]] = Field(
+        ..., description="The full desired set of secrets, by secret name"
+    )
+
+
+class SyncSecretsResponse(BaseModel):
+    added: List[str]
+    updated: List[str]
+    removed: List[str]
+    unchanged: List[str]
+    failed: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Connections that could not be created, with the error",
+    )
+
+
 def get_secret_dir(prefix: Optional[str], name: str) -> Path:
     if prefix:
         return SECRETS_BASE / prefix / name
@@ -39,6 +64,112 @@ def store_secret(payload: SecretPayload):
     return secret_dir
 
 
+def _read_secret_dir(secret_dir: Path) -> Dict[str, str]:
+    """Read the key-value pairs of a stored secret."""
+    return {
+        key_path.name: key_path.read_text(encoding="utf-8")
+        for key_path in secret_dir.iterdir()
+        if key_path.is_file()
+    }
+
+
+def _write_secret_dir(secret_dir: Path, secrets: Dict[str, str]) -> None:
+    """Write the key-value pairs of a secret to a new directory."""
+    secret_dir.mkdir(parents=True)
+    for k, v in secrets.items():
+        with open(secret_dir / k, "w", encoding="utf-8") as f:
+            f.write(v)
+
+
+def sync_secrets(
+    prefix: str, desired: Dict[str, Dict[str, str]]
+) -> SyncSecretsResponse:
+    """
+    Replace the secrets under a prefix with the desired set.
+
+    The desired set is compared with the stored secrets and, if anything
+    differs, written to a staging directory that is then swapped in for the
+    prefix directory, so readers never see a partially written set.
+    """
+    prefix_dir = SECRETS_BASE / prefix
+    current = {}
+    if prefix_dir.exists():
+        current = {
+            secret_dir.name: _read_secret_dir(secret_dir)
+            for secret_dir in prefix_dir.iterdir()
+            if secret_dir.is_dir()
+        }
+
+    response = SyncSecretsResponse(
+        added=sorted(set(desired) - set(current)),
+        updated=sorted(
+            name
+            for name in desired
+            if name in current and desired[name] != current[name]
+        ),
+        removed=sorted(set(current) - set(desired)),
+        unchanged=sorted(
+            name
+            for name in desired
+            if name in current and desired[name] == current[name]
+        ),
+    )
+    if not (response.added or response.updated or response.removed):
+        return response
+
+    staging_dir = prefix_dir.with_name(f".{prefix_dir.name}.staging")
+    old_dir = prefix_dir.with_name(f".{prefix_dir.name}.old")
+    for path in (staging_dir, old_dir):
+        if path.exists():
+            shutil.rmtree(path)
+
+    staging_dir.mkdir(parents=True)
+    for name, secrets in desired.items():
+        _write_secret_dir(staging_dir / name, secrets)
+
+    if prefix_dir.exists():
+        os.rename(prefix_dir, old_dir)
+    os.rename(staging_dir, prefix_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return response
+
+
+@router.put("/sync", response_model=SyncSecretsResponse)
+def put_secrets_sync(request: SyncSecretsRequest = Body(...)):
+    """
+    Replace all secrets under a prefix with the given set in one request.
+
+    Only the differences to the stored secrets are applied. For the
+    connections prefix, only connections whose credentials changed are
+    rebuilt, and removed ones are closed. Connections whose credentials did
+    not change keep their open pooled sessions.
+    """
+    with _sync_lock:
+        response = sync_secrets(request.prefix, request.secrets)
+
+        if (SECRETS_BASE / request.prefix) == CONNECTIONS_DIR:
+            for name in response.removed:
+                connection_manager.remove_connection(name)
+
+            existing = set(connection_manager.list_connections())
+            for name in request.secrets:
+                # Connections that failed to be created before are retried
+                if name in response.unchanged and name in existing:
+                    continue
+                try:
+                    connection_manager.add_connection(CONNECTIONS_DIR / name, name)
+                except Exception as e:
+                    logger.error(f"Failed to add connection {name}: {e}")
+                    response.failed[name] = str(e)
+
+    logger.info(
+        f"Synced secrets under '{request.prefix}': {len(response.added)} added, "
+        f"{len(response.updated)} updated, {len(response.removed)} removed, "
+        f"{len(response.unchanged)} unchanged"
+    )
+    return response
+
+
 @router.put("/")
 def put_secret(payload: SecretPayload = Body(...)):
     secret_dir = store_secret(payload)
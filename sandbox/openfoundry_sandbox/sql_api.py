@@ -0,0 +1,857 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Iterator, Literal
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, model_validator
+from pydantic_core import to_json
+
+from openfoundry_sandbox.connections.connection import Connection
+from openfoundry_sandbox.connections.connection_manager import connection_manager
+from openfoundry_sandbox.connections.federated import (
+    MAX_FEDERATED_SOURCES,
+    SOURCE_NAME_PATTERN,
+    FederatedSource,
+    execute_federated,
+)
+from openfoundry_sandbox.connections.preflight import (
+    PreflightPolicy,
+    PreflightResult,
+    run_preflight,
+)
+from openfoundry_sandbox.connections.query_jobs import (
+    QueryJob,
+    RunningQuery,
+    query_job_manager,
+)
+from openfoundry_sandbox.connections.result_cache import result_cache
+from openfoundry_sandbox.connections.result_stream import (
+    SqlResultStream,
+    result_stream_registry,
+)
+from openfoundry_sandbox.connections.utils import (
+    SqlExecutionResult,
+    table_to_json_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/execute_sql", tags=["sql"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Longest time a single poll request may block waiting for a job to finish
+MAX_JOB_WAIT_SECONDS = 60.0
+
+# Maximum number of statements in a single batch request
+MAX_BATCH_ITEMS = 100
+
+# Longest time a timed-out batch statement may take to stop once cancelled
+BATCH_CANCEL_GRACE_SECONDS = 5.0
+
+
+# --- Pydantic Models ---
+
+
+class SqlStreamOptions(BaseModel):
+    """Options controlling how rows are paged out of a result stream."""
+
+    batch_size: int = Field(
+        1000, gt=0, le=100_000, description="Rows fetched from the cursor per frame"
+    )
+    max_rows: int | None = Field(
+        None, gt=0, description="Stop after this many rows and report truncation"
+    )
+    max_bytes: int | None = Field(
+        None,
+        gt=0,
+        description="Stop once the encoded row frames exceed this many bytes",
+    )
+    stream_format: Literal["ndjson", "sse"] = Field(
+        "ndjson", description="Framing of the response body"
+    )
+    allow_continuation: bool = Field(
+        True,
+        description="Keep the cursor open after truncation and return a continuation token",
+    )
+
+
+class ExecuteSqlStreamRequest(SqlStreamOptions):
+    sql_statement: str
+    connection_name: str
+
+
+class ContinueSqlStreamRequest(SqlStreamOptions):
+    continuation_token: str
+
+
+class SqlPreflightOptions(BaseModel):
+    """Guardrails applied to a statement before it is executed."""
+
+    row_limit: int | None = Field(
+        None, gt=0, description="LIMIT added to plain SELECT queries that have none"
+    )
+    max_bytes_scanned: int | None = Field(
+        None,
+        gt=0,
+        description="Estimated bytes scanned (dry run or EXPLAIN) above which on_exceed applies",
+    )
+    max_rows_scanned: int | None = Field(
+        None,
+        gt=0,
+        description="Estimated rows scanned (EXPLAIN) above which on_exceed applies",
+    )
+    on_exceed: Literal["refuse", "limit"] = Field(
+        "refuse",
+        description="Refuse queries over a threshold, or run them with a small LIMIT",
+    )
+
+    def to_policy(self) -> PreflightPolicy:
+        """Convert the options to the policy applied by the connection layer."""
+        return PreflightPolicy(**self.model_dump())
+
+
+class SqlPreflightInfo(BaseModel):
+    """What the preflight stage did to a statement."""
+
+    sql_statement: str = Field(description="The statement that was executed")
+    limit_added: int | None = None
+    estimate_method: str | None = None
+    estimated_bytes_scanned: int | None = None
+    estimated_rows_scanned: int | None = None
+    exceeded: bool = False
+    refused: bool = False
+    message: str | None = None
+
+    @staticmethod
+    def from_result(result: PreflightResult) -> "SqlPreflightInfo":
+        """Describe the result of the preflight stage."""
+        estimate = result.estimate
+        return SqlPreflightInfo(
+            sql_statement=result.sql_statement,
+            limit_added=result.limit_added,
+            estimate_method=estimate.method if estimate else None,
+            estimated_bytes_scanned=estimate.bytes_scanned if estimate else None,
+            estimated_rows_scanned=estimate.rows_scanned if estimate else None,
+            exceeded=result.exceeded,
+            refused=result.refused,
+            message=result.message,
+        )
+
+
+class SubmitSqlJobRequest(BaseModel):
+    sql_statement: str
+    connection_name: str
+    timeout_seconds: float | None = Field(
+        None, gt=0, description="Cancel the query if it runs longer than this"
+    )
+    use_cache: bool = Field(
+        False,
+        description="Serve read-only statements from the sandbox result cache when possible",
+    )
+    preflight: SqlPreflightOptions | None = Field(
+        None, description="Row limit and cost guardrails applied before execution"
+    )
+    prefer_extract: bool = Field(
+        False,
+        description="Serve the query from the local extract of the same query on the same connection when there is one",
+    )
+    max_rows: int | None = Field(
+        None,
+        gt=0,
+        description="Only fetch the first rows of the result instead of the whole result set",
+    )
+
+
+class BatchSqlItem(BaseModel):
+    sql_statement: str
+    connection_name: str
+    id: str | None = Field(None, description="Caller-defined id echoed in the result")
+
+
+class ExecuteSqlBatchRequest(BaseModel):
+    items: list[BatchSqlItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+    max_concurrency_per_connection: int | None = Field(
+        None,
+        gt=0,
+        description="Statements run at the same time per connection. Defaults to, and is capped at, the connection pool size.",
+    )
+    max_rows: int | None = Field(
+        None, gt=0, description="Maximum rows returned per statement"
+    )
+    max_bytes: int | None = Field(
+        None, gt=0, description="Maximum encoded size of the rows of each statement"
+    )
+    timeout_seconds: float | None = Field(
+        None, gt=0, description="Cancel each statement that runs longer than this"
+    )
+    use_cache: bool = Field(
+        False,
+        description="Serve read-only statements from the sandbox result cache when possible",
+    )
+    stream_format: Literal["ndjson", "sse"] = Field(
+        "ndjson", description="Framing of the response body"
+    )
+    preflight: SqlPreflightOptions | None = Field(
+        None, description="Row limit and cost guardrails applied to each statement"
+    )
+
+
+class FederatedSourceItem(BaseModel):
+    name: str = Field(
+        ...,
+        pattern=SOURCE_NAME_PATTERN.pattern,
+        description="Name the result of the sub-query is referenced by in the local query",
+    )
+    connection_name: str
+    sql_statement: str
+
+
+class ExecuteFederatedSqlRequest(BaseModel):
+    sources: list[FederatedSourceItem] = Field(
+        ..., min_length=1, max_length=MAX_FEDERATED_SOURCES
+    )
+    sql_statement: str = Field(
+        ...,
+        description="DuckDB SQL joining or aggregating the sources, referenced as tables by name",
+    )
+    max_rows: int | None = Field(
+        None, gt=0, description="Maximum rows of the final result returned"
+    )
+    max_bytes: int | None = Field(
+        None, gt=0, description="Maximum encoded size of the rows returned"
+    )
+    timeout_seconds: float | None = Field(
+        None, gt=0, description="Cancel the sub-queries if they run longer than this"
+    )
+    use_cache: bool = Field(
+        False,
+        description="Serve read-only sub-queries from the sandbox result cache when possible",
+    )
+    preflight: SqlPreflightOptions | None = Field(
+        None,
+        description="Cost guardrails applied to each sub-query. A row limit cuts off the source rows, not the final result.",
+    )
+
+    @model_validator(mode="after")
+    def check_unique_names(self) -> "ExecuteFederatedSqlRequest":
+        names = [source.name.lower() for source in self.sources]
+        if len(set(names)) != len(names):
+            raise ValueError("Source names must be unique")
+        return self
+
+
+class FederatedSourceInfo(BaseModel):
+    name: str
+    connection_name: str
+    rows: int = Field(description="Rows fetched from the connection")
+    bytes: int = Field(description="Size of the fetched Arrow table")
+    duration_seconds: float
+    error: str | None = None
+
+
+class FederatedSqlResponse(BaseModel):
+    success: bool
+    data: list[dict[str, Any]] = Field(default_factory=list)
+    rows_affected: int = 0
+    error: str | None = None
+    truncated: bool = Field(
+        False, description="Whether rows were left out because of max_rows/max_bytes"
+    )
+    sources: list[FederatedSourceInfo]
+    local_duration_seconds: float = Field(
+        description="Time spent running the local query"
+    )
+
+
+class ResultCacheStatsResponse(BaseModel):
+    """Hit/miss counters and size of the SQL result cache."""
+
+    hits: int
+    misses: int
+    bypassed: int = Field(
+        description="Statements that were not read-only and skipped the cache"
+    )
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    evictions: int
+    invalidations: int
+
+
+class InvalidateCacheResponse(BaseModel):
+    invalidated: int
+
+
+class SqlJobResult(BaseModel):
+    success: bool
+    data: list[dict[str, Any]] = Field(default_factory=list)
+    rows_affected: int = 0
+    error: str | None = None
+    truncated: bool = Field(
+        False, description="Whether rows were left out because of max_rows/max_bytes"
+    )
+
+
+class SqlJobResponse(BaseModel):
+    job_id: str
+    connection_name: str
+    state: str
+    submitted_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: SqlJobResult | None = Field(
+        None, description="Result of the query, set once the job has finished"
+    )
+    preflight: SqlPreflightInfo | None = None
+
+
+# --- Helper Functions ---
+
+
+def _encode_frame(frame: dict[str, Any], stream_format: str) -> bytes:
+    """Encode a frame as a single NDJSON line or SSE event."""
+    payload = to_json(frame, fallback=str)
+    if stream_format == "sse":
+        return b"data: " + payload + b"\n\n"
+    return payload + b"\n"
+
+
+def _stream_frames(
+    stream: SqlResultStream, options: SqlStreamOptions, token: str | None = None
+) -> Iterator[bytes]:
+    """Page rows out of a result stream as encoded frames.
+
+    Emits a ``columns`` frame, one ``rows`` frame per batch and a final
+    ``end`` frame. When ``max_rows`` or ``max_bytes`` stops the stream before
+    the cursor is exhausted the ``end`` frame is marked as truncated and, if
+    continuation is allowed, carries a token to fetch the next page.
+    """
+    fmt = options.stream_format
+    rows_returned = 0
+    bytes_returned = 0
+    truncated = False
+    park_stream = False
+
+    try:
+        first_batch_size = options.batch_size
+        if options.max_rows is not None:
+            first_batch_size = min(first_batch_size, options.max_rows)
+        batch = stream.fetch_batch(first_batch_size)
+
+        if not stream.has_result_set:
+            yield _encode_frame(
+                {
+                    "type": "end",
+                    "success": True,
+                    "rows_affected": stream.rows_affected,
+                    "rows_returned": 0,
+                    "truncated": False,
+                    "continuation_token": None,
+                },
+                fmt,
+            )
+            return
+
+        yield _encode_frame({"type": "columns", "columns": stream.column_names}, fmt)
+
+        while batch:
+            frame = _encode_frame({"type": "rows", "rows": batch}, fmt)
+            rows_returned += len(batch)
+            bytes_returned += len(frame)
+            yield frame
+
+            if options.max_bytes is not None and bytes_returned >= options.max_bytes:
+                truncated = stream.has_more()
+                break
+
+            next_batch_size = options.batch_size
+            if options.max_rows is not None:
+                next_batch_size = min(next_batch_size, options.max_rows - rows_returned)
+                if next_batch_size <= 0:
+                    truncated = stream.has_more()
+                    break
+
+            batch = stream.fetch_batch(next_batch_size)
+
+        if truncated and options.allow_continuation:
+            token = result_stream_registry.register(stream, token)
+            park_stream = True
+        else:
+            token = None
+
+        yield _encode_frame(
+            {
+                "type": "end",
+                "success": True,
+                "rows_affected": rows_returned,
+                "rows_returned": rows_returned,
+                "truncated": truncated,
+                "continuation_token": token,
+            },
+            fmt,
+        )
+
+    except Exception as e:
+        logger.error(f"Failed while streaming SQL result: {e}", exc_info=True)
+        yield _encode_frame({"type": "error", "success": False, "error": str(e)}, fmt)
+
+    finally:
+        if not park_stream:
+            stream.close()
+
+
+def _get_stream_media_type(stream_format: str) -> str:
+    """Get the media type of a streamed SQL response."""
+    return SSE_MEDIA_TYPE if stream_format == "sse" else NDJSON_MEDIA_TYPE
+
+
+def _error_response(error: str, stream_format: str) -> StreamingResponse:
+    """Return a stream consisting of a single error frame."""
+    frame = _encode_frame(
+        {"type": "error", "success": False, "error": error}, stream_format
+    )
+    return StreamingResponse(
+        iter([frame]), media_type=_get_stream_media_type(stream_format)
+    )
+
+
+def _build_job_response(
+    job: QueryJob, max_rows: int | None = None, max_bytes: int | None = None
+) -> SqlJobResponse:
+    """Describe a job, including the first rows of its result once finished."""
+    result = None
+    if job.result is not None:
+        data = _truncate_rows(job.result.data, max_rows, max_bytes)
+        result = SqlJobResult(
+            success=job.result.success,
+            data=data,
+            rows_affected=job.result.rows_affected,
+            error=job.result.error,
+            truncated=len(data) < len(job.result.data),
+        )
+
+    return SqlJobResponse(
+        job_id=job.job_id,
+        connection_name=job.connection_name,
+        state=job.state.value,
+        submitted_at=job.submitted_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        result=result,
+        preflight=SqlPreflightInfo.from_result(job.preflight_result)
+        if job.preflight_result is not None
+        else None,
+    )
+
+
+def _truncate_rows(
+    data: list[dict[str, Any]], max_rows: int | None, max_bytes: int | None
+) -> list[dict[str, Any]]:
+    """Keep the leading rows that fit within ``max_rows`` and ``max_bytes``."""
+    if max_rows is not None:
+        data = data[:max_rows]
+    if max_bytes is not None:
+        size = 0
+        for index, row in enumerate(data):
+            size += len(to_json(row, fallback=str))
+            if size > max_bytes:
+                return data[:index]
+    return data
+
+
+def _cancel_batch_item(connection: Connection, query: RunningQuery) -> None:
+    """Cancel a batch statement in the database, logging rather than raising."""
+    try:
+        connection.cancel_query(query)
+    except Exception as e:
+        logger.warning(f"Failed to cancel batch statement: {e}")
+
+
+async def _run_batch_item(
+    item: BatchSqlItem,
+    connection: Connection,
+    semaphore: asyncio.Semaphore,
+    request: ExecuteSqlBatchRequest,
+) -> tuple[SqlExecutionResult, PreflightResult | None, float]:
+    """Run one batch statement on a worker thread once its connection has a slot.
+
+    Returns the result, the outcome of the preflight stage and the execution
+    time in seconds. A statement that exceeds the timeout, or whose request is
+    cancelled because the client went away, is cancelled in the database.
+    """
+    query = RunningQuery()
+    preflight = None
+
+    def run() -> SqlExecutionResult:
+        nonlocal preflight
+        sql_statement = item.sql_statement
+        if request.preflight is not None:
+            preflight = run_preflight(
+                connection, sql_statement, request.preflight.to_policy()
+            )
+            if preflight.refused:
+                return SqlExecutionResult.error_result(preflight.message)
+            sql_statement = preflight.sql_statement
+
+        def execute() -> SqlExecutionResult:
+            return connection.execute_sql(sql_statement, query=query)
+
+        return result_cache.execute(
+            item.connection_name, sql_statement, execute, use_cache=request.use_cache
+        )
+
+    async with semaphore:
+        start_time = time.monotonic()
+        task = asyncio.ensure_future(asyncio.to_thread(run))
+        try:
+            result = await asyncio.wait_for(
+                asyncio.shield(task), timeout=request.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            await asyncio.to_thread(_cancel_batch_item, connection, query)
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(task), timeout=BATCH_CANCEL_GRACE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # The worker thread is left to finish on its own
+                logger.warning(
+                    f"Batch statement still running {BATCH_CANCEL_GRACE_SECONDS}s after cancelling it"
+                )
+            except Exception:
+                # The statement failing once cancelled is expected
+                pass
+            result = SqlExecutionResult.error_result(
+                f"Query timed out after {request.timeout_seconds}s"
+            )
+        except asyncio.CancelledError:
+            # Cancelled from a worker thread, as the call may block on the
+            # database and this task cannot wait for it
+            asyncio.get_running_loop().run_in_executor(
+                None, _cancel_batch_item, connection, query
+            )
+            raise
+        return result, preflight, time.monotonic() - start_time
+
+
+async def _stream_batch(request: ExecuteSqlBatchRequest) -> AsyncIterator[bytes]:
+    """Run the statements of a batch concurrently and emit a frame as each finishes.
+
+    Each ``result`` frame carries the index of its item in the request. A
+    final ``end`` frame reports how many statements succeeded and failed.
+    """
+    fmt = request.stream_format
+    semaphores: dict[str, asyncio.Semaphore] = {}
+    tasks: dict[asyncio.Future, int] = {}
+    frames: list[dict[str, Any]] = []
+
+    for index, item in enumerate(request.items):
+        frame = {
+            "type": "result",
+            "index": index,
+            "id": item.id,
+            "connection_name": item.connection_name,
+        }
+        connection = connection_manager.get_connection(item.connection_name)
+        if connection is None:
+            frames.append(
+                {
+                    **frame,
+                    "success": False,
+                    "error": f"Connection '{item.connection_name}' not found. Available connections: {connection_manager.list_connections()}",
+                }
+            )
+            continue
+
+        if item.connection_name not in semaphores:
+            limit = connection.get_pool_stats().max_size
+            if request.max_concurrency_per_connection is not None:
+                limit = min(limit, request.max_concurrency_per_connection)
+            semaphores[item.connection_name] = asyncio.Semaphore(limit)
+
+        task = asyncio.ensure_future(
+            _run_batch_item(item, connection, semaphores[item.connection_name], request)
+        )
+        tasks[task] = index
+
+    succeeded = 0
+    failed = len(frames)
+    for frame in frames:
+        yield _encode_frame(frame, fmt)
+
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                index = tasks[task]
+                item = request.items[index]
+                result, preflight, elapsed = task.result()
+                data = _truncate_rows(result.data, request.max_rows, request.max_bytes)
+                if result.success:
+                    succeeded += 1
+                else:
+                    failed += 1
+
+                yield _encode_frame(
+                    {
+                        "type": "result",
+                        "index": index,
+                        "id": item.id,
+                        "connection_name": item.connection_name,
+                        "success": result.success,
+                        "rows_affected": result.rows_affected,
+                        "data": data,
+                        "truncated": len(data) < len(result.data),
+                        "error": result.error,
+                        "elapsed_seconds": round(elapsed, 3),
+                        "preflight": SqlPreflightInfo.from_result(
+                            preflight
+                        ).model_dump()
+                        if preflight is not None
+                        else None,
+                    },
+                    fmt,
+                )
+    finally:
+        # Cancels the remaining statements if the client disconnected
+        for task in pending:
+            task.cancel()
+
+    yield _encode_frame({"type": "end", "succeeded": succeeded, "failed": failed}, fmt)
+
+
+def _get_job_or_404(job_id: str) -> QueryJob:
+    """Look up a query job, raising a 404 if it is unknown or has expired."""
+    job = query_job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Query job '{job_id}' not found",
+        )
+    return job
+
+
+# --- API Endpoints ---
+
+
+@router.post("/stream")
+def execute_sql_stream(request: ExecuteSqlStreamRequest):
+    """
+    Execute a SQL statement and stream its rows as NDJSON or SSE frames.
+
+    Rows are read from the cursor in ``batch_size`` chunks (a server-side
+    cursor on Postgres) instead of being buffered in memory.
+    """
+    logger.info(
+        f"Received execute_sql stream request: sql_statement='{request.sql_statement}', connection_name='{request.connection_name}'"
+    )
+
+    connection = connection_manager.get_connection(request.connection_name)
+    if connection is None:
+        return _error_response(
+            f"Connection '{request.connection_name}' not found. Available connections: {connection_manager.list_connections()}",
+            request.stream_format,
+        )
+
+    try:
+        stream = connection.open_stream(request.sql_statement)
+    except Exception as e:
+        return _error_response(str(e), request.stream_format)
+    # The statement has run once the stream is open
+    result_cache.invalidate_after(request.connection_name, request.sql_statement)
+
+    return StreamingResponse(
+        _stream_frames(stream, request),
+        media_type=_get_stream_media_type(request.stream_format),
+    )
+
+
+@router.post("/stream/continue")
+def continue_sql_stream(request: ContinueSqlStreamRequest):
+    """Stream the next page of a truncated result using its continuation token."""
+    stream = result_stream_registry.pop(request.continuation_token)
+    if stream is None:
+        return _error_response(
+            f"Continuation token '{request.continuation_token}' is unknown or has expired",
+            request.stream_format,
+        )
+
+    return StreamingResponse(
+        _stream_frames(stream, request, token=request.continuation_token),
+        media_type=_get_stream_media_type(request.stream_format),
+    )
+
+
+@router.post("/batch")
+async def execute_sql_batch(request: ExecuteSqlBatchRequest):
+    """
+    Execute several SQL statements, possibly on different connections.
+
+    Statements run concurrently, at most ``max_concurrency_per_connection``
+    at a time per connection, and their results are streamed back as NDJSON
+    or SSE frames in the order in which they finish.
+    """
+    logger.info(
+        f"Received execute_sql batch request with {len(request.items)} statement(s)"
+    )
+    return StreamingResponse(
+        _stream_batch(request),
+        media_type=_get_stream_media_type(request.stream_format),
+    )
+
+
+@router.post("/federated", response_model=FederatedSqlResponse)
+def execute_federated_sql(request: ExecuteFederatedSqlRequest):
+    """
+    Join or aggregate the results of queries on different connections locally.
+
+    Each source query runs concurrently on its connection and is fetched as
+    Arrow. The results are registered as DuckDB relations named after their
+    source, and ``sql_statement`` runs on them in an in-process DuckDB. Only
+    its result is returned, so the sources should be filtered and projected
+    in the remote databases as far as possible.
+    """
+    logger.info(
+        f"Received federated execute_sql request over {len(request.sources)} source(s): sql_statement='{request.sql_statement}'"
+    )
+
+    sources = []
+    for source in request.sources:
+        connection = connection_manager.get_connection(source.connection_name)
+        if connection is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Connection '{source.connection_name}' not found. Available connections: {connection_manager.list_connections()}",
+            )
+        sources.append(
+            (
+                FederatedSource(
+                    source.name, source.connection_name, source.sql_statement
+                ),
+                connection,
+            )
+        )
+
+    federated = execute_federated(
+        sources,
+        request.sql_statement,
+        timeout=request.timeout_seconds,
+        use_cache=request.use_cache,
+        preflight=request.preflight.to_policy() if request.preflight else None,
+    )
+    result = federated.result
+    data = result.data
+    row_count = len(data)
+    if result.table is not None:
+        # Only the rows that can be returned are converted
+        table = result.table
+        row_count = table.num_rows
+        if request.max_rows is not None:
+            table = table.slice(0, request.max_rows)
+        data = [dict(zip(table.column_names, row)) for row in table_to_json_rows(table)]
+    rows = _truncate_rows(data, request.max_rows, request.max_bytes)
+    return FederatedSqlResponse(
+        success=result.success,
+        data=rows,
+        rows_affected=result.rows_affected,
+        error=result.error,
+        truncated=len(rows) < row_count,
+        sources=[FederatedSourceInfo(**stats.to_dict()) for stats in federated.sources],
+        local_duration_seconds=federated.local_duration_seconds,
+    )
+
+
+@router.post("/jobs", response_model=SqlJobResponse)
+def submit_sql_job(request: SubmitSqlJobRequest):
+    """
+    Submit a SQL statement for asynchronous execution.
+
+    Returns immediately with a job id that can be polled, awaited and cancelled.
+    With ``prefer_extract`` a query with a local extract runs on the ``local``
+    connection.
+    """
+    logger.info(
+        f"Received execute_sql job request: sql_statement='{request.sql_statement}', connection_name='{request.connection_name}'"
+    )
+
+    if request.prefer_extract:
+        request.connection_name, request.sql_statement = (
+            connection_manager.route_to_extract(
+                request.connection_name, request.sql_statement
+            )
+        )
+
+    connection = connection_manager.get_connection(request.connection_name)
+    if connection is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Connection '{request.connection_name}' not found. Available connections: {connection_manager.list_connections()}",
+        )
+
+    job = query_job_manager.submit(
+        connection,
+        request.connection_name,
+        request.sql_statement,
+        timeout=request.timeout_seconds,
+        use_cache=request.use_cache,
+        preflight=request.preflight.to_policy() if request.preflight else None,
+        max_rows=request.max_rows,
+    )
+    return _build_job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=SqlJobResponse)
+def get_sql_job(
+    job_id: str,
+    wait: float = Query(
+        0,
+        ge=0,
+        le=MAX_JOB_WAIT_SECONDS,
+        description="Seconds to wait for the job to finish before responding",
+    ),
+    max_rows: int | None = Query(None, gt=0, description="Maximum rows to return"),
+    max_bytes: int | None = Query(
+        None, gt=0, description="Maximum encoded size of the returned rows"
+    ),
+):
+    """Get the state of a query job, waiting up to ``wait`` seconds for it to finish."""
+    job = _get_job_or_404(job_id)
+    if wait > 0:
+        job.wait(wait)
+    return _build_job_response(job, max_rows=max_rows, max_bytes=max_bytes)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=SqlJobResponse)
+def cancel_sql_job(job_id: str):
+    """Cancel a pending or running query job using the driver's native cancel."""
+    logger.info(f"Received cancel request for query job {job_id}")
+    job = query_job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Query job '{job_id}' not found",
+        )
+    return _build_job_response(job)
+
+
+@router.get("/cache/stats", response_model=ResultCacheStatsResponse)
+def get_result_cache_stats():
+    """Get the hit/miss counters and size of the SQL result cache."""
+    return ResultCacheStatsResponse(**result_cache.stats().to_dict())
+
+
+@router.delete("/cache", response_model=InvalidateCacheResponse)
+def invalidate_result_cache(
+    connection_name: str | None = Query(
+        None, description="Only drop the cached results of this connection"
+    ),
+):
+    """Drop cached SQL results of one connection, or of all connections."""
+    return InvalidateCacheResponse(invalidated=result_cache.invalidate(connection_name))
@@ -0,0 +1,63 @@
+import pyarrow as pa
+import pytest
+
+from openfoundry_sandbox.connections.extracts import ExtractManager
+from openfoundry_sandbox.connections.local_connection import LocalConnection
+from openfoundry_sandbox.connections.utils import SqlExecutionResult
+
+
+class _ArrowSource:
+    """Source connection returning a fixed Arrow table."""
+
+    def __init__(self, table: pa.Table) -> None:
+        self.table = table
+
+    def execute_sql_arrow(self, sql_statement, query=None):
+        return SqlExecutionResult.arrow_result(self.table)
+
+
+@pytest.fixture
+def extracts(tmp_path):
+    return ExtractManager(tmp_path)
+
+
+@pytest.fixture
+def connection(extracts):
+    connection = LocalConnection(extracts=extracts)
+    yield connection
+    connection.cleanup()
+
+
+def _create_extract(extracts: ExtractManager, name: str, rows: int) -> None:
+    table = pa.table({"id": list(range(rows))})
+    extracts.create_extract(name, "source", _ArrowSource(table), "SELECT * FROM t")
+
+
+def test_paged_query_sees_new_extract(extracts, connection):
+    _create_extract(extracts, "orders", 5)
+
+    result = connection.execute_sql_page("SELECT * FROM orders ORDER BY id", 2)
+
+    assert result.success, result.error
+    assert result.data == [{"id": 0}, {"id": 1}, {"id": 2}]
+
+
+def test_paged_query_sees_extract_created_after_first_query(extracts, connection):
+    _create_extract(extracts, "orders", 1)
+    assert connection.execute_sql_page("SELECT * FROM orders", 10).success
+
+    _create_extract(extracts, "customers", 3)
+    result = connection.execute_sql_page("SELECT count(*) AS n FROM customers", 10)
+
+    assert result.success, result.error
+    assert result.data == [{"n": 3}]
+
+
+def test_stream_sees_new_extract(extracts, connection):
+    _create_extract(extracts, "orders", 4)
+
+    stream = connection.open_stream("SELECT * FROM orders")
+    try:
+        assert len(stream.fetch_batch(10)) == 4
+    finally:
+        stream.close()
@@ -0,0 +1,56 @@
+import time
+
+from openfoundry_sandbox.connections.connection_pool import ConnectionPool
+from openfoundry_sandbox.connections.result_stream import (
+    ResultStreamRegistry,
+    SqlResultStream,
+)
+
+
+class _Cursor:
+    """Cursor without rows that records whether it was closed."""
+
+    description = [("id",)]
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    def fetchmany(self, size):
+        return []
+
+    def close(self):
+        self.closed = True
+
+
+def _open_stream(pool: ConnectionPool) -> tuple[SqlResultStream, _Cursor]:
+    conn = pool.acquire()
+    cursor = _Cursor()
+    stream = SqlResultStream(cursor, on_close=lambda: pool.release(conn), pool=pool)
+    return stream, cursor
+
+
+def test_parked_streams_leave_a_pooled_connection_free():
+    pool = ConnectionPool(create=object, is_alive=lambda conn: True, max_size=3)
+    registry = ResultStreamRegistry()
+    streams = [_open_stream(pool) for _ in range(3)]
+
+    tokens = [registry.register(stream) for stream, _ in streams]
+
+    assert [cursor.closed for _, cursor in streams] == [True, False, False]
+    assert registry.pop(tokens[0]) is None
+    assert pool.stats().in_use == 2
+    registry.close_all()
+
+
+def test_expired_streams_are_closed_in_the_background():
+    pool = ConnectionPool(create=object, is_alive=lambda conn: True, max_size=2)
+    registry = ResultStreamRegistry(ttl=0.05, sweep_interval=0.05)
+    stream, cursor = _open_stream(pool)
+
+    registry.register(stream)
+    deadline = time.monotonic() + 2
+    while not cursor.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert cursor.closed
+    assert pool.stats().in_use == 0
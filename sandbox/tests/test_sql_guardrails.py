@@ -0,0 +1,59 @@
+import pytest
+
+from openfoundry_sandbox.connections.utils import add_row_limit, is_read_only_sql
+
+
+@pytest.mark.parametrize(
+    ("sql_statement", "dialect"),
+    [
+        ("SELECT * FROM t", None),
+        ("SELECT 'delete me' FROM t", None),
+        ("WITH a AS (SELECT 1) SELECT * FROM a", None),
+        ("DESCRIBE t", None),
+        ("EXPLAIN SELECT 1", None),
+    ],
+)
+def test_read_only_statements(sql_statement, dialect):
+    assert is_read_only_sql(sql_statement, dialect)
+
+
+@pytest.mark.parametrize(
+    ("sql_statement", "dialect"),
+    [
+        ("WITH d AS (DELETE FROM t RETURNING *) SELECT * FROM d", "postgres"),
+        ("SELECT * INTO t2 FROM t", None),
+        ("SELECT * FROM t FOR UPDATE", "postgres"),
+        ("SELECT 1; DROP TABLE t", None),
+        ("INSERT INTO t VALUES (1)", None),
+        ("EXPLAIN ANALYZE DELETE FROM t", None),
+    ],
+)
+def test_writing_statements(sql_statement, dialect):
+    assert not is_read_only_sql(sql_statement, dialect)
+
+
+def test_row_limit_is_added_to_outer_query():
+    limited = add_row_limit("SELECT * FROM (SELECT * FROM t LIMIT 5) AS s", 10)
+
+    assert limited == "SELECT * FROM (SELECT * FROM t LIMIT 5) AS s LIMIT 10"
+
+
+def test_row_limit_is_added_before_clickhouse_settings():
+    limited = add_row_limit(
+        "SELECT * FROM t SETTINGS max_threads = 1", 10, "clickhouse"
+    )
+
+    assert limited == "SELECT * FROM t LIMIT 10 SETTINGS max_threads = 1"
+
+
+@pytest.mark.parametrize(
+    ("sql_statement", "dialect"),
+    [
+        ("SELECT * FROM t LIMIT 5", None),
+        ("SELECT * FROM t FETCH FIRST 5 ROWS ONLY", None),
+        ("SELECT TOP 5 * FROM t", "tsql"),
+        ("DELETE FROM t", None),
+    ],
+)
+def test_row_limit_is_not_added(sql_statement, dialect):
+    assert add_row_limit(sql_statement, 10, dialect) is None